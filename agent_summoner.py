@@ -4,24 +4,62 @@ Agent Summoner - Intelligent Agent Discovery & Orchestration System
 Uses real-time research to discover, evaluate, and create optimal agents for any task
 """
 
-import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import logging
 
-from agents.perplexity_sonar_agent import PerplexitySonarAgent
+from agents.perplexity_sonar_agent import ANSWER_STATUSES, PerplexitySonarAgent
+from agents.research_store import REF_KEY, ResearchStore, ref
+from agents.tracing import TRACER
+from prompt_packing import compact_prompt, estimate_tokens, pack_fields, pack_sections
+from response_sections import parse_sections, section_key
+from similarity_index import SimilarityIndex
+
+# Stage fields that hold an earlier stage's record; stored once and replaced by a reference
+STAGE_REFERENCES = {
+    'agent_summoning': ('task_analysis', 'agent_discovery', 'agent_evaluation'),
+    'agent_evaluation': ('agent_discovery',),
+    'agent_discovery': ('task_analysis',)
+}
 
 class AgentSummoner:
     def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF"):
         self.project_root = Path(project_root)
-        self.summoner_data = self.project_root / "research_data" / "agent_summoner"
-        self.summoner_data.mkdir(parents=True, exist_ok=True)
+        self.research_store = ResearchStore(self.project_root / "research_data" / "research_store.sqlite3")
         
         # Initialize research capabilities
-        self.researcher = PerplexitySonarAgent()
+        self.researcher = PerplexitySonarAgent(project_root=str(self.project_root))
         self.researcher.configure_apis(sonar_key='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')
+        self.researcher.cost_agent = "agent_summoner"
+        self.research_model = 'sonar-reasoning'
+        # Optional callback(query_class, text): when set, research answers are streamed and
+        # each piece of text is passed on as it arrives
+        self.on_research_delta: Optional[Callable[[str, str], None]] = None
+        
+        # Fields pulled out of the analysis answer's section map
+        self.analysis_fields = ['domain', 'task_type', 'complexity', 'capabilities', 'resources',
+                                'constraints', 'success_criteria']
+        
+        # Token budgets for the context each stage hands to the next
+        self.discovery_context_budget = 250
+        self.evaluation_context_budget = 600
+        
+        # Reuse of past summonings for near-duplicate requests: a request this similar to a recent
+        # one gets its summoning back with no API calls; an analysis this similar reuses its
+        # discovery and evaluation
+        self.reuse_threshold = 0.8
+        self.adapt_threshold = 0.75
+        self.reuse_max_age_hours = 72
+        self.reuse_history = 500
+        self.request_index = None
+        self.analysis_index = None
+        self.reuse_entries = {}
+        self.reuse_stats = {'lookups': 0, 'request_hits': 0, 'analysis_hits': 0, 'calls_saved': 0,
+                            'latency_saved_seconds': 0.0}
         
         # Agent discovery database
         self.discovered_agents = {}
@@ -43,11 +81,9 @@ class AgentSummoner:
         self.logger = logging.getLogger(__name__)
         self.logger.info("🧙‍♂️ Agent Summoner initialized")
         
-    def analyze_task(self, user_request: str) -> Dict:
-        """Analyze task requirements and complexity"""
-        self.logger.info(f"📋 Analyzing task: {user_request[:100]}...")
-        
-        analysis_query = f'''
+    def _build_analysis_query(self, user_request: str) -> str:
+        """Prompt for the task analysis stage"""
+        return compact_prompt(f'''
         Analyze this task request and provide structured information:
         
         TASK: "{user_request}"
@@ -62,26 +98,39 @@ class AgentSummoner:
         7. SUCCESS_CRITERIA: How to measure successful completion
         
         Format as structured analysis with clear categories.
-        '''
+        ''')
+        
+    def _parse_analysis(self, user_request: str, analysis_content: str) -> Dict:
+        """Turn raw analysis text into the task_analysis record"""
+        sections = parse_sections(analysis_content)
+        task_analysis = {
+            'original_request': user_request,
+            'analysis_content': analysis_content
+        }
+        for field in self.analysis_fields:
+            task_analysis[field] = sections.field(field)
+        task_analysis['timestamp'] = datetime.now().isoformat()
+        return task_analysis
+        
+    def _research(self, query: str, query_class: str) -> Dict:
+        """One Sonar query with the research model, streamed to on_research_delta when it is set"""
+        if self.on_research_delta is None:
+            return self.researcher.perplexity_research(query, model=self.research_model, query_class=query_class)
+        callback = self.on_research_delta
+        return self.researcher.perplexity_research(query, model=self.research_model, query_class=query_class,
+                                                   on_delta=lambda text: callback(query_class, text))
         
-        result = self.researcher.perplexity_research(analysis_query, model='sonar-reasoning')
+    def analyze_task(self, user_request: str) -> Dict:
+        """Analyze task requirements and complexity"""
+        self.logger.info(f"📋 Analyzing task: {user_request[:100]}...")
+        
+        analysis_query = self._build_analysis_query(user_request)
+        result = self._research(analysis_query, 'agent_analysis')
         
-        if result['status'] == 'success':
+        if result['status'] in ANSWER_STATUSES:
             analysis_content = result['response']['choices'][0]['message']['content']
-            
-            # Parse the analysis (simplified parsing for prototype)
-            task_analysis = {
-                'original_request': user_request,
-                'analysis_content': analysis_content,
-                'domain': self._extract_field(analysis_content, 'DOMAIN'),
-                'task_type': self._extract_field(analysis_content, 'TASK_TYPE'),
-                'complexity': self._extract_field(analysis_content, 'COMPLEXITY'),
-                'capabilities': self._extract_field(analysis_content, 'REQUIRED_CAPABILITIES'),
-                'resources': self._extract_field(analysis_content, 'ESTIMATED_RESOURCES'),
-                'constraints': self._extract_field(analysis_content, 'CONSTRAINTS'),
-                'success_criteria': self._extract_field(analysis_content, 'SUCCESS_CRITERIA'),
-                'timestamp': datetime.now().isoformat()
-            }
+            task_analysis = self._parse_analysis(user_request, analysis_content)
+            task_analysis['research_cost'] = result.get('cost', 0.0)
             
             self.logger.info("✅ Task analysis completed")
             return task_analysis
@@ -90,30 +139,37 @@ class AgentSummoner:
             return {'error': 'Task analysis failed'}
             
     def _extract_field(self, content: str, field_name: str) -> str:
-        """Simple field extraction from analysis content"""
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if field_name in line.upper():
-                # Try to get the content after the field name
-                if ':' in line:
-                    return line.split(':', 1)[1].strip()
-                elif i + 1 < len(lines):
-                    return lines[i + 1].strip()
-        return "Not specified"
-        
-    def discover_agents(self, task_analysis: Dict) -> Dict:
-        """Research and discover optimal agents for the task"""
-        self.logger.info("🔍 Researching optimal agents for task...")
+        """Field value from analysis content (DOMAIN, TASK_TYPE, ...) via the cached section map"""
+        key = section_key(field_name)
+        return parse_sections(content).field(key) if key else "Not specified"
         
-        discovery_query = f'''
+    def _build_discovery_query(self, user_request: str, task_analysis: Optional[Dict] = None,
+                               analysis_content: Optional[str] = None) -> str:
+        """Prompt for the discovery stage from parsed fields, raw analysis text, or the bare request.
+
+        The task context is packed: placeholder and repeated values are dropped and the whole
+        block is held to discovery_context_budget tokens.
+        """
+        if task_analysis is not None:
+            context = pack_fields([
+                ("REQUEST", user_request),
+                ("DOMAIN", task_analysis.get('domain')),
+                ("TASK TYPE", task_analysis.get('task_type')),
+                ("COMPLEXITY", task_analysis.get('complexity')),
+                ("REQUIREMENTS", task_analysis.get('capabilities')),
+                ("CONSTRAINTS", task_analysis.get('constraints'))
+            ], self.discovery_context_budget)
+        elif analysis_content:
+            packed = pack_sections(analysis_content, ['domain', 'task_type', 'complexity', 'capabilities', 'constraints'],
+                                   self.discovery_context_budget - estimate_tokens(user_request))
+            context = f"REQUEST: {user_request}\nTASK ANALYSIS:\n{packed}"
+        else:
+            context = f"REQUEST: {user_request}"
+            
+        return compact_prompt(f'''
         I need to find the best AI agents, APIs, platforms, and tools for this task:
         
-        DOMAIN: {task_analysis.get('domain', 'General')}
-        TASK TYPE: {task_analysis.get('task_type', 'Unknown')}
-        COMPLEXITY: {task_analysis.get('complexity', 'Unknown')}
-        REQUIREMENTS: {task_analysis.get('capabilities', 'Not specified')}
-        
-        ORIGINAL REQUEST: "{task_analysis.get('original_request', '')}"
+        {context}
         
         Please research and provide:
         
@@ -126,81 +182,119 @@ class AgentSummoner:
         7. RECOMMENDATIONS: Top 3 recommended approaches with pros/cons
         
         Focus on 2024 current solutions with specific names, URLs, and implementation details.
-        '''
+        ''')
         
-        result = self.researcher.perplexity_research(discovery_query, model='sonar-reasoning')
+    def _run_discovery(self, discovery_query: str, task_analysis: Optional[Dict]) -> Dict:
+        """Execute the discovery query and build the agent_discovery record"""
+        result = self._research(discovery_query, 'agent_discovery')
         
-        if result['status'] == 'success':
-            discovery_content = result['response']['choices'][0]['message']['content']
-            
-            agent_discovery = {
-                'task_analysis': task_analysis,
-                'discovery_content': discovery_content,
-                'discovered_at': datetime.now().isoformat(),
-                'research_cost': 0.009,  # Approximate cost
-                'recommendations': self._parse_recommendations(discovery_content)
-            }
+        if result['status'] not in ANSWER_STATUSES:
+            self.logger.error("❌ Agent discovery failed")
+            return {'error': 'Agent discovery failed'}
             
-            # Save discovery results
-            discovery_file = self.summoner_data / f"agent_discovery_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(discovery_file, 'w') as f:
-                json.dump(agent_discovery, f, indent=2)
-                
-            self.logger.info(f"✅ Agent discovery completed - saved to {discovery_file}")
+        discovery_content = result['response']['choices'][0]['message']['content']
+        return {
+            'task_analysis': task_analysis,
+            'discovery_content': discovery_content,
+            'discovered_at': datetime.now().isoformat(),
+            'research_cost': result.get('cost', 0.0),
+            'recommendations': self._parse_recommendations(discovery_content)
+        }
+        
+    def discover_agents(self, task_analysis: Dict, save: bool = True) -> Dict:
+        """Research and discover optimal agents for the task"""
+        self.logger.info("🔍 Researching optimal agents for task...")
+        
+        discovery_query = self._build_discovery_query(task_analysis.get('original_request', ''), task_analysis=task_analysis)
+        agent_discovery = self._run_discovery(discovery_query, task_analysis)
+        
+        if 'error' in agent_discovery:
             return agent_discovery
+            
+        if save:
+            artifact_id = self._save_stage('agent_discovery', agent_discovery, task_analysis)
+            self.logger.info(f"✅ Agent discovery completed - stored as artifact #{artifact_id}")
         else:
-            self.logger.error("❌ Agent discovery failed")
-            return {'error': 'Agent discovery failed'}
+            self.logger.info("✅ Agent discovery completed")
+        return agent_discovery
             
+    def _save_artifact(self, artifact_type: str, data: Dict, task_analysis: Optional[Dict] = None) -> int:
+        """Store a stage result in the research store, indexed by the task's domain and request"""
+        task_analysis = task_analysis or {}
+        return self.research_store.put('agent_summoner', artifact_type, data,
+                                       domain=task_analysis.get('domain'),
+                                       query=task_analysis.get('original_request'),
+                                       model=self.research_model)
+        
+    def _save_stage(self, artifact_type: str, stage: Dict, task_analysis: Optional[Dict] = None,
+                    stored: Optional[Dict[int, int]] = None) -> int:
+        """Store a stage result with every earlier stage it embeds written once, as its own artifact.
+
+        ``stored`` maps id() of records already written to their artifact ids, so records shared
+        between results (e.g. duplicates in a batch) are not written again.
+        """
+        stored = {} if stored is None else stored
+        with self.research_store.transaction():
+            if id(stage) not in stored:
+                record = dict(stage)
+                for field in STAGE_REFERENCES.get(artifact_type, ()):
+                    if isinstance(record.get(field), dict):
+                        record[field] = ref(self._save_stage(field, record[field], task_analysis, stored))
+                stored[id(stage)] = self._save_artifact(artifact_type, record, task_analysis)
+        return stored[id(stage)]
+        
     def _parse_recommendations(self, content: str) -> List[Dict]:
         """Parse recommendations from discovery content"""
-        # Simplified parsing for prototype
         recommendations = []
-        
-        if "RECOMMENDATIONS" in content.upper():
-            lines = content.split('\n')
-            in_recommendations = False
-            current_rec = ""
-            
-            for line in lines:
-                if "RECOMMENDATIONS" in line.upper():
-                    in_recommendations = True
-                    continue
-                    
-                if in_recommendations:
-                    if line.strip().startswith(('1.', '2.', '3.', '-', '*')):
-                        if current_rec:
-                            recommendations.append({
-                                'description': current_rec.strip(),
-                                'confidence': 'medium'
-                            })
-                        current_rec = line
-                    else:
-                        current_rec += " " + line
-                        
-            # Add the last recommendation
-            if current_rec:
+        current_rec = ""
+        for line in parse_sections(content).lines('recommendations'):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith(('1.', '2.', '3.', '-', '*')) and current_rec:
                 recommendations.append({
                     'description': current_rec.strip(),
                     'confidence': 'medium'
                 })
+                current_rec = line
+            else:
+                current_rec += " " + line
                 
+        # Add the last recommendation
+        if current_rec:
+            recommendations.append({
+                'description': current_rec.strip(),
+                'confidence': 'medium'
+            })
+            
         return recommendations[:3]  # Top 3 recommendations
         
-    def evaluate_agents(self, agent_discovery: Dict) -> Dict:
-        """Evaluate discovered agents and recommend optimal configuration"""
-        self.logger.info("⚖️ Evaluating agents and optimizing selection...")
-        
-        evaluation_query = f'''
+    def _build_evaluation_query(self, agent_discovery: Dict) -> str:
+        """Prompt for the evaluation stage.
+
+        Only the recommendations, integration methods and cost sections of the discovery answer
+        are carried over, de-duplicated and packed into evaluation_context_budget tokens.
+        """
+        discovery_content = agent_discovery.get('discovery_content', '')
+        task_analysis = agent_discovery['task_analysis'] or {}
+        discovered = pack_sections(discovery_content, ['recommendations', 'integration', 'cost', 'agents'],
+                                   self.evaluation_context_budget)
+        requirements = pack_fields([
+            ("Domain", task_analysis.get('domain')),
+            ("Complexity", task_analysis.get('complexity')),
+            ("Resources", task_analysis.get('resources'))
+        ], self.discovery_context_budget)
+        self.logger.info(f"🗜️ Evaluation context packed to ~{estimate_tokens(discovered)} tokens "
+                         f"(discovery answer ~{estimate_tokens(discovery_content)})")
+        
+        return compact_prompt(f'''
         Based on this agent discovery research, provide a strategic evaluation:
         
         DISCOVERED AGENTS:
-        {agent_discovery.get('discovery_content', '')[:2000]}
+        {discovered}
         
         TASK REQUIREMENTS:
-        - Domain: {agent_discovery['task_analysis'].get('domain')}
-        - Complexity: {agent_discovery['task_analysis'].get('complexity')}
-        - Resources: {agent_discovery['task_analysis'].get('resources')}
+        {requirements}
         
         Please provide:
         
@@ -212,27 +306,32 @@ class AgentSummoner:
         6. ALTERNATIVE OPTIONS: Backup approaches if primary fails
         
         Focus on practical, implementable recommendations for immediate deployment.
-        '''
+        ''')
+        
+    def evaluate_agents(self, agent_discovery: Dict, save: bool = True) -> Dict:
+        """Evaluate discovered agents and recommend optimal configuration"""
+        self.logger.info("⚖️ Evaluating agents and optimizing selection...")
         
-        result = self.researcher.perplexity_research(evaluation_query, model='sonar-reasoning')
+        evaluation_query = self._build_evaluation_query(agent_discovery)
+        result = self._research(evaluation_query, 'agent_evaluation')
         
-        if result['status'] == 'success':
+        if result['status'] in ANSWER_STATUSES:
             evaluation_content = result['response']['choices'][0]['message']['content']
             
             agent_evaluation = {
                 'agent_discovery': agent_discovery,
                 'evaluation_content': evaluation_content,
                 'evaluated_at': datetime.now().isoformat(),
-                'total_research_cost': 0.018,  # Discovery + evaluation
+                'research_cost': result.get('cost', 0.0),
+                'total_research_cost': round(agent_discovery.get('research_cost', 0.0) + result.get('cost', 0.0), 6),
                 'recommended_action': self._extract_recommended_action(evaluation_content)
             }
             
-            # Save evaluation results
-            evaluation_file = self.summoner_data / f"agent_evaluation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(evaluation_file, 'w') as f:
-                json.dump(agent_evaluation, f, indent=2)
-                
-            self.logger.info(f"✅ Agent evaluation completed - saved to {evaluation_file}")
+            if save:
+                artifact_id = self._save_stage('agent_evaluation', agent_evaluation, agent_discovery['task_analysis'])
+                self.logger.info(f"✅ Agent evaluation completed - stored as artifact #{artifact_id}")
+            else:
+                self.logger.info("✅ Agent evaluation completed")
             return agent_evaluation
         else:
             self.logger.error("❌ Agent evaluation failed")
@@ -240,44 +339,175 @@ class AgentSummoner:
             
     def _extract_recommended_action(self, content: str) -> str:
         """Extract the main recommended action from evaluation"""
-        if "OPTIMAL CONFIGURATION" in content.upper():
-            lines = content.split('\n')
-            for i, line in enumerate(lines):
-                if "OPTIMAL CONFIGURATION" in line.upper():
-                    # Get next few lines
-                    next_lines = lines[i+1:i+5]
-                    return " ".join([l.strip() for l in next_lines if l.strip()])
+        lines = [line.strip() for line in parse_sections(content).lines('optimal_configuration') if line.strip()]
+        if lines:
+            return " ".join(lines[:4])
         return "Review full evaluation for recommendations"
         
-    def summon_agent(self, user_request: str) -> Dict:
-        """Complete agent summoning process: analyze → discover → evaluate → recommend"""
-        self.logger.info(f"🧙‍♂️ SUMMONING OPTIMAL AGENT FOR: {user_request}")
+    def _analysis_text(self, task_analysis: Dict) -> str:
+        """What an analysis says the task needs, for analysis-level similarity"""
+        values = [task_analysis.get(field) for field in ('original_request', 'domain', 'task_type', 'capabilities')]
+        return " ".join(value for value in values if value and value != "Not specified")
+        
+    def _warm_reuse_index(self):
+        """Build the request/analysis similarity indexes from recent summonings in the research store"""
+        if self.request_index is not None:
+            return
+        self.request_index, self.analysis_index = SimilarityIndex(), SimilarityIndex()
+        since = time.time() - self.reuse_max_age_hours * 3600
+        for entry in reversed(self.research_store.find('agent_summoner', 'agent_summoning', since=since,
+                                                        limit=self.reuse_history)):
+            record = self.research_store.get(entry['id'], resolve=False)
+            task_analysis = record.get('task_analysis') or {}
+            if REF_KEY in task_analysis:
+                task_analysis = self.research_store.get(task_analysis[REF_KEY], resolve=False) or {}
+            self._remember_summoning(entry['id'], record, task_analysis, entry['created_at'])
+        self.logger.info(f"♻️ Similarity index warmed with {len(self.reuse_entries)} recent summonings")
+        
+    def _remember_summoning(self, artifact_id: int, summoning: Dict, task_analysis: Dict,
+                            created_at: Optional[float] = None):
+        if self.request_index is None:
+            return  # picked up from the research store when the index is first needed
+        self.reuse_entries[artifact_id] = {
+            'user_request': summoning.get('user_request', ''),
+            'created_at': created_at or time.time(),
+            'stats': summoning.get('summoning_stats', {})
+        }
+        self.request_index.add(artifact_id, summoning.get('user_request', ''))
+        self.analysis_index.add(artifact_id, self._analysis_text(task_analysis))
+        
+    def _find_reusable(self, index: SimilarityIndex, text: str, threshold: float) -> Optional[Tuple[int, float]]:
+        """Most similar recent summoning at or above threshold, as (artifact id, similarity)"""
+        horizon = time.time() - self.reuse_max_age_hours * 3600
+        for artifact_id, similarity in index.query(text, threshold):
+            if self.reuse_entries[artifact_id]['created_at'] >= horizon:
+                return artifact_id, similarity
+        return None
+        
+    def _reuse_info(self, artifact_id: int, similarity: float, match: str) -> Dict:
+        return {
+            'artifact_id': artifact_id,
+            'user_request': self.reuse_entries[artifact_id]['user_request'],
+            'similarity': similarity,
+            'match': match
+        }
         
+    def get_reuse_report(self) -> Dict:
+        """Hit rate and estimated latency saved by reusing past summonings"""
+        hits = self.reuse_stats['request_hits'] + self.reuse_stats['analysis_hits']
+        lookups = self.reuse_stats['lookups']
+        return dict(self.reuse_stats,
+                    latency_saved_seconds=round(self.reuse_stats['latency_saved_seconds'], 2),
+                    hits=hits,
+                    hit_rate=round(hits / lookups, 3) if lookups else 0.0,
+                    indexed_summonings=len(self.reuse_entries))
+        
+    def iter_summoning(self, user_request: str, speculative_discovery: bool = False,
+                       reuse: bool = True) -> Iterator[Dict]:
+        """Run analyze → discover → evaluate, yielding each stage's result as soon as it exists.
+
+        Events are dicts with ``stage`` ('analysis', 'discovery', 'evaluation',
+        'complete' or 'error'), ``result`` and ``elapsed_seconds``. Discovery is
+        built from the raw analysis text; with ``speculative_discovery`` it starts
+        from the bare request while the analysis call is still in flight.
+        
+        With ``reuse``, a request within reuse_threshold of a recent one replays
+        that summoning without any API calls, and an analysis within
+        adapt_threshold of a recent one reuses its discovery and evaluation.
+        The result's ``reused_from`` says which.
+        """
+        self.logger.info(f"🧙‍♂️ SUMMONING OPTIMAL AGENT FOR: {user_request}")
         start_time = time.time()
-        
-        # Step 1: Analyze the task
-        self.logger.info("📋 STEP 1: Analyzing task requirements...")
-        task_analysis = self.analyze_task(user_request)
-        
-        if 'error' in task_analysis:
-            return task_analysis
+        first_output_time = None
+        stage_start = time.perf_counter()
+        
+        def event(stage: str, result: Dict) -> Dict:
+            nonlocal first_output_time
+            elapsed = round(time.time() - start_time, 2)
+            if first_output_time is None and stage != 'error':
+                first_output_time = elapsed
+            # Stage spans cover the time since the previous event, excluding time the consumer held the generator
+            now = time.perf_counter()
+            TRACER.record(f"summon.{stage}", now - stage_start, start=stage_start)
+            if stage in ('complete', 'error'):
+                TRACER.record("summon.total", time.time() - start_time, speculative=speculative_discovery)
+            return {'stage': stage, 'result': result, 'elapsed_seconds': elapsed}
             
-        # Step 2: Discover available agents
-        self.logger.info("🔍 STEP 2: Discovering optimal agents...")
-        agent_discovery = self.discover_agents(task_analysis)
-        
-        if 'error' in agent_discovery:
-            return agent_discovery
+        if reuse:
+            self._warm_reuse_index()
+            self.reuse_stats['lookups'] += 1
+            match = self._find_reusable(self.request_index, user_request, self.reuse_threshold)
+            if match is not None:
+                yield from self._replay_summoning(user_request, *match, event, start_time)
+                return
+            
+        reused_from = None
+        stored = {}
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summoner")
+        speculative = None
+        try:
+            if speculative_discovery:
+                self.logger.info("🔮 Speculatively starting discovery from the raw request...")
+                speculative = pool.submit(self._run_discovery, self._build_discovery_query(user_request), None)
+                
+            # Step 1: Analyze the task
+            self.logger.info("📋 STEP 1: Analyzing task requirements...")
+            task_analysis = self.analyze_task(user_request)
+            if 'error' in task_analysis:
+                yield event('error', task_analysis)
+                return
+            yield event('analysis', task_analysis)
+            stage_start = time.perf_counter()
+            
+            # Step 2: Discover available agents
+            self.logger.info("🔍 STEP 2: Discovering optimal agents...")
+            match = None
+            if reuse and speculative is None:
+                match = self._find_reusable(self.analysis_index, self._analysis_text(task_analysis), self.adapt_threshold)
+            if match is not None:
+                reused_from = self._reuse_info(*match, 'analysis')
+                previous, stored = self._load_reusable(match[0])
+                agent_discovery, agent_evaluation = previous['agent_discovery'], previous['agent_evaluation']
+                self.logger.info(f"♻️ Analysis {match[1]:.0%} similar to \"{reused_from['user_request']}\" - "
+                                 f"reusing its discovery and evaluation")
+            elif speculative is not None:
+                agent_discovery = speculative.result()
+            else:
+                agent_discovery = self._run_discovery(
+                    self._build_discovery_query(user_request, analysis_content=task_analysis['analysis_content']),
+                    task_analysis
+                )
+            if 'error' in agent_discovery:
+                yield event('error', agent_discovery)
+                return
+            if reused_from is None:
+                agent_discovery['task_analysis'] = task_analysis
+            yield event('discovery', agent_discovery)
+            stage_start = time.perf_counter()
+        finally:
+            # Error and early-close paths must not wait on a speculative discovery nobody will read
+            if speculative is not None:
+                speculative.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
             
         # Step 3: Evaluate and recommend
-        self.logger.info("⚖️ STEP 3: Evaluating and optimizing selection...")
-        agent_evaluation = self.evaluate_agents(agent_discovery)
+        if reused_from is None:
+            self.logger.info("⚖️ STEP 3: Evaluating and optimizing selection...")
+            agent_evaluation = self.evaluate_agents(agent_discovery, save=False)
+            if 'error' in agent_evaluation:
+                yield event('error', agent_evaluation)
+                return
+        yield event('evaluation', agent_evaluation)
+        stage_start = time.perf_counter()
         
-        if 'error' in agent_evaluation:
-            return agent_evaluation
-            
         # Generate final summoning result
         total_time = time.time() - start_time
+        if reused_from is None:
+            research_queries = 3
+            total_cost = round(task_analysis.get('research_cost', 0.0) + agent_evaluation['total_research_cost'], 6)
+        else:
+            research_queries = 1
+            total_cost = round(task_analysis.get('research_cost', 0.0), 6)
         
         summoning_result = {
             'user_request': user_request,
@@ -286,24 +516,342 @@ class AgentSummoner:
             'agent_evaluation': agent_evaluation,
             'summoning_stats': {
                 'total_time_seconds': round(total_time, 2),
-                'research_queries': 3,
-                'total_cost': 0.027,  # ~$0.03 for complete agent summoning
-                'cost_per_query': 0.009
+                'time_to_first_output_seconds': first_output_time,
+                'speculative_discovery': speculative_discovery,
+                'research_queries': research_queries,
+                'total_cost': total_cost,
+                'cost_per_query': round(total_cost / research_queries, 6)
             },
             'summoned_at': datetime.now().isoformat()
         }
         
+        if reused_from is not None:
+            saved = self._count_analysis_hit(reused_from['artifact_id'])
+            summoning_result['reused_from'] = reused_from
+            summoning_result['summoning_stats'].update(calls_saved=2, latency_saved_seconds=round(saved, 2))
+        
         # Save complete summoning result
-        summoning_file = self.summoner_data / f"agent_summoning_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(summoning_file, 'w') as f:
-            json.dump(summoning_result, f, indent=2)
+        artifact_id = self._save_stage('agent_summoning', summoning_result, task_analysis, stored)
+        self._remember_summoning(artifact_id, summoning_result, task_analysis)
             
         self.logger.info(f"🎉 AGENT SUMMONING COMPLETED!")
         self.logger.info(f"⏱️ Total time: {total_time:.2f} seconds")
-        self.logger.info(f"💰 Total cost: $0.027")
-        self.logger.info(f"📁 Results saved to: {summoning_file}")
+        self.logger.info(f"💰 Total cost: ${total_cost:.4f}")
+        self.logger.info(f"📁 Results stored as artifact #{artifact_id}")
+        
+        yield event('complete', summoning_result)
+        
+    def _replay_summoning(self, user_request: str, artifact_id: int, similarity: float,
+                          event: Callable[[str, Dict], Dict], start_time: float) -> Iterator[Dict]:
+        """Stage events and result of a stored summoning for a near-duplicate request, without API calls"""
+        reused_from = self._reuse_info(artifact_id, similarity, 'request')
+        self.logger.info(f"♻️ Request {similarity:.0%} similar to \"{reused_from['user_request']}\" - "
+                         f"reusing summoning #{artifact_id}")
+        previous, stored = self._load_reusable(artifact_id)
+        for stage, field in (('analysis', 'task_analysis'), ('discovery', 'agent_discovery'),
+                             ('evaluation', 'agent_evaluation')):
+            yield event(stage, previous[field])
+            
+        result = self._replayed_summoning(user_request, reused_from, previous, time.time() - start_time)
+        new_id = self._save_stage('agent_summoning', result, previous['task_analysis'], stored)
+        self._remember_summoning(new_id, result, previous['task_analysis'])
+        self.logger.info(f"🎉 AGENT SUMMONING REUSED - no research queries, "
+                         f"~{result['summoning_stats']['latency_saved_seconds']:.1f}s saved")
+        yield event('complete', result)
+        
+    def _load_reusable(self, artifact_id: int) -> Tuple[Dict, Dict[int, int]]:
+        """A stored summoning with its stages resolved, plus a ``stored`` map for _save_stage.
+
+        The map points the resolved stages at their existing artifacts, so a summoning built
+        from them references those instead of writing copies. Records imported from legacy
+        JSON files hold their stages inline; those get stored afresh.
+        """
+        record = self.research_store.get(artifact_id, resolve=False)
+        previous = self.research_store.get(artifact_id)
+        stored = {}
+        for field in STAGE_REFERENCES['agent_summoning']:
+            if isinstance(record.get(field), dict) and REF_KEY in record[field]:
+                stored[id(previous[field])] = record[field][REF_KEY]
+        return previous, stored
+        
+    def _replayed_summoning(self, user_request: str, reused_from: Dict, previous: Dict, elapsed: float) -> Dict:
+        """A stored summoning answered again for a near-duplicate request, counted as a request hit"""
+        saved = max(0.0, self.reuse_entries[reused_from['artifact_id']]['stats'].get('total_time_seconds', 0.0)
+                    - elapsed)
+        summoning_stats = {
+            'total_time_seconds': round(elapsed, 2),
+            'time_to_first_output_seconds': round(elapsed, 2),
+            'speculative_discovery': False,
+            'research_queries': 0,
+            'total_cost': 0.0,
+            'cost_per_query': 0.0,
+            'calls_saved': 3,
+            'latency_saved_seconds': round(saved, 2)
+        }
+        self.reuse_stats['request_hits'] += 1
+        self.reuse_stats['calls_saved'] += 3
+        self.reuse_stats['latency_saved_seconds'] += saved
+        return dict(previous, user_request=user_request, reused_from=reused_from,
+                    summoning_stats=summoning_stats, summoned_at=datetime.now().isoformat())
+        
+    def _count_analysis_hit(self, artifact_id: int) -> float:
+        """Count an analysis-level reuse; returns the latency it saved"""
+        # Discovery and evaluation took the previous session's discovery+evaluation time
+        previous_stats = self.reuse_entries[artifact_id]['stats']
+        saved = max(0.0, previous_stats.get('total_time_seconds', 0.0)
+                    - previous_stats.get('time_to_first_output_seconds', 0.0))
+        self.reuse_stats['analysis_hits'] += 1
+        self.reuse_stats['calls_saved'] += 2
+        self.reuse_stats['latency_saved_seconds'] += saved
+        return saved
+        
+    def summon_agent(self, user_request: str, on_stage: Optional[Callable[[Dict], None]] = None,
+                     speculative_discovery: bool = False, reuse: bool = True) -> Dict:
+        """Complete agent summoning process: analyze → discover → evaluate → recommend"""
+        for stage_event in self.iter_summoning(user_request, speculative_discovery=speculative_discovery,
+                                               reuse=reuse):
+            if on_stage is not None:
+                on_stage(stage_event)
+            if stage_event['stage'] in ('complete', 'error'):
+                return stage_event['result']
+        return {'error': 'Agent summoning produced no result'}
+        
+    @staticmethod
+    def _normalize_request(text: str) -> str:
+        """Lowercase, strip punctuation and collapse whitespace for duplicate detection"""
+        return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+        
+    @staticmethod
+    def _token_similarity(a: str, b: str) -> float:
+        """Jaccard similarity of the word sets of two normalized requests"""
+        tokens_a, tokens_b = set(a.split()), set(b.split())
+        if not tokens_a or not tokens_b:
+            return 0.0
+        return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+        
+    def _bucket_key(self, task_analysis: Dict) -> Tuple[str, str]:
+        """Group analyses that share a domain and task type"""
+        return (self._normalize_request(task_analysis.get('domain', '')),
+                self._normalize_request(task_analysis.get('task_type', '')))
+        
+    def summon_agents_batch(self, user_requests: List[str], similarity_threshold: float = 0.85,
+                            reuse: bool = True) -> Dict:
+        """Summon agents for many requests at once under one shared concurrency/rate budget.
+
+        Identical and near-identical requests are summoned once. Analyses run
+        concurrently, discovery runs once per (domain, task_type) bucket and
+        evaluation once per unique request. With ``reuse``, unique requests and
+        analyses close to a recent summoning reuse it as in iter_summoning.
+        """
+        self.logger.info(f"🧙‍♂️ BATCH SUMMONING FOR {len(user_requests)} REQUESTS")
+        start_time = time.time()
+        
+        # Step 0: Deduplicate identical and near-identical requests
+        canonical = []          # unique requests, in first-seen order
+        canonical_keys = []
+        canonical_first = []    # index of the first request that produced each unique entry
+        duplicate_of = {}       # request index -> canonical index
+        for index, request in enumerate(user_requests):
+            key = self._normalize_request(request)
+            match = next((i for i, existing in enumerate(canonical_keys)
+                          if existing == key or self._token_similarity(existing, key) >= similarity_threshold), None)
+            if match is None:
+                canonical.append(request)
+                canonical_keys.append(key)
+                canonical_first.append(index)
+                match = len(canonical) - 1
+            duplicate_of[index] = match
+        self.logger.info(f"🧹 {len(user_requests) - len(canonical)} duplicate requests folded into {len(canonical)} unique")
+        
+        # Requests close to a recent summoning replay it without any API calls
+        summonings = {}
+        stored = {}
+        if reuse:
+            self._warm_reuse_index()
+            for i, request in enumerate(canonical):
+                self.reuse_stats['lookups'] += 1
+                match = self._find_reusable(self.request_index, request, self.reuse_threshold)
+                if match is not None:
+                    reused_from = self._reuse_info(*match, 'request')
+                    previous, previous_stored = self._load_reusable(match[0])
+                    stored.update(previous_stored)
+                    summonings[i] = self._replayed_summoning(request, reused_from, previous, time.time() - start_time)
+            if summonings:
+                self.logger.info(f"♻️ {len(summonings)} requests reuse recent summonings")
+        fresh = [i for i in range(len(canonical)) if i not in summonings]
+        
+        # Step 1: Analyze all unique requests concurrently
+        self.logger.info("📋 STEP 1: Analyzing task requirements for the batch...")
+        analysis_results = self.researcher.research_many(
+            [(self._build_analysis_query(canonical[i]), self.research_model) for i in fresh],
+            query_class='agent_analysis'
+        )
+        analysis_done = time.time() - start_time
+        analyses = {}
+        for i, result in zip(fresh, analysis_results):
+            if result['status'] in ANSWER_STATUSES:
+                analyses[i] = self._parse_analysis(canonical[i], result['response']['choices'][0]['message']['content'])
+                analyses[i]['research_cost'] = result.get('cost', 0.0)
+                
+        # Analyses close to a recent summoning's reuse its discovery and evaluation
+        adapted = {}
+        if reuse:
+            for i, analysis in analyses.items():
+                match = self._find_reusable(self.analysis_index, self._analysis_text(analysis), self.adapt_threshold)
+                if match is not None:
+                    previous, previous_stored = self._load_reusable(match[0])
+                    stored.update(previous_stored)
+                    adapted[i] = (self._reuse_info(*match, 'analysis'), previous)
+                
+        # Step 2: One discovery per (domain, task_type) bucket
+        buckets = {}
+        for i, analysis in analyses.items():
+            if i not in adapted:
+                buckets.setdefault(self._bucket_key(analysis), []).append(i)
+        self.logger.info(f"🔍 STEP 2: Discovering agents for {len(buckets)} domain/task-type buckets...")
+        bucket_keys = list(buckets)
+        discovery_results = self.researcher.research_many(
+            [(self._build_discovery_query(canonical[buckets[key][0]], task_analysis=analyses[buckets[key][0]]),
+              self.research_model) for key in bucket_keys],
+            query_class='agent_discovery'
+        )
+        discovery_done = time.time() - start_time
+        discoveries = {}
+        for key, result in zip(bucket_keys, discovery_results):
+            if result['status'] not in ANSWER_STATUSES:
+                continue
+            content = result['response']['choices'][0]['message']['content']
+            for i in buckets[key]:
+                discoveries[i] = {
+                    'task_analysis': analyses[i],
+                    'discovery_content': content,
+                    'discovered_at': datetime.now().isoformat(),
+                    'research_cost': result.get('cost', 0.0) / len(buckets[key]),
+                    'shared_with': len(buckets[key]),
+                    'recommendations': self._parse_recommendations(content)
+                }
+                
+        # Step 3: Evaluate every unique request concurrently
+        self.logger.info("⚖️ STEP 3: Evaluating agent selections for the batch...")
+        evaluated = list(discoveries)
+        evaluation_results = self.researcher.research_many(
+            [(self._build_evaluation_query(discoveries[i]), self.research_model) for i in evaluated],
+            query_class='agent_evaluation'
+        )
+        evaluation_done = time.time() - start_time
+        
+        for i, result in zip(evaluated, evaluation_results):
+            if result['status'] not in ANSWER_STATUSES:
+                continue
+            content = result['response']['choices'][0]['message']['content']
+            agent_discovery = discoveries[i]
+            evaluation_cost = result.get('cost', 0.0)
+            request_cost = analyses[i]['research_cost'] + agent_discovery['research_cost'] + evaluation_cost
+            summonings[i] = {
+                'user_request': canonical[i],
+                'task_analysis': analyses[i],
+                'agent_discovery': agent_discovery,
+                'agent_evaluation': {
+                    'agent_discovery': agent_discovery,
+                    'evaluation_content': content,
+                    'evaluated_at': datetime.now().isoformat(),
+                    'research_cost': evaluation_cost,
+                    'total_research_cost': round(evaluation_cost + agent_discovery['research_cost'], 6),
+                    'recommended_action': self._extract_recommended_action(content)
+                },
+                'summoning_stats': {
+                    'total_time_seconds': round(evaluation_done, 2),
+                    'time_to_first_output_seconds': round(analysis_done, 2),
+                    'research_queries': round(2 + 1 / agent_discovery['shared_with'], 2),
+                    'total_cost': round(request_cost, 6),
+                    'cost_per_query': round(request_cost / (2 + 1 / agent_discovery['shared_with']), 6)
+                },
+                'summoned_at': datetime.now().isoformat()
+            }
+            
+        for i, (reused_from, previous) in adapted.items():
+            saved = self._count_analysis_hit(reused_from['artifact_id'])
+            analysis_cost = round(analyses[i]['research_cost'], 6)
+            summonings[i] = {
+                'user_request': canonical[i],
+                'task_analysis': analyses[i],
+                'agent_discovery': previous['agent_discovery'],
+                'agent_evaluation': previous['agent_evaluation'],
+                'summoning_stats': {
+                    'total_time_seconds': round(analysis_done, 2),
+                    'time_to_first_output_seconds': round(analysis_done, 2),
+                    'research_queries': 1,
+                    'total_cost': analysis_cost,
+                    'cost_per_query': analysis_cost,
+                    'calls_saved': 2,
+                    'latency_saved_seconds': round(saved, 2)
+                },
+                'summoned_at': datetime.now().isoformat(),
+                'reused_from': reused_from
+            }
+            
+        # Map every original request (duplicates included) to its result
+        results = []
+        for index, request in enumerate(user_requests):
+            i = duplicate_of[index]
+            summoning = summonings.get(i)
+            if summoning is None:
+                results.append({'user_request': request, 'error': 'Agent summoning failed'})
+            elif index == canonical_first[i]:
+                results.append(summoning)
+            else:
+                results.append(dict(summoning, user_request=request, deduplicated_from=canonical[i],
+                                    summoning_stats=dict(summoning['summoning_stats'], research_queries=0, total_cost=0.0)))
+                
+        total_time = time.time() - start_time
+        api_queries = len(fresh) + len(bucket_keys) + len(evaluated)
+        total_cost = sum(result.get('cost', 0.0) for result in analysis_results + discovery_results + evaluation_results)
+        # Without batching every request would pay for three calls at the observed mean price
+        naive_cost = 3 * len(user_requests) * total_cost / max(1, api_queries)
+        batch_stats = {
+            'requests': len(user_requests),
+            'unique_requests': len(canonical),
+            'duplicates': len(user_requests) - len(canonical),
+            'discovery_buckets': len(bucket_keys),
+            'reused': len(canonical) - len(fresh) + len(adapted),
+            'succeeded': sum(1 for r in results if 'error' not in r),
+            'api_queries': api_queries,
+            'total_cost': round(total_cost, 6),
+            'naive_cost': round(naive_cost, 6),
+            'cost_saved': round(naive_cost - total_cost, 6),
+            'stage_latency_seconds': {
+                'analysis': round(analysis_done, 2),
+                'discovery': round(discovery_done - analysis_done, 2),
+                'evaluation': round(evaluation_done - discovery_done, 2)
+            },
+            'total_time_seconds': round(total_time, 2),
+            'mean_latency_seconds': round(sum(r.get('summoning_stats', {}).get('total_time_seconds', 0) for r in results)
+                                          / max(1, len(results)), 2)
+        }
+        batch_result = {
+            'results': results,
+            'batch_stats': batch_stats,
+            'summoned_at': datetime.now().isoformat()
+        }
+        
+        with self.research_store.transaction():
+            results_refs = []
+            for index, result in enumerate(results):
+                if 'error' in result:
+                    results_refs.append(result)
+                    continue
+                summoning_id = self._save_stage('agent_summoning', result, result['task_analysis'], stored)
+                results_refs.append(ref(summoning_id))
+                if index == canonical_first[duplicate_of[index]]:
+                    self._remember_summoning(summoning_id, result, result['task_analysis'])
+            artifact_id = self._save_artifact('agent_summoning_batch', dict(batch_result, results=results_refs))
+            
+        self.logger.info(f"🎉 BATCH SUMMONING COMPLETED - {api_queries} queries for {len(user_requests)} requests")
+        self.logger.info(f"⏱️ Total time: {total_time:.2f} seconds")
+        self.logger.info(f"💰 Total cost: ${batch_stats['total_cost']:.4f} (saved ${batch_stats['cost_saved']:.4f})")
+        self.logger.info(f"📁 Results stored as artifact #{artifact_id}")
         
-        return summoning_result
+        return batch_result
         
     def get_summoning_summary(self, summoning_result: Dict) -> str:
         """Generate human-readable summary of summoning results"""
@@ -313,6 +861,10 @@ class AgentSummoner:
         analysis = summoning_result['task_analysis']
         evaluation = summoning_result['agent_evaluation']
         stats = summoning_result['summoning_stats']
+        reused_from = summoning_result.get('reused_from')
+        reuse_note = (f"\n• Reused from \"{reused_from['user_request']}\" ({reused_from['similarity']:.0%} similar, "
+                      f"{stats['calls_saved']} queries and ~{stats['latency_saved_seconds']}s saved)"
+                      if reused_from else "")
         
         summary = f"""
 🧙‍♂️ AGENT SUMMONING COMPLETE!
@@ -325,7 +877,7 @@ class AgentSummoner:
 🔍 AGENTS DISCOVERED & EVALUATED:
 • Research completed in {stats['total_time_seconds']} seconds
 • Cost: ${stats['total_cost']} for comprehensive analysis
-• {stats['research_queries']} research queries executed
+• {stats['research_queries']} research queries executed{reuse_note}
 
 💡 RECOMMENDED ACTION:
 {evaluation.get('recommended_action', 'Review detailed evaluation')}
@@ -355,16 +907,19 @@ def main():
     print("🧙‍♂️ AGENT SUMMONER DEMO")
     print("=" * 60)
     
-    for i, task in enumerate(demo_tasks, 1):
+    batch = summoner.summon_agents_batch(demo_tasks)
+    
+    for i, (task, result) in enumerate(zip(demo_tasks, batch['results']), 1):
         print(f"\n📋 DEMO {i}: {task}")
         print("-" * 40)
         
-        result = summoner.summon_agent(task)
         summary = summoner.get_summoning_summary(result)
         print(summary)
         
         print("-" * 40)
-        time.sleep(2)  # Rate limiting between demos
+        
+    stats = batch['batch_stats']
+    print(f"\n📊 Batch: {stats['api_queries']} queries, ${stats['total_cost']:.3f} in {stats['total_time_seconds']}s")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cost Ledger - Per-call Sonar token and cost accounting
+Prices each call from the response's usage block with a configurable per-model table and
+aggregates into daily buckets per (agent, model, prompt template) in SQLite
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# USD: per million input/output tokens plus the flat per-request (search) fee at low context size.
+# Override with a JSON file of the same shape via $SONAR_PRICES_FILE or the prices argument.
+DEFAULT_PRICES = {
+    "sonar": {"input_per_million": 1.0, "output_per_million": 1.0, "per_request": 0.005},
+    "sonar-pro": {"input_per_million": 3.0, "output_per_million": 15.0, "per_request": 0.006},
+    "sonar-reasoning": {"input_per_million": 1.0, "output_per_million": 5.0, "per_request": 0.005},
+    "sonar-reasoning-pro": {"input_per_million": 2.0, "output_per_million": 8.0, "per_request": 0.006},
+    "sonar-deep-research": {"input_per_million": 2.0, "output_per_million": 8.0, "per_request": 0.0},
+    "llama-3.1-sonar-large-128k-online": {"input_per_million": 1.0, "output_per_million": 1.0, "per_request": 0.005},
+    "llama-3.1-sonar-huge-128k-online": {"input_per_million": 5.0, "output_per_million": 5.0, "per_request": 0.005}
+}
+
+GROUP_COLUMNS = ("day", "agent", "model", "template")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_daily (
+    day TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    template TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    cached_calls INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    saved_cost REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, agent, model, template)
+)
+"""
+
+
+def load_prices(path: Optional[str] = None) -> Dict[str, Dict]:
+    """Default price table, overlaid with a JSON file when one is configured"""
+    prices = {model: dict(price) for model, price in DEFAULT_PRICES.items()}
+    path = path or os.environ.get("SONAR_PRICES_FILE")
+    if path and Path(path).exists():
+        with open(path) as f:
+            for model, price in json.load(f).items():
+                prices.setdefault(model, {}).update(price)
+    return prices
+
+
+class CostLedger:
+    def __init__(self, db_path, prices: Optional[Dict[str, Dict]] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.prices = prices if prices is not None else load_prices()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def price(self, model: str, usage: Optional[Dict]) -> float:
+        """Cost of one call. Unknown models fall back to the cost the API itself reported, if any."""
+        usage = usage or {}
+        price = self.prices.get(model)
+        if price is None:
+            reported = usage.get("cost")
+            return float(reported.get("total_cost", 0.0)) if isinstance(reported, dict) else 0.0
+        return (usage.get("prompt_tokens", 0) * price.get("input_per_million", 0.0)
+                + usage.get("completion_tokens", 0) * price.get("output_per_million", 0.0)) / 1e6 \
+            + price.get("per_request", 0.0)
+
+    def record(self, agent: str, model: str, template: str, usage: Optional[Dict] = None,
+               cached: bool = False, saved_cost: float = 0.0, timestamp: Optional[float] = None) -> float:
+        """Add one call to its daily bucket; returns what the call cost (0 for cache hits)"""
+        usage = usage or {}
+        cost = 0.0 if cached else self.price(model, usage)
+        day = datetime.fromtimestamp(timestamp or time.time()).strftime("%Y-%m-%d")
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO usage_daily (day, agent, model, template, calls, cached_calls, prompt_tokens, "
+                "completion_tokens, cost, saved_cost) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, agent, model, template) DO UPDATE SET "
+                "calls = calls + excluded.calls, cached_calls = cached_calls + excluded.cached_calls, "
+                "prompt_tokens = prompt_tokens + excluded.prompt_tokens, "
+                "completion_tokens = completion_tokens + excluded.completion_tokens, "
+                "cost = cost + excluded.cost, saved_cost = saved_cost + excluded.saved_cost",
+                (day, agent, model, template, 0 if cached else 1, 1 if cached else 0,
+                 0 if cached else usage.get("prompt_tokens", 0), 0 if cached else usage.get("completion_tokens", 0),
+                 cost, saved_cost if cached else 0.0)
+            )
+            self.conn.commit()
+        return round(cost, 6)
+
+    def totals(self, group_by: Iterable[str] = ("agent",), since: Optional[str] = None, until: Optional[str] = None,
+               **filters) -> List[Dict]:
+        """Aggregate buckets grouped by any of day/agent/model/template, most expensive first.
+
+        since/until are inclusive YYYY-MM-DD days; filters match agent, model or template exactly.
+        """
+        group_by = [column for column in group_by if column in GROUP_COLUMNS]
+        clauses, params = [], []
+        if since:
+            clauses.append("day >= ?")
+            params.append(since)
+        if until:
+            clauses.append("day <= ?")
+            params.append(until)
+        for column, value in filters.items():
+            if column in GROUP_COLUMNS and value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        select = ", ".join(group_by + [
+            "SUM(calls)", "SUM(cached_calls)", "SUM(prompt_tokens)", "SUM(completion_tokens)",
+            "SUM(cost)", "SUM(saved_cost)"
+        ])
+        sql = f"SELECT {select} FROM usage_daily"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if group_by:
+            sql += f" GROUP BY {', '.join(group_by)}"
+        sql += " ORDER BY SUM(cost) DESC"
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        totals = []
+        for row in rows:
+            calls, cached, prompt, completion, cost, saved = row[len(group_by):]
+            if calls is None:
+                continue
+            entry = dict(zip(group_by, row))
+            entry.update({
+                "calls": calls,
+                "cached_calls": cached,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "cost": round(cost, 6),
+                "saved_cost": round(saved, 6),
+                "cost_per_call": round(cost / calls, 6) if calls else 0.0
+            })
+            totals.append(entry)
+        return totals
+
+    def summary(self, days: int = 30) -> Dict:
+        """Headline spend for the status report: totals plus the most expensive models and templates"""
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        overall = self.totals(group_by=(), since=since)
+        overall = overall[0] if overall else {"calls": 0, "cached_calls": 0, "prompt_tokens": 0,
+                                              "completion_tokens": 0, "cost": 0.0, "saved_cost": 0.0}
+        return {
+            "period_days": days,
+            "since": since,
+            **overall,
+            "by_model": self.totals(("model",), since=since),
+            "top_templates": self.totals(("agent", "template"), since=since)[:5]
+        }
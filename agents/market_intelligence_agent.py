@@ -5,14 +5,17 @@ Tracks agricultural markets, competitors, and funding opportunities
 """
 
 import requests
-import time
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 from dataclasses import dataclass
 from typing import List, Dict
 
+try:
+    from agents.research_store import ResearchStore
+except ImportError:  # executed directly from the agents directory
+    from research_store import ResearchStore
+
 @dataclass
 class CompetitorIntel:
     name: str
@@ -26,6 +29,7 @@ class MarketIntelligenceAgent:
         self.project_root = Path(project_root)
         self.data_dir = self.project_root / "research_data" / "market_intelligence"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.research_store = ResearchStore(self.project_root / "research_data" / "research_store.sqlite3")
         
         self.setup_logging()
         
@@ -86,7 +90,6 @@ class MarketIntelligenceAgent:
             )
             
             # In production, would scrape news, patents, publications, etc.
-            time.sleep(0.3)  # Rate limiting
             
             competitor_intel["competitors"].append({
                 "name": intel.name,
@@ -97,11 +100,9 @@ class MarketIntelligenceAgent:
             })
             
         # Save competitor intelligence
-        output_file = self.data_dir / f"competitor_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(competitor_intel, f, indent=2)
+        artifact_id = self.research_store.put("market_intelligence", "competitor_scan", competitor_intel)
             
-        self.logger.info(f"✅ Competitor scan completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Competitor scan completed. Stored as artifact #{artifact_id}")
         return competitor_intel
         
     def analyze_market_trends(self):
@@ -148,11 +149,9 @@ class MarketIntelligenceAgent:
         }
         
         # Save market analysis
-        output_file = self.data_dir / f"market_trends_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(market_analysis, f, indent=2)
+        artifact_id = self.research_store.put("market_intelligence", "market_trends", market_analysis)
             
-        self.logger.info(f"✅ Market trends analysis completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Market trends analysis completed. Stored as artifact #{artifact_id}")
         return market_analysis
         
     def monitor_funding_landscape(self):
@@ -202,11 +201,9 @@ class MarketIntelligenceAgent:
         }
         
         # Save funding intelligence
-        output_file = self.data_dir / f"funding_landscape_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(funding_intel, f, indent=2)
+        artifact_id = self.research_store.put("market_intelligence", "funding_landscape", funding_intel)
             
-        self.logger.info(f"✅ Funding landscape scan completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Funding landscape scan completed. Stored as artifact #{artifact_id}")
         return funding_intel
         
     def track_patent_landscape(self):
@@ -244,11 +241,9 @@ class MarketIntelligenceAgent:
         }
         
         # Save patent analysis
-        output_file = self.data_dir / f"patent_landscape_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(patent_analysis, f, indent=2)
+        artifact_id = self.research_store.put("market_intelligence", "patent_landscape", patent_analysis)
             
-        self.logger.info(f"✅ Patent landscape analysis completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Patent landscape analysis completed. Stored as artifact #{artifact_id}")
         return patent_analysis
         
     def generate_market_brief(self):
@@ -298,9 +293,7 @@ class MarketIntelligenceAgent:
         }
         
         # Save comprehensive brief
-        brief_file = self.data_dir / f"market_brief_{datetime.now().strftime('%Y%m%d')}.json"
-        with open(brief_file, 'w') as f:
-            json.dump(brief, f, indent=2)
+        brief_id = self.research_store.put("market_intelligence", "market_brief", brief)
             
         # Create executive markdown summary
         md_file = self.data_dir / f"market_brief_{datetime.now().strftime('%Y%m%d')}.md"
@@ -317,8 +310,19 @@ class MarketIntelligenceAgent:
             for action in brief['next_actions']:
                 f.write(f"- {action}\n")
                 
-        self.logger.info(f"✅ Market intelligence brief generated: {brief_file}")
+        self.logger.info(f"✅ Market intelligence brief generated: {md_file} (artifact #{brief_id})")
         return brief
+        
+    def run_task(self, payload: Dict) -> Dict:
+        """Plugin entry point: one analysis by name, or the full market brief"""
+        analyses = {
+            "competitors": self.scan_competitor_activities,
+            "market_trends": self.analyze_market_trends,
+            "funding": self.monitor_funding_landscape,
+            "patents": self.track_patent_landscape
+        }
+        analysis = analyses.get(payload.get("analysis"), self.generate_market_brief)
+        return analysis()
 
 def main():
     agent = MarketIntelligenceAgent()
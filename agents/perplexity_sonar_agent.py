@@ -5,12 +5,36 @@ Advanced research capabilities using Perplexity subscription and Sonar API
 """
 
 import requests
-import json
+import httpx
+import asyncio
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from agents.sonar_client import AsyncSonarClient, SONAR_API_URL, StreamAssembler, iter_sse_data
+    from agents.sonar_cache import ResponseCache, cache_key
+    from agents.tracing import TRACER
+    from agents.cost_ledger import CostLedger
+    from agents.research_store import ResearchStore
+    from agents.rate_limiter import RETRIABLE_STATUS, backoff_delay, breaker_for, limiter_for, parse_delay
+except ImportError:  # executed directly as agents/perplexity_sonar_agent.py
+    from sonar_client import AsyncSonarClient, SONAR_API_URL, StreamAssembler, iter_sse_data
+    from sonar_cache import ResponseCache, cache_key
+    from tracing import TRACER
+    from cost_ledger import CostLedger
+    from research_store import ResearchStore
+    from rate_limiter import RETRIABLE_STATUS, backoff_delay, breaker_for, limiter_for, parse_delay
+
+# Statuses of real answers: live from the API ("success") or from the response cache ("cached");
+# the offline simulation, including fallbacks after API failures, reports "simulated", and a
+# stream cut off after some text arrived reports "partial"
+ANSWER_STATUSES = ("success", "cached")
+
+SYSTEM_PROMPT = "You are an expert research assistant specializing in pharmaceutical R&D, agricultural biotechnology, and EU regulatory affairs. Provide comprehensive, accurate, and current information with specific data points, sources, and actionable insights."
 
 class PerplexitySonarAgent:
     def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF"):
@@ -27,6 +51,35 @@ class PerplexitySonarAgent:
             "sonar-reasoning"
         ]
         
+        # Connection reuse and concurrency budget for the chat-completions endpoint
+        self.api_url = SONAR_API_URL
+        self.session = requests.Session()
+        # One pooled async client per agent, kept on a long-lived event loop in a background
+        # thread so that blocking research_many calls reuse its keep-alive connections
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._async_client: Optional[AsyncSonarClient] = None
+        self._async_client_config: Optional[Tuple] = None
+        self._loop_lock = threading.Lock()
+        self.max_concurrency = 3
+        self.requests_per_second = 1.0
+        self.request_burst = 2
+        # Retriable failures (429, 5xx, timeouts) are retried with jittered backoff; pacing and
+        # the circuit breaker are shared per API key by every agent in the process
+        self.max_retries = 3
+        self.retry_base_delay = 0.5
+        
+        # Content-addressed response cache (memory LRU over SQLite)
+        self.cache = ResponseCache(self.data_dir / "response_cache.sqlite3")
+        
+        # Per-call token/cost accounting, shared by every agent in the project; cost_agent
+        # is the name calls are booked under (AgentSummoner sets its own)
+        self.cost_ledger = CostLedger(self.project_root / "research_data" / "cost_ledger.sqlite3")
+        self.cost_agent = "perplexity_sonar"
+        
+        # Indexed store for research artifacts, shared by every agent in the project
+        self.research_store = ResearchStore(self.project_root / "research_data" / "research_store.sqlite3")
+        
         self.setup_logging()
         
     def setup_logging(self):
@@ -52,25 +105,14 @@ class PerplexitySonarAgent:
             self.sonar_api_key = sonar_key  
             self.logger.info("✅ Sonar API key configured")
             
-    def perplexity_research(self, query: str, model: str = "sonar-pro") -> Dict:
-        """Conduct research using Perplexity Pro subscription"""
-        self.logger.info(f"🔍 Perplexity research: {query[:100]}...")
-        
-        if not self.sonar_api_key:
-            self.logger.warning("⚠️ Sonar API key not configured - using simulation mode")
-            return self._simulate_perplexity_research(query)
-            
-        headers = {
-            "Authorization": f"Bearer {self.sonar_api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
+    def _build_payload(self, query: str, model: str) -> Dict:
+        """Build the chat-completions request body"""
+        return {
             "model": model,
             "messages": [
                 {
                     "role": "system",
-                    "content": "You are an expert research assistant specializing in pharmaceutical R&D, agricultural biotechnology, and EU regulatory affairs. Provide comprehensive, accurate, and current information with specific data points, sources, and actionable insights."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user", 
@@ -82,31 +124,382 @@ class PerplexitySonarAgent:
             "top_p": 0.9
         }
         
-        try:
-            response = requests.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
+    def _success_result(self, query: str, model: str, response: Dict, query_class: str = "default") -> Dict:
+        """Wrap a chat-completions response in the agent's result format, booking its token usage"""
+        usage = response.get("usage") or {}
+        return {
+            "query": query,
+            "model": model,
+            "response": response,
+            "usage": usage,
+            "cost": self.cost_ledger.record(self.cost_agent, model, query_class, usage),
+            "timestamp": datetime.now().isoformat(),
+            "status": "success"
+        }
+        
+    def _cached_result(self, payload: Dict, query_class: str) -> Optional[Dict]:
+        """Look up a fresh cached answer for this exact request"""
+        result = self.cache.get(cache_key(payload), query_class)
+        if result is not None:
+            self.logger.info(f"💾 Cache hit ({query_class})")
+            self.cost_ledger.record(self.cost_agent, payload["model"], query_class, cached=True,
+                                    saved_cost=result.get("cost", 0.0))
+            result["cost"] = 0.0
+            result["status"] = "cached"
+        return result
+        
+    def _store_result(self, payload: Dict, result: Dict, query_class: str):
+        """Cache a successful API answer along with what it cost"""
+        self.cache.put(cache_key(payload), result, query_class, cost=result.get("cost", 0.0))
+        
+    def perplexity_research(self, query: str, model: str = "sonar-pro", query_class: str = "default",
+                            on_delta: Optional[Callable[[str], None]] = None) -> Dict:
+        """Conduct research using Perplexity Pro subscription.
+        
+        With ``on_delta`` the answer is streamed and each piece of text is passed
+        to it as it arrives; the returned result has the same shape either way.
+        """
+        if on_delta is not None:
+            for event in self.iter_research(query, model, query_class):
+                if event['event'] == 'delta':
+                    on_delta(event['text'])
+                else:
+                    return event['result']
+                    
+        self.logger.info(f"🔍 Perplexity research: {query[:100]}...")
+        
+        payload = self._build_payload(query, model)
+        cached = self._cached_result(payload, query_class)
+        if cached is not None:
+            TRACER.record("sonar.cache_hit", 0, model=model, query_class=query_class)
+            return cached
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info("✅ Perplexity research completed")
-                return {
-                    "query": query,
-                    "model": model,
-                    "response": result,
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "success"
-                }
+        if not self.sonar_api_key:
+            self.logger.warning("⚠️ Sonar API key not configured - using simulation mode")
+            return self._simulate_perplexity_research(query)
+            
+        headers = {
+            "Authorization": f"Bearer {self.sonar_api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        limiter, breaker = self._limits(model)
+        failure = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                failure = "circuit open"
+                break
+            queued = time.perf_counter()
+            if limiter.acquire():
+                TRACER.record("sonar.queue_wait", time.perf_counter() - queued, start=queued, model=model)
+            try:
+                with TRACER.span("sonar.http", model=model, query_class=query_class, attempt=attempt) as span:
+                    response = self._post_timed(headers, payload)
+                    span.set(status_code=response.status_code, bytes=len(response.content))
+            except requests.RequestException as e:
+                breaker.record_failure()
+                failure, retriable, retry_after = f"{type(e).__name__}: {e}", True, None
             else:
-                self.logger.error(f"❌ Perplexity API error: {response.status_code}")
-                return self._simulate_perplexity_research(query)
+                if response.status_code == 200:
+                    limiter.on_success(response.headers)
+                    breaker.record_success()
+                    try:
+                        with TRACER.span("sonar.parse", model=model):
+                            result = self._success_result(query, model, response.json(), query_class)
+                    except ValueError as e:
+                        failure = f"unreadable response: {e}"
+                        break
+                    self._store_result(payload, result, query_class)
+                    self.logger.info("✅ Perplexity research completed")
+                    return result
+                failure = f"HTTP {response.status_code}"
+                retriable, retry_after = self._record_error(limiter, breaker, response.status_code, response.headers)
                 
-        except Exception as e:
-            self.logger.error(f"❌ Perplexity research failed: {e}")
-            return self._simulate_perplexity_research(query)
+            if not retriable or attempt == self.max_retries:
+                break
+            delay = backoff_delay(attempt, self.retry_base_delay, retry_after=retry_after)
+            self.logger.warning(f"🔁 Perplexity API {failure} - retrying in {delay:.1f}s")
+            time.sleep(delay)
+            
+        return self._fallback(query, failure)
+        
+    def iter_research(self, query: str, model: str = "sonar-pro", query_class: str = "default") -> Iterator[Dict]:
+        """Stream an answer: {'event': 'delta', 'text', 'elapsed_seconds'} per piece of text,
+        then {'event': 'complete', 'result'} with the same result perplexity_research returns.
+        
+        Streamed results also carry their time to first token and total time. Cached and
+        simulated answers arrive as a single delta.
+        """
+        self.logger.info(f"🔍 Perplexity research (streaming): {query[:100]}...")
+        started = time.perf_counter()
+        payload = self._build_payload(query, model)
+        result = self._cached_result(payload, query_class)
+        if result is None and not self.sonar_api_key:
+            self.logger.warning("⚠️ Sonar API key not configured - using simulation mode")
+            result = self._simulate_perplexity_research(query)
+        if result is None:
+            result = yield from self._stream_answer(query, model, query_class, payload, started)
+        else:
+            content = result['response']['choices'][0]['message']['content']
+            yield {'event': 'delta', 'text': content, 'elapsed_seconds': round(time.perf_counter() - started, 3)}
+        yield {'event': 'complete', 'result': result}
+        
+    def _stream_answer(self, query: str, model: str, query_class: str, payload: Dict, started: float):
+        """Yield delta events from the API's event stream and return the assembled result.
+        
+        Failures before the first token are retried like perplexity_research. A stream
+        that breaks off, or ends without "[DONE]" or a finish_reason, after text has gone
+        out returns that text with status "partial" instead of a different answer.
+        """
+        headers = {
+            "Authorization": f"Bearer {self.sonar_api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream"
+        }
+        limiter, breaker = self._limits(model)
+        failure = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                failure = "circuit open"
+                break
+            limiter.acquire()
+            try:
+                response = self.session.post(self.api_url, headers=headers, json=dict(payload, stream=True),
+                                             timeout=60, stream=True)
+            except requests.RequestException as e:
+                breaker.record_failure()
+                failure, retriable, retry_after = f"{type(e).__name__}: {e}", True, None
+            else:
+                if response.status_code == 200:
+                    assembler = StreamAssembler()
+                    first_token = None
+                    try:
+                        # chunk_size=None hands over each chunk as it arrives instead of waiting for 512 bytes
+                        for data in iter_sse_data(response.iter_lines(chunk_size=None)):
+                            text = assembler.feed(data)
+                            if assembler.done:
+                                break
+                            if not text:
+                                continue
+                            elapsed = time.perf_counter() - started
+                            if first_token is None:
+                                first_token = elapsed
+                                TRACER.record("sonar.ttft", first_token, start=started, model=model)
+                            yield {'event': 'delta', 'text': text, 'elapsed_seconds': round(elapsed, 3)}
+                        if not assembler.complete:
+                            raise ValueError("stream ended without [DONE] or a finish_reason")
+                    except (requests.RequestException, ValueError) as e:
+                        breaker.record_failure()
+                        failure, retriable, retry_after = f"stream interrupted: {e}", True, None
+                        if first_token is not None:
+                            # Text already went out; report what arrived rather than a different answer
+                            return self._streamed_result(query, model, query_class, assembler, started,
+                                                         first_token, failure=failure)
+                    else:
+                        limiter.on_success(response.headers)
+                        breaker.record_success()
+                        result = self._streamed_result(query, model, query_class, assembler, started, first_token)
+                        self._store_result(payload, {k: v for k, v in result.items() if k != 'timing'}, query_class)
+                        self.logger.info(f"✅ Perplexity research streamed (first token {result['timing']['time_to_first_token_seconds']}s, "
+                                         f"total {result['timing']['total_seconds']}s)")
+                        return result
+                    finally:
+                        response.close()
+                else:
+                    failure = f"HTTP {response.status_code}"
+                    retriable, retry_after = self._record_error(limiter, breaker, response.status_code, response.headers)
+                    response.close()
+                
+            if not retriable or attempt == self.max_retries:
+                break
+            delay = backoff_delay(attempt, self.retry_base_delay, retry_after=retry_after)
+            self.logger.warning(f"🔁 Perplexity API {failure} - retrying in {delay:.1f}s")
+            time.sleep(delay)
+            
+        return self._fallback(query, failure)
+        
+    def _streamed_result(self, query: str, model: str, query_class: str, assembler: StreamAssembler,
+                         started: float, first_token: Optional[float], failure: Optional[str] = None) -> Dict:
+        """Result for an assembled stream; one that broke off is marked partial and never cached"""
+        total = time.perf_counter() - started
+        TRACER.record("sonar.stream", total, start=started, model=model, chunks=assembler.chunks)
+        result = self._success_result(query, model, assembler.response(), query_class)
+        result['timing'] = {
+            'time_to_first_token_seconds': round(first_token if first_token is not None else total, 3),
+            'total_seconds': round(total, 3)
+        }
+        if failure is not None:
+            self.logger.error(f"❌ Perplexity stream {failure} - returning the {assembler.length} characters received")
+            result.update(status="partial", fallback_reason=failure)
+        return result
+        
+    def _limits(self, model: str):
+        """Shared limiter for this key and model, and the key's circuit breaker"""
+        return (limiter_for(self.sonar_api_key, model, self.requests_per_second, self.request_burst),
+                breaker_for(self.sonar_api_key))
+        
+    def _record_error(self, limiter, breaker, status_code: int, headers) -> Tuple[bool, Optional[float]]:
+        """Feed a non-200 answer to the limiter and breaker; returns (retriable, Retry-After seconds)"""
+        retry_after = parse_delay(headers.get("retry-after"))
+        if status_code == 429:
+            limiter.on_throttled(retry_after, headers)
+        if status_code >= 500 or status_code in (408, 425):
+            breaker.record_failure()
+        else:
+            breaker.record_success()  # the endpoint is up: throttled, or the request itself was rejected
+        return status_code in RETRIABLE_STATUS, retry_after
+        
+    def _fallback(self, query: str, failure: Optional[str]) -> Dict:
+        """Simulated answer after the API failed, recording why"""
+        self.logger.error(f"❌ Perplexity research failed ({failure}) - using simulation mode")
+        result = self._simulate_perplexity_research(query)
+        result["fallback_reason"] = failure
+        return result
+            
+    def _post_timed(self, headers: Dict, payload: Dict) -> requests.Response:
+        """POST with the body streamed so connect, time-to-first-byte and body read are traced separately.
+
+        requests reports the request-sent → headers-parsed time as response.elapsed; whatever
+        precedes it (pool checkout, TCP/TLS connect, sending the body) is counted as connect.
+        """
+        started = time.perf_counter()
+        response = self.session.post(self.api_url, headers=headers, json=payload, timeout=60, stream=True)
+        headers_at = time.perf_counter()
+        ttfb = min(response.elapsed.total_seconds(), headers_at - started)
+        response.content  # read the body now, releasing the connection back to the pool
+        body_done = time.perf_counter()
+        
+        TRACER.record("sonar.connect", headers_at - started - ttfb, start=started)
+        TRACER.record("sonar.ttfb", ttfb, start=headers_at - ttfb)
+        TRACER.record("sonar.body", body_done - headers_at, start=headers_at, bytes=len(response.content))
+        return response
+            
+    async def _perplexity_research_async(self, client: AsyncSonarClient, query: str, model: str,
+                                         query_class: str = "default") -> Dict:
+        """Async counterpart of perplexity_research sharing the client's pool and rate budget"""
+        self.logger.info(f"🔍 Perplexity research (async): {query[:100]}...")
+        
+        payload = self._build_payload(query, model)
+        
+        limiter, breaker = self._limits(model)
+        failure = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                failure = "circuit open"
+                break
+            try:
+                response = await client.chat_completion(payload)
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                failure, retriable, retry_after = f"{type(e).__name__}: {e}", True, None
+            else:
+                if response.status_code == 200:
+                    limiter.on_success(response.headers)
+                    breaker.record_success()
+                    try:
+                        with TRACER.span("sonar.parse", model=model):
+                            result = self._success_result(query, model, response.json(), query_class)
+                    except ValueError as e:
+                        failure = f"unreadable response: {e}"
+                        break
+                    self._store_result(payload, result, query_class)
+                    self.logger.info("✅ Perplexity research completed")
+                    return result
+                failure = f"HTTP {response.status_code}"
+                retriable, retry_after = self._record_error(limiter, breaker, response.status_code, response.headers)
+                
+            if not retriable or attempt == self.max_retries:
+                break
+            delay = backoff_delay(attempt, self.retry_base_delay, retry_after=retry_after)
+            self.logger.warning(f"🔁 Perplexity API {failure} - retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            
+        return self._fallback(query, failure)
+            
+    async def research_many_async(self, queries: List[Tuple[str, str]], query_class: str = "default") -> List[Dict]:
+        """Run (query, model) pairs concurrently within the configured concurrency and rate limits"""
+        results = [self._cached_result(self._build_payload(query, model), query_class) for query, model in queries]
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        if misses and not self.sonar_api_key:
+            self.logger.warning("⚠️ Sonar API key not configured - using simulation mode")
+            for i in misses:
+                results[i] = self._simulate_perplexity_research(queries[i][0])
+        elif misses:
+            async def fan_out(client: AsyncSonarClient) -> List[Dict]:
+                return await asyncio.gather(*[
+                    self._perplexity_research_async(client, queries[i][0], queries[i][1], query_class) for i in misses
+                ])
+                
+            if asyncio.get_running_loop() is self._loop:
+                fetched = await fan_out(await self._pooled_client())
+            else:
+                # Called on the caller's own loop: the pooled client belongs to the agent's loop
+                async with self._new_async_client() as client:
+                    fetched = await fan_out(client)
+            for i, result in zip(misses, fetched):
+                results[i] = result
+                
+        return results
+        
+    def _new_async_client(self) -> AsyncSonarClient:
+        return AsyncSonarClient(
+            self.sonar_api_key,
+            api_url=self.api_url,
+            max_concurrency=self.max_concurrency,
+            requests_per_second=self.requests_per_second,
+            burst=self.request_burst
+        )
+        
+    async def _pooled_client(self) -> AsyncSonarClient:
+        """The agent's long-lived client, replaced if the key, URL or concurrency changed"""
+        config = (self.sonar_api_key, self.api_url, self.max_concurrency)
+        if self._async_client is not None and self._async_client_config != config:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._async_client is None:
+            self._async_client = self._new_async_client()
+            self._async_client_config = config
+        return self._async_client
+        
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """The agent's background event loop, started on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="sonar-loop", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+            
+    def research_many(self, queries: List[Tuple[str, str]], query_class: str = "default") -> List[Dict]:
+        """Blocking wrapper around research_many_async, results in input order.
+        
+        Runs on the agent's background loop with its pooled client. From async
+        code, await research_many_async instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("research_many() blocks and cannot be called from a running event loop; "
+                               "await research_many_async() instead")
+        future = asyncio.run_coroutine_threadsafe(self.research_many_async(queries, query_class), self._event_loop())
+        return future.result()
+        
+    def close(self):
+        """Close the pooled connections and stop the background event loop"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is not None:
+            if self._async_client is not None:
+                asyncio.run_coroutine_threadsafe(self._async_client.aclose(), loop).result()
+                self._async_client = None
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.session.close()
             
     def _simulate_perplexity_research(self, query: str) -> Dict:
         """Simulate Perplexity research for testing"""
@@ -202,6 +595,7 @@ class PerplexitySonarAgent:
             "query": query,
             "model": "simulation",
             "response": simulated_response,
+            "cost": 0.0,
             "timestamp": datetime.now().isoformat(),
             "status": "simulated"
         }
@@ -210,13 +604,9 @@ class PerplexitySonarAgent:
         """Run analysis across multiple Sonar models for comprehensive insights"""
         self.logger.info(f"🧠 Multi-model analysis: {query[:100]}...")
         
-        results = {}
-        
-        for model in self.sonar_models:
-            self.logger.info(f"   Using model: {model}")
-            result = self.perplexity_research(query, model)
-            results[model] = result
-            time.sleep(1)  # Rate limiting
+        self.logger.info(f"   Using models: {', '.join(self.sonar_models)}")
+        responses = self.research_many([(query, model) for model in self.sonar_models], query_class="multi_model")
+        results = dict(zip(self.sonar_models, responses))
             
         # Synthesize results
         synthesis = {
@@ -228,11 +618,9 @@ class PerplexitySonarAgent:
         }
         
         # Save results
-        output_file = self.data_dir / f"multi_model_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(synthesis, f, indent=2)
+        artifact_id = self.research_store.put("perplexity_sonar", "multi_model_analysis", synthesis, query=query)
             
-        self.logger.info(f"✅ Multi-model analysis completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Multi-model analysis completed. Stored as artifact #{artifact_id}")
         return synthesis
         
     def _synthesize_multi_model_results(self, results: Dict) -> Dict:
@@ -267,20 +655,15 @@ class PerplexitySonarAgent:
             "funding_landscape": """What are the current and upcoming EU funding opportunities for agricultural biotechnology and plant health research in 2024-2026? Include Horizon Europe calls, national funding programs, and private investment trends in agricultural biologicals."""
         }
         
-        research_results = {}
-        
-        for topic, query in queries.items():
-            self.logger.info(f"📋 Researching: {topic}")
-            result = self.perplexity_research(query)
-            research_results[topic] = result
-            time.sleep(2)  # Respectful rate limiting
+        self.logger.info(f"📋 Researching: {', '.join(queries)}")
+        responses = self.research_many([(query, "sonar-pro") for query in queries.values()],
+                                       query_class="specialized_research")
+        research_results = dict(zip(queries, responses))
             
         # Save comprehensive research
-        output_file = self.data_dir / f"specialized_research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(research_results, f, indent=2)
+        artifact_id = self.research_store.put("perplexity_sonar", "specialized_research", research_results)
             
-        self.logger.info(f"✅ Specialized research completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Specialized research completed. Stored as artifact #{artifact_id}")
         return research_results
         
     def generate_research_brief(self) -> Dict:
@@ -326,9 +709,7 @@ class PerplexitySonarAgent:
         }
         
         # Save brief
-        brief_file = self.data_dir / f"research_brief_{datetime.now().strftime('%Y%m%d')}.json"
-        with open(brief_file, 'w') as f:
-            json.dump(brief, f, indent=2)
+        brief_id = self.research_store.put("perplexity_sonar", "research_brief", brief)
             
         # Create executive markdown version
         md_file = self.data_dir / f"research_brief_{datetime.now().strftime('%Y%m%d')}.md"
@@ -344,8 +725,18 @@ class PerplexitySonarAgent:
             for action in brief['next_actions']:
                 f.write(f"- {action}\n")
                 
-        self.logger.info(f"✅ Comprehensive research brief generated: {brief_file}")
+        self.logger.info(f"✅ Comprehensive research brief generated: {md_file} (artifact #{brief_id})")
         return brief
+        
+    def run_task(self, payload: Dict) -> Dict:
+        """Plugin entry point: a single query, a multi-model analysis, or the full research brief"""
+        query = payload.get("query")
+        if query and payload.get("multi_model"):
+            return self.multi_model_analysis(query)
+        if query:
+            return self.perplexity_research(query, payload.get("model", "sonar-pro"),
+                                            payload.get("query_class", "default"))
+        return self.generate_research_brief()
 
 def main():
     agent = PerplexitySonarAgent()
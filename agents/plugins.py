@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Agent Plugins - Warm, in-process execution of research agents
+Agents are imported and constructed once, then called with task payloads and return structured results;
+subprocess isolation stays available per plugin (or per call) for untrusted agents
+"""
+
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+CODE_ROOT = Path(__file__).resolve().parent.parent
+
+
+class AgentPlugin:
+    def __init__(self, name: str, module: str, class_name: str, entry: str = "run_task",
+                 isolated: bool = False, timeout: Optional[float] = None):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.entry = entry
+        self.isolated = isolated
+        self.timeout = timeout
+
+
+DEFAULT_PLUGINS = [
+    AgentPlugin("perplexity_sonar", "agents.perplexity_sonar_agent", "PerplexitySonarAgent", timeout=1800),
+    AgentPlugin("market_intelligence", "agents.market_intelligence_agent", "MarketIntelligenceAgent", timeout=900),
+    AgentPlugin("eu_regulations", "agents.research_agent_eu_regulations", "EURegulationsAgent", timeout=1200)
+]
+
+
+class AgentPluginRegistry:
+    def __init__(self, project_root, plugins: Optional[Iterable[AgentPlugin]] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.project_root = Path(project_root)
+        self.logger = logger or logging.getLogger(__name__)
+        self.plugins = {}
+        self.instances = {}
+        self.lock = threading.Lock()
+        for plugin in DEFAULT_PLUGINS if plugins is None else plugins:
+            self.register(plugin)
+
+    def register(self, plugin: AgentPlugin):
+        self.plugins[plugin.name] = plugin
+        self.instances.pop(plugin.name, None)
+
+    def names(self) -> List[str]:
+        return list(self.plugins)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.plugins
+
+    def instance(self, name: str):
+        """The warm agent instance, imported and constructed on first use"""
+        with self.lock:
+            if name not in self.instances:
+                plugin = self.plugins[name]
+                agent_class = getattr(importlib.import_module(plugin.module), plugin.class_name)
+                self.instances[name] = agent_class(project_root=str(self.project_root))
+                self.logger.info(f"🔌 Loaded {plugin.class_name} plugin")
+            return self.instances[name]
+
+    def warm(self, names: Optional[Iterable[str]] = None):
+        """Load in-process plugins ahead of their first task"""
+        for name in names or self.plugins:
+            if not self.plugins[name].isolated:
+                self.instance(name)
+
+    def run(self, name: str, task: Dict, isolated: Optional[bool] = None) -> Dict:
+        """Run a task on the named agent; returns status, mode, result and timing"""
+        plugin = self.plugins.get(name)
+        if plugin is None:
+            return {"status": "error", "agent": name, "error": f"No plugin registered for {name}"}
+
+        isolated = plugin.isolated if isolated is None else isolated
+        payload = task.get("payload", {})
+        start_time = time.time()
+        try:
+            if isolated:
+                result = self._run_isolated(plugin, payload)
+            else:
+                result = getattr(self.instance(name), plugin.entry)(payload)
+        except Exception as e:
+            return {"status": "error", "agent": name, "mode": "subprocess" if isolated else "in_process",
+                    "error": str(e), "duration_seconds": round(time.time() - start_time, 3)}
+
+        return {
+            "status": "success",
+            "agent": name,
+            "mode": "subprocess" if isolated else "in_process",
+            "result": result,
+            "duration_seconds": round(time.time() - start_time, 3)
+        }
+
+    def _run_isolated(self, plugin: AgentPlugin, payload: Dict) -> Dict:
+        """Run the plugin in a fresh interpreter; the payload goes in on stdin, the result comes back as JSON on stdout"""
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(CODE_ROOT), os.environ.get("PYTHONPATH")])))
+        completed = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), plugin.module, plugin.class_name, plugin.entry,
+             str(self.project_root)],
+            input=json.dumps(payload, default=str), capture_output=True, text=True,
+            cwd=self.project_root, env=env, timeout=plugin.timeout
+        )
+        if completed.returncode != 0:
+            stderr = completed.stderr.strip().splitlines()
+            raise RuntimeError(f"{plugin.name} exited with {completed.returncode}: {stderr[-1] if stderr else ''}")
+        return json.loads(completed.stdout)
+
+
+def main():
+    """Subprocess host: plugins.py MODULE CLASS ENTRY PROJECT_ROOT < payload.json"""
+    if len(sys.argv) != 5:
+        print(main.__doc__, file=sys.stderr)
+        sys.exit(2)
+
+    sys.path.insert(0, str(CODE_ROOT))
+    module, class_name, entry, project_root = sys.argv[1:]
+    payload = json.loads(sys.stdin.read() or "{}")
+
+    # Agents log to stderr/files; stdout carries only the result
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    agent = getattr(importlib.import_module(module), class_name)(project_root=project_root)
+    result = getattr(agent, entry)(payload)
+    sys.stdout = stdout
+    json.dump(result, sys.stdout, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Shared adaptive pacing, retry backoff and circuit breaking for the Sonar API
+One limiter per (API key, model) and one breaker per API key live in a process-wide registry,
+so every agent, thread and event loop in the process draws on the same request budget
+"""
+
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+# Statuses worth retrying: throttling, timeouts and transient server-side failures
+RETRIABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_delay(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After / rate-limit reset header: "2", "1.5", "6m0s", "250ms" or an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based), never shorter than Retry-After"""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after) if retry_after is not None else delay
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate follows the server: halves on 429, creeps back up on success.
+
+    Reservations are taken under a thread lock and the caller sleeps outside it, so the
+    same bucket paces blocking threads (acquire) and event loops (acquire_async) alike.
+    Rate-limit headers can raise the ceiling (x-ratelimit-limit-requests, per minute)
+    or pause the bucket until their reset when nothing remains.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: float = 2.0, min_rate: float = 0.05,
+                 max_rate: Optional[float] = None, increase: float = 0.05, decrease: float = 0.5):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.min_rate = min(min_rate, rate) if rate > 0 else 0.0
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.counters = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0, "successes": 0}
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now and return how long the caller must wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self.counters["acquired"] += 1
+            if self.rate <= 0:
+                return 0.0
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= tokens
+            wait = max(-self.tokens / self.rate, self.paused_until - now, 0.0)
+            self.counters["waited_seconds"] += wait
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_success(self, headers: Optional[Mapping[str, str]] = None):
+        """Additive increase toward the ceiling, then apply any rate-limit headers"""
+        with self._lock:
+            self.counters["successes"] += 1
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self._apply_headers(headers or {})
+
+    def on_throttled(self, retry_after: Optional[float] = None, headers: Optional[Mapping[str, str]] = None):
+        """Multiplicative decrease after a 429, pausing every caller for Retry-After"""
+        with self._lock:
+            self.counters["throttled"] += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            self._apply_headers(headers or {})
+
+    def _apply_headers(self, headers: Mapping[str, str]):
+        limit = headers.get("x-ratelimit-limit-requests")
+        if limit:
+            try:
+                self.max_rate = max(self.min_rate, float(limit) / 60)
+                self.rate = min(self.rate, self.max_rate)
+            except ValueError:
+                pass
+        if headers.get("x-ratelimit-remaining-requests") == "0":
+            reset = parse_delay(headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                self.paused_until = max(self.paused_until, time.monotonic() + reset)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, waited_seconds=round(self.counters["waited_seconds"], 3),
+                        rate=round(self.rate, 3), max_rate=round(self.max_rate, 3))
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint after repeated failures; one trial call is let through after the cooldown"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+_registry_lock = threading.Lock()
+_limiters: Dict[Tuple[str, str], AdaptiveRateLimiter] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def _key_id(api_key: str) -> str:
+    # Registry keys are digests so the raw API key is not kept around in another place
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def limiter_for(api_key: str, model: str, rate: float = 1.0, burst: float = 2.0) -> AdaptiveRateLimiter:
+    """The process-wide limiter for this key and model; rate/burst only apply when it is first created"""
+    with _registry_lock:
+        key = (_key_id(api_key), model)
+        if key not in _limiters:
+            _limiters[key] = AdaptiveRateLimiter(rate, burst)
+        return _limiters[key]
+
+
+def breaker_for(api_key: str) -> CircuitBreaker:
+    """The process-wide circuit breaker for this key"""
+    with _registry_lock:
+        return _breakers.setdefault(_key_id(api_key), CircuitBreaker())
+
+
+def reset_limits():
+    """Forget every shared limiter and breaker (new configuration, tests)"""
+    with _registry_lock:
+        _limiters.clear()
+        _breakers.clear()
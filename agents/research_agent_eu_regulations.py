@@ -6,16 +6,22 @@ Monitors EU plant protection legislation and Horizon Europe updates
 
 import requests
 import time
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict
 import logging
 
+try:
+    from agents.research_store import ResearchStore
+except ImportError:  # executed directly from the agents directory
+    from research_store import ResearchStore
+
 class EURegulationsAgent:
     def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF"):
         self.project_root = Path(project_root)
         self.data_dir = self.project_root / "research_data" / "eu_regulations"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.research_store = ResearchStore(self.project_root / "research_data" / "research_store.sqlite3")
         
         self.setup_logging()
         
@@ -63,14 +69,11 @@ class EURegulationsAgent:
         for keyword in keywords:
             self.logger.info(f"   Searching for: {keyword}")
             # Placeholder for actual API integration
-            time.sleep(0.5)  # Respectful rate limiting
         
         # Save results
-        output_file = self.data_dir / f"horizon_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        artifact_id = self.research_store.put("eu_regulations", "horizon_scan", results)
         
-        self.logger.info(f"✅ Horizon scan completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Horizon scan completed. Stored as artifact #{artifact_id}")
         return results
         
     def track_plant_protection_regulations(self):
@@ -96,11 +99,9 @@ class EURegulationsAgent:
             self.logger.info(f"   Monitoring: {reg}")
             # Placeholder for regulation tracking
             
-        output_file = self.data_dir / f"regulations_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(regulations, f, indent=2)
+        artifact_id = self.research_store.put("eu_regulations", "regulations_scan", regulations)
             
-        self.logger.info(f"✅ Regulation scan completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Regulation scan completed. Stored as artifact #{artifact_id}")
         return regulations
         
     def analyze_xylella_research_landscape(self):
@@ -126,11 +127,9 @@ class EURegulationsAgent:
             self.logger.info(f"   Scanning: {db}")
             # Placeholder for research database integration
             
-        output_file = self.data_dir / f"xylella_research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(research_analysis, f, indent=2)
+        artifact_id = self.research_store.put("eu_regulations", "xylella_research", research_analysis)
             
-        self.logger.info(f"✅ Research landscape analysis completed. Results saved to {output_file}")
+        self.logger.info(f"✅ Research landscape analysis completed. Stored as artifact #{artifact_id}")
         return research_analysis
         
     def generate_daily_brief(self):
@@ -167,9 +166,7 @@ class EURegulationsAgent:
         }
         
         # Save brief
-        brief_file = self.data_dir / f"daily_brief_{datetime.now().strftime('%Y%m%d')}.json"
-        with open(brief_file, 'w') as f:
-            json.dump(brief, f, indent=2)
+        brief_id = self.research_store.put("eu_regulations", "daily_brief", brief)
             
         # Also create markdown version for readability
         md_file = self.data_dir / f"daily_brief_{datetime.now().strftime('%Y%m%d')}.md"
@@ -183,9 +180,19 @@ class EURegulationsAgent:
             for rec in brief['recommendations']:
                 f.write(f"- {rec}\n")
                 
-        self.logger.info(f"✅ Daily brief generated: {brief_file}")
+        self.logger.info(f"✅ Daily brief generated: {md_file} (artifact #{brief_id})")
         return brief
         
+    def run_task(self, payload: Dict) -> Dict:
+        """Plugin entry point: one scan by name, or the full daily brief"""
+        scans = {
+            "horizon_calls": self.monitor_horizon_calls,
+            "regulations": self.track_plant_protection_regulations,
+            "xylella_research": self.analyze_xylella_research_landscape
+        }
+        scan = scans.get(payload.get("scan"), self.generate_daily_brief)
+        return scan()
+        
     def run_continuous_monitoring(self, interval_hours=6):
         """Run continuous monitoring with specified interval"""
         self.logger.info(f"🤖 Starting continuous monitoring (every {interval_hours} hours)")
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Research Store - Shared, indexed storage for research artifacts
+One write API for every agent: artifacts go into SQLite as compressed compact JSON (zstd when the
+zstandard package is installed, zlib otherwise), with a catalog (agent, artifact type, timestamp,
+domain, query hash) kept apart from the bodies so range and latest queries never load unrelated
+artifacts. Artifacts can reference each other with {"$ref": id}, resolved again on read, so nested
+results are stored once. Text is added to an FTS5 index as artifacts are written (BM25-ranked
+search with snippets). Imports the legacy timestamped JSON files.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from agents.tracing import TRACER
+except ImportError:  # executed directly as agents/research_store.py
+    from tracing import TRACER
+
+try:
+    import zstandard
+except ImportError:  # optional: bodies fall back to zlib
+    zstandard = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT NOT NULL,
+    artifact_type TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    domain TEXT,
+    query_hash TEXT,
+    source TEXT UNIQUE,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    encoding TEXT NOT NULL DEFAULT 'json+zlib',
+    model TEXT,
+    indexed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_type ON artifacts (agent, artifact_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_domain ON artifacts (domain COLLATE NOCASE, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_query ON artifacts (query_hash, created_at);
+CREATE TABLE IF NOT EXISTS artifact_bodies (
+    id INTEGER PRIMARY KEY REFERENCES artifacts (id) ON DELETE CASCADE,
+    body BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS artifact_text USING fts5 (
+    text, artifact_id UNINDEXED, field UNINDEXED, model UNINDEXED, tokenize = 'porter unicode61'
+);
+"""
+
+# Catalog columns added after the first release, with their definitions
+MIGRATIONS = {
+    "encoding": "TEXT NOT NULL DEFAULT 'json+zlib'",
+    "model": "TEXT",
+    "indexed": "INTEGER NOT NULL DEFAULT 0"
+}
+
+CATALOG_COLUMNS = ("id", "agent", "artifact_type", "created_at", "domain", "query_hash", "source", "size",
+                   "stored_size", "encoding", "model")
+
+# Fast levels: artifacts are written on the request path, and higher levels buy little on prose
+COMPRESSION_LEVELS = {"json+zstd": 3, "json+zlib": 3}
+DEFAULT_ENCODING = "json+zstd" if zstandard is not None else "json+zlib"
+
+REF_KEY = "$ref"
+
+# Fields never indexed for search: the prompts that produced an answer, not findings
+UNINDEXED_FIELDS = {"query", "analysis_query", "discovery_query", "evaluation_query"}
+SEARCH_TOKEN_RE = re.compile(r'"[^"]+"|\w+\*?')
+
+# Legacy file names: <artifact_type>_YYYYMMDD[_HHMMSS].json
+LEGACY_FILE_RE = re.compile(r"^(?P<type>.+?)_(?P<date>\d{8})(?:_(?P<time>\d{6}))?\.json$")
+
+Timestamp = Union[float, str, None]
+
+
+def ref(artifact_id: int) -> Dict:
+    """Placeholder for another artifact, replaced by its data when the referencing artifact is read"""
+    return {REF_KEY: artifact_id}
+
+
+def _compress(raw: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "json+zstd":
+        return zstandard.ZstdCompressor(level=level).compress(raw)
+    return zlib.compress(raw, level)
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "json+zstd":
+        if zstandard is None:
+            raise RuntimeError("Artifact is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    return zlib.decompress(body)
+
+
+def text_fragments(data, model: Optional[str] = None) -> List[Tuple[str, Optional[str], str]]:
+    """(field path, model, text) for the prose in an artifact, one fragment per field and model.
+
+    Strings without whitespace (ids, timestamps, URLs, enum values) and referenced artifacts are
+    skipped; a "model" key applies to everything under the dict that holds it.
+    """
+    fragments: Dict[Tuple[str, Optional[str]], List[str]] = {}
+    seen = set()
+
+    def walk(value, path: str, model: Optional[str]):
+        if isinstance(value, dict):
+            if REF_KEY in value and len(value) == 1:
+                return
+            if isinstance(value.get("model"), str):
+                model = value["model"]
+            for key, item in value.items():
+                if key not in UNINDEXED_FIELDS:
+                    walk(item, f"{path}.{key}" if path else str(key), model)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, path, model)
+        elif isinstance(value, str) and any(ch.isspace() for ch in value.strip()) and value not in seen:
+            seen.add(value)
+            fragments.setdefault((path, model), []).append(value.strip())
+
+    walk(data, "", model)
+    return [(path, model, "\n".join(texts)) for (path, model), texts in fragments.items()]
+
+
+def fts_query(text: str) -> str:
+    """FTS5 MATCH expression from free text: words are quoted (so punctuation cannot break the
+    query syntax) and implicitly AND-ed; "phrases", prefix* and OR are kept"""
+    terms = []
+    for token in SEARCH_TOKEN_RE.findall(text):
+        if token == "OR" and terms and terms[-1] != "OR":
+            terms.append(token)
+        elif token.startswith('"'):
+            terms.append('"' + token.strip('"').replace('"', '') + '"')
+        elif token.endswith("*"):
+            terms.append(f'"{token[:-1]}"*')
+        else:
+            terms.append(f'"{token}"')
+    while terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms)
+
+
+def query_hash(query: str) -> str:
+    """Stable hash of a query, insensitive to case and whitespace"""
+    return hashlib.sha256(" ".join(query.lower().split()).encode("utf-8")).hexdigest()[:16]
+
+
+def _epoch(value: Timestamp) -> Optional[float]:
+    """Epoch seconds from a number or an ISO date/datetime string"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _task_analysis(data: Dict) -> Dict:
+    """The task_analysis record of a summoner artifact, however deeply it is nested"""
+    while isinstance(data, dict):
+        if isinstance(data.get("task_analysis"), dict):
+            return data["task_analysis"]
+        data = data.get("agent_evaluation") or data.get("agent_discovery")
+    return {}
+
+
+class ResearchStore:
+    def __init__(self, db_path, encoding: str = DEFAULT_ENCODING, compression_level: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if encoding == "json+zstd" and zstandard is None:
+            raise ValueError("json+zstd encoding requires the zstandard package")
+        self.encoding = encoding
+        self.compression_level = compression_level if compression_level is not None else COMPRESSION_LEVELS[encoding]
+        self.lock = threading.RLock()
+        self.transaction_depth = 0
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        # Small pages waste less space on multi-KB compressed bodies (only applies to a new file)
+        self.conn.execute("PRAGMA page_size=1024")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(artifacts)")}
+        for column, definition in MIGRATIONS.items():
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE artifacts ADD COLUMN {column} {definition}")
+        self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Group several puts into a single commit, e.g. every stage of one result"""
+        with self.lock:
+            self.transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.transaction_depth -= 1
+                if not self.transaction_depth:
+                    self.conn.rollback()
+                raise
+            self.transaction_depth -= 1
+            if not self.transaction_depth:
+                self.conn.commit()
+
+    def put(self, agent: str, artifact_type: str, data: Dict, domain: Optional[str] = None,
+            query: Optional[str] = None, created_at: Timestamp = None, source: Optional[str] = None,
+            model: Optional[str] = None) -> int:
+        """Store one artifact and index its text; returns its id. Values made with ref() point at
+        other artifacts. model is the artifact's default model for search filters."""
+        with TRACER.span("store.encode", artifact_type=artifact_type) as span:
+            raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+            body = _compress(raw, self.encoding, self.compression_level)
+            span.set(size=len(raw), stored_size=len(body))
+        created_at = _epoch(created_at) or time.time()
+        with TRACER.span("store.write", artifact_type=artifact_type), self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO artifacts (agent, artifact_type, created_at, domain, query_hash, source, size, "
+                "stored_size, encoding, model, indexed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                (agent, artifact_type, created_at, domain, query_hash(query) if query else None, source,
+                 len(raw), len(body), self.encoding, model)
+            )
+            artifact_id = cursor.lastrowid
+            self.conn.execute("INSERT INTO artifact_bodies (id, body) VALUES (?, ?)", (artifact_id, body))
+            self._index(artifact_id, data, model)
+            if not self.transaction_depth:
+                self.conn.commit()
+        return artifact_id
+
+    def _index(self, artifact_id: int, data: Dict, model: Optional[str]):
+        with TRACER.span("store.index"):
+            self.conn.executemany(
+                "INSERT INTO artifact_text (text, artifact_id, field, model) VALUES (?, ?, ?, ?)",
+                [(text, artifact_id, field, fragment_model)
+                 for field, fragment_model, text in text_fragments(data, model)]
+            )
+
+    def index_pending(self) -> int:
+        """Index artifacts written before the search index existed; returns how many were added"""
+        with self.lock:
+            pending = self.conn.execute("SELECT id, model FROM artifacts WHERE indexed = 0 ORDER BY id").fetchall()
+        for artifact_id, model in pending:
+            data = self.get(artifact_id, resolve=False)
+            with self.transaction():
+                self._index(artifact_id, data, model)
+                self.conn.execute("UPDATE artifacts SET indexed = 1 WHERE id = ?", (artifact_id,))
+        return len(pending)
+
+    def search(self, text: str, agent: Optional[str] = None, artifact_type: Optional[str] = None,
+               model: Optional[str] = None, since: Timestamp = None, until: Timestamp = None,
+               limit: int = 20) -> List[Dict]:
+        """BM25-ranked artifacts whose text matches, best first, each with its best-matching snippet.
+
+        Snippets mark matched terms with [brackets]; "matches" counts the artifact's matching fields.
+        """
+        match = fts_query(text)
+        if not match:
+            return []
+        clauses, params = ["artifact_text MATCH ?"], [match]
+        for column, value in (("a.agent", agent), ("a.artifact_type", artifact_type), ("t.model", model)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("a.created_at >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            clauses.append("a.created_at <= ?")
+            params.append(_epoch(until))
+
+        sql = ("SELECT t.rowid, t.artifact_id, t.field, t.model, bm25(artifact_text) AS score, "
+               "a.agent, a.artifact_type, a.created_at, a.domain "
+               "FROM artifact_text t JOIN artifacts a ON a.id = t.artifact_id "
+               f"WHERE {' AND '.join(clauses)} ORDER BY score")
+        with TRACER.span("store.search"), self.lock:
+            hits, best_rows = {}, {}
+            for rowid, artifact_id, field, fragment_model, score, hit_agent, hit_type, created_at, domain \
+                    in self.conn.execute(sql, params):
+                if artifact_id in hits:
+                    hits[artifact_id]["matches"] += 1
+                    continue
+                if len(hits) == limit:
+                    continue
+                best_rows[artifact_id] = rowid
+                hits[artifact_id] = {
+                    "id": artifact_id,
+                    "agent": hit_agent,
+                    "artifact_type": hit_type,
+                    "created_at": datetime.fromtimestamp(created_at).isoformat(),
+                    "domain": domain,
+                    "model": fragment_model,
+                    "field": field,
+                    "score": round(-score, 4),
+                    "matches": 1
+                }
+            # Snippets only for the fragments returned, not for every match
+            for artifact_id, rowid in best_rows.items():
+                hits[artifact_id]["snippet"] = self.conn.execute(
+                    "SELECT snippet(artifact_text, 0, '[', ']', '…', 16) FROM artifact_text "
+                    "WHERE artifact_text MATCH ? AND rowid = ?", (match, rowid)
+                ).fetchone()[0]
+        return list(hits.values())
+
+    def get(self, artifact_id: int, resolve: bool = True) -> Optional[Dict]:
+        """Decoded body of one artifact, with references replaced by the artifacts they point at"""
+        return self._load(artifact_id, {} if resolve else None)
+
+    def _load(self, artifact_id: int, resolved: Optional[Dict[int, Dict]]) -> Optional[Dict]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT b.body, a.encoding FROM artifact_bodies b JOIN artifacts a ON a.id = b.id WHERE b.id = ?",
+                (artifact_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(_decompress(row[0], row[1]))
+        return data if resolved is None else self._resolve(data, resolved)
+
+    def _resolve(self, value, resolved: Dict[int, Dict]):
+        """Replace {"$ref": id} values; an artifact referenced twice is decoded once and shared"""
+        if isinstance(value, dict):
+            if len(value) == 1 and REF_KEY in value:
+                target = value[REF_KEY]
+                if target not in resolved:
+                    resolved[target] = self._load(target, resolved)
+                return resolved[target]
+            return {key: self._resolve(item, resolved) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(item, resolved) for item in value]
+        return value
+
+    def find(self, agent: Optional[str] = None, artifact_type: Optional[str] = None, domain: Optional[str] = None,
+             query: Optional[str] = None, since: Timestamp = None, until: Timestamp = None,
+             limit: Optional[int] = 100, with_data: bool = False) -> List[Dict]:
+        """Catalog entries matching the filters, newest first; bodies are only loaded with with_data"""
+        clauses, params = [], []
+        for column, value in (("agent", agent), ("artifact_type", artifact_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if domain is not None:
+            clauses.append("domain = ? COLLATE NOCASE")
+            params.append(domain)
+        if query is not None:
+            clauses.append("query_hash = ?")
+            params.append(query_hash(query))
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(_epoch(until))
+
+        sql = f"SELECT {', '.join(CATALOG_COLUMNS)} FROM artifacts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            entries = [dict(zip(CATALOG_COLUMNS, row)) for row in self.conn.execute(sql, params).fetchall()]
+        if with_data:
+            for entry in entries:
+                entry["data"] = self.get(entry["id"])
+        return entries
+
+    def latest(self, agent: Optional[str] = None, artifact_type: Optional[str] = None, **filters) -> Optional[Dict]:
+        """Newest matching artifact (catalog entry plus "data"), or None"""
+        entries = self.find(agent, artifact_type, limit=1, with_data=True, **filters)
+        return entries[0] if entries else None
+
+    def import_json_files(self, research_root, remove: bool = False) -> Dict:
+        """Import legacy research_data/<agent>/<type>_<timestamp>.json files; already-imported files are skipped"""
+        research_root = Path(research_root)
+        stats = {"imported": 0, "skipped": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+        for path in sorted(research_root.glob("*/*.json")):
+            match = LEGACY_FILE_RE.match(path.name)
+            source = str(path.relative_to(research_root))
+            if match is None:
+                stats["skipped"] += 1
+                continue
+            with self.lock:
+                known = self.conn.execute("SELECT 1 FROM artifacts WHERE source = ?", (source,)).fetchone()
+            if known:
+                stats["skipped"] += 1
+                continue
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                stats["failed"] += 1
+                continue
+
+            stamp = match.group("date") + (match.group("time") or "000000")
+            task_analysis = _task_analysis(data) if isinstance(data, dict) else {}
+            query = (data.get("query") or data.get("user_request") if isinstance(data, dict) else None) \
+                or task_analysis.get("original_request")
+            artifact_id = self.put(path.parent.name, match.group("type"), data, domain=task_analysis.get("domain"),
+                                   query=query, created_at=datetime.strptime(stamp, "%Y%m%d%H%M%S").timestamp(),
+                                   source=source)
+            stats["imported"] += 1
+            stats["bytes_before"] += path.stat().st_size
+            with self.lock:
+                stats["bytes_after"] += self.conn.execute(
+                    "SELECT stored_size FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()[0]
+            if remove:
+                path.unlink()
+        return stats
+
+    def stats(self) -> Dict:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT agent, artifact_type, COUNT(*), SUM(size), SUM(stored_size), MAX(created_at) "
+                "FROM artifacts GROUP BY agent, artifact_type ORDER BY agent, artifact_type"
+            ).fetchall()
+        return {
+            "artifacts": sum(row[2] for row in rows),
+            "size": sum(row[3] for row in rows),
+            "stored_size": sum(row[4] for row in rows),
+            "by_type": [
+                {"agent": agent, "artifact_type": artifact_type, "count": count, "size": size,
+                 "stored_size": stored, "latest": datetime.fromtimestamp(latest).isoformat()}
+                for agent, artifact_type, count, size, stored, latest in rows
+            ]
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy research JSON files into the research store "
+                                                 "and index anything not yet searchable")
+    parser.add_argument("project_root", nargs="?", default=".")
+    parser.add_argument("--remove", action="store_true", help="Delete each JSON file once it is imported")
+    args = parser.parse_args()
+
+    research_root = Path(args.project_root) / "research_data"
+    store = ResearchStore(research_root / "research_store.sqlite3")
+    stats = store.import_json_files(research_root, remove=args.remove)
+    store.index_pending()
+    print(f"📦 Imported {stats['imported']} artifacts ({stats['skipped']} skipped, {stats['failed']} failed): "
+          f"{stats['bytes_before']:,} bytes of JSON -> {stats['bytes_after']:,} bytes stored")
+
+
+if __name__ == "__main__":
+    main()
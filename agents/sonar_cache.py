@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Sonar Response Cache - Content-addressed cache for chat-completions research results
+LRU memory tier over a persistent SQLite tier, with per-query-class freshness windows
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+HOUR = 3600
+
+# Freshness window (seconds) per query class
+DEFAULT_TTLS = {
+    "default": 6 * HOUR,
+    "specialized_research": 24 * HOUR,
+    "multi_model": 24 * HOUR,
+    "agent_analysis": 7 * 24 * HOUR,
+    "agent_discovery": 3 * 24 * HOUR,
+    "agent_evaluation": 3 * 24 * HOUR
+}
+
+
+def cache_key(payload: Dict) -> str:
+    """Hash the request fields that determine the answer"""
+    messages = payload.get("messages", [])
+    material = {
+        "model": payload.get("model"),
+        "system": next((m["content"] for m in messages if m.get("role") == "system"), ""),
+        "user": next((m["content"] for m in reversed(messages) if m.get("role") == "user"), ""),
+        "temperature": payload.get("temperature"),
+        "top_p": payload.get("top_p"),
+        "max_tokens": payload.get("max_tokens")
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, db_path, memory_size: int = 256, ttls: Optional[Dict[str, int]] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.memory_size = memory_size
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "cost_saved": 0.0
+        }
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, query_class TEXT, stored_at REAL, cost REAL, result TEXT)"
+        )
+        self.conn.commit()
+
+    def ttl(self, query_class: str) -> int:
+        return self.ttls.get(query_class, self.ttls["default"])
+
+    def get(self, key: str, query_class: str = "default") -> Optional[Dict]:
+        """Return a fresh cached result or None"""
+        horizon = time.time() - self.ttl(query_class)
+        with self.lock:
+            entry = self.memory.get(key)
+            tier = "memory_hits"
+            if entry is None:
+                row = self.conn.execute(
+                    "SELECT stored_at, cost, result FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = {"stored_at": row[0], "cost": row[1], "result": json.loads(row[2])}
+                    self._remember(key, entry)
+                    tier = "disk_hits"
+            else:
+                self.memory.move_to_end(key)
+
+            if entry is None or entry["stored_at"] < horizon:
+                self.counters["misses"] += 1
+                return None
+
+            self.counters[tier] += 1
+            self.counters["cost_saved"] += entry["cost"] or 0.0
+            return dict(entry["result"], cached=True, cache_key=key)
+
+    def put(self, key: str, result: Dict, query_class: str = "default", cost: float = 0.0):
+        entry = {"stored_at": time.time(), "cost": cost, "result": result}
+        with self.lock:
+            self._remember(key, entry)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, query_class, stored_at, cost, result) VALUES (?, ?, ?, ?, ?)",
+                (key, query_class, entry["stored_at"], cost, json.dumps(result, separators=(",", ":")))
+            )
+            self.conn.commit()
+            self.counters["stores"] += 1
+
+    def _remember(self, key: str, entry: Dict):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            lookups = hits + self.counters["misses"]
+            return {
+                "hits": hits,
+                "memory_hits": self.counters["memory_hits"],
+                "disk_hits": self.counters["disk_hits"],
+                "misses": self.counters["misses"],
+                "stores": self.counters["stores"],
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "cost_saved": round(self.counters["cost_saved"], 4),
+                "memory_entries": len(self.memory),
+                "disk_entries": entries
+            }
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Async Sonar Client - Pooled asyncio client for the Perplexity chat-completions endpoint
+Keeps one keep-alive (HTTP/2 when available) connection pool and paces requests with the shared
+per-key, per-model limiter from rate_limiter; also parses streamed (server-sent event) answers
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import httpx
+
+try:
+    from agents.tracing import TRACER
+    from agents.rate_limiter import limiter_for
+except ImportError:  # imported from inside agents/
+    from tracing import TRACER
+    from rate_limiter import limiter_for
+
+SONAR_API_URL = "https://api.perplexity.ai/chat/completions"
+
+
+def iter_sse_data(lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """Data payloads of a server-sent event stream, one per event (the final one is usually "[DONE]")"""
+    data: List[str] = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r")
+        if not line:
+            if data:
+                payload, data = "\n".join(data), []
+                yield payload
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":  # comments (":keep-alive"), event:, id: and retry: lines carry no answer text
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+class StreamAssembler:
+    """Rebuilds a chat-completions response dict from streamed chunks"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.length = 0
+        self.chunks = 0
+        self.finish_reason = None
+        self.done = False
+        self.fields: Dict = {}
+
+    @property
+    def content(self) -> str:
+        return "".join(self.parts)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the stream was properly terminated, by "[DONE]" or a finish_reason"""
+        return self.done or self.finish_reason is not None
+
+    def feed(self, data: str) -> str:
+        """Merge one event's data payload; returns the new answer text it carried"""
+        if data == "[DONE]":
+            self.done = True
+            return ""
+        return self.add(json.loads(data))
+
+    def add(self, chunk: Dict) -> str:
+        """Merge one chunk; returns the new answer text it carried"""
+        self.chunks += 1
+        choice = (chunk.get("choices") or [{}])[0]
+        text = (choice.get("delta") or {}).get("content") or ""
+        if not text and choice.get("message"):
+            # Some chunks repeat the whole answer so far instead of a delta
+            full = choice["message"].get("content") or ""
+            text = full[self.length:] if len(full) > self.length else ""
+        if text:
+            self.parts.append(text)
+            self.length += len(text)
+        self.finish_reason = choice.get("finish_reason") or self.finish_reason
+        # id, model, usage, citations... arrive on every chunk or only on the last one
+        self.fields.update((key, value) for key, value in chunk.items() if key != "choices")
+        return text
+
+    def response(self) -> Dict:
+        """The assembled answer in the shape of a non-streamed response"""
+        return dict(self.fields, object="chat.completion", choices=[{
+            "index": 0,
+            "finish_reason": self.finish_reason,
+            "message": {"role": "assistant", "content": self.content}
+        }])
+
+
+class HttpPhaseTrace:
+    """httpcore trace hook: timestamps each connection/request event to split connect, TTFB and body"""
+
+    def __init__(self):
+        self.marks = {}
+
+    async def __call__(self, event_name: str, info: Dict):
+        # Drop the http11./http2. prefix so both protocols report the same phases
+        if event_name.startswith(("http11.", "http2.")):
+            event_name = event_name.split(".", 1)[1]
+        self.marks[event_name] = time.perf_counter()
+
+    def _phase(self, start: str, end: str) -> Optional[Tuple[float, float]]:
+        if start in self.marks and end in self.marks:
+            return self.marks[start], self.marks[end] - self.marks[start]
+        return None
+
+    def emit(self, tracer, **attrs):
+        connect = [self._phase(f"connection.{step}.started", f"connection.{step}.complete")
+                   for step in ("connect_tcp", "start_tls")]
+        connect = [phase for phase in connect if phase]
+        if connect:
+            tracer.record("sonar.connect", sum(duration for _, duration in connect), start=connect[0][0], **attrs)
+        else:
+            tracer.record("sonar.connect", 0, reused=True, **attrs)
+        for name, start, end in (("sonar.ttfb", "send_request_headers.started", "receive_response_headers.complete"),
+                                 ("sonar.body", "receive_response_body.started", "receive_response_body.complete")):
+            phase = self._phase(start, end)
+            if phase:
+                tracer.record(name, phase[1], start=phase[0], **attrs)
+
+
+class AsyncSonarClient:
+    def __init__(self, api_key: str, api_url: str = SONAR_API_URL, max_concurrency: int = 4,
+                 requests_per_second: float = 1.0, burst: int = 2, timeout: float = 60,
+                 http2: bool = True):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.timeout = timeout
+        self.http2 = http2 and self._h2_available()
+        self.max_concurrency = max(1, max_concurrency)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _h2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    async def __aenter__(self):
+        self._ensure_client()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                limits=httpx.Limits(max_keepalive_connections=self.max_concurrency,
+                                    max_connections=self.max_concurrency)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def chat_completion(self, payload: Dict) -> httpx.Response:
+        """POST one chat-completions payload within the concurrency and rate budget"""
+        client = self._ensure_client()
+        queued = time.perf_counter()
+        async with self.semaphore:
+            await limiter_for(self.api_key, payload.get("model", ""), self.requests_per_second, self.burst).acquire_async()
+            TRACER.record("sonar.queue_wait", time.perf_counter() - queued, start=queued)
+            if not TRACER.enabled:
+                return await client.post(self.api_url, json=payload)
+                
+            # Timed by hand rather than with TRACER.span: spans nest per thread, and
+            # concurrent requests interleave on the event loop's single thread
+            phases = HttpPhaseTrace()
+            started = time.perf_counter()
+            response = await client.post(self.api_url, json=payload, extensions={"trace": phases})
+            TRACER.record("sonar.http", time.perf_counter() - started, start=started, model=payload.get("model"),
+                          status_code=response.status_code, bytes=len(response.content))
+            phases.emit(TRACER, model=payload.get("model"))
+            return response
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tracing - Lightweight span tracer for the Mission Control pipeline
+Spans land in a bounded ring buffer with JSONL / Chrome-trace export and per-name p50/p95/p99 rollups;
+when disabled, span() hands back a shared no-op object so instrumented code pays almost nothing
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class _NullSpan:
+    """Returned while tracing is off: every operation is a no-op"""
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start", "span_id", "parent_id")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.span_id = None
+        self.parent_id = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = self.tracer._stack()
+        self.parent_id = stack[-1] if stack else None
+        self.span_id = next(self.tracer._ids)
+        stack.append(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._emit(self.name, self.start, duration, self.attrs, self.span_id, self.parent_id)
+        return False
+
+
+class Tracer:
+    def __init__(self, capacity: int = 20000, enabled: bool = False):
+        self.enabled = enabled
+        self.buffer = deque(maxlen=capacity)
+        self.local = threading.local()
+        self._ids = itertools.count(1)
+        # perf_counter is monotonic but has no epoch; anchor it once for export timestamps
+        self._epoch = time.time() - time.perf_counter()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.buffer.clear()
+
+    def _stack(self) -> List[int]:
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def span(self, name: str, **attrs):
+        """Context manager timing the enclosed block; nested spans record their parent"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attrs)
+
+    def record(self, name: str, duration: float, start: Optional[float] = None, **attrs):
+        """Add a span measured elsewhere (duration in seconds, start as time.perf_counter())"""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        start = time.perf_counter() - duration if start is None else start
+        self._emit(name, start, duration, attrs, next(self._ids), stack[-1] if stack else None)
+
+    def _emit(self, name: str, start: float, duration: float, attrs: Dict, span_id: int, parent_id: Optional[int]):
+        self.buffer.append({
+            "name": name,
+            "ts": round((self._epoch + start) * 1e6),
+            "dur_ms": round(duration * 1000, 3),
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attrs": attrs
+        })
+
+    def spans(self, name: Optional[str] = None) -> List[Dict]:
+        return [span for span in list(self.buffer) if name is None or span["name"] == name]
+
+    def rollup(self) -> Dict[str, Dict]:
+        """Count, total and p50/p95/p99/max in milliseconds per span name"""
+        durations = defaultdict(list)
+        for span in list(self.buffer):
+            durations[span["name"]].append(span["dur_ms"])
+
+        stats = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            stats[name] = {
+                "count": len(values),
+                "total_ms": round(sum(values), 3),
+                "p50_ms": _percentile(values, 50),
+                "p95_ms": _percentile(values, 95),
+                "p99_ms": _percentile(values, 99),
+                "max_ms": values[-1]
+            }
+        return stats
+
+    def export_jsonl(self, path) -> Path:
+        path = Path(path)
+        with open(path, "w") as f:
+            for span in list(self.buffer):
+                f.write(json.dumps(span, default=str) + "\n")
+        return path
+
+    def export_chrome_trace(self, path) -> Path:
+        """Write a trace loadable in chrome://tracing or Perfetto"""
+        path = Path(path)
+        events = [{
+            "name": span["name"],
+            "cat": span["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": span["ts"],
+            "dur": round(span["dur_ms"] * 1000),
+            "pid": span["pid"],
+            "tid": span["tid"],
+            "args": span["attrs"]
+        } for span in list(self.buffer)]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        return path
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, -(-len(sorted_values) * pct // 100) - 1))
+    return sorted_values[int(index)]
+
+
+def write_json(path, data, **dump_kwargs):
+    """json.dump to a file, tracing serialization and the write separately"""
+    with TRACER.span("json.dumps", file=Path(path).name) as span:
+        text = json.dumps(data, **dump_kwargs)
+        span.set(bytes=len(text))
+    with TRACER.span("io.write", file=Path(path).name):
+        with open(path, "w") as f:
+            f.write(text)
+
+
+# Process-wide tracer; set EUFM_TRACE=1 (or call TRACER.enable()) to start collecting
+TRACER = Tracer(enabled=os.environ.get("EUFM_TRACE", "") not in ("", "0"))
@@ -4,7 +4,7 @@ XYL-PHOS-CURE Project Management Dashboard
 A focused web interface for managing the Horizon Europe submission and consortium building
 """
 
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, Response, render_template, jsonify, request, redirect, url_for, stream_with_context
 from flask_login import LoginManager, login_required, current_user
 from datetime import datetime, timedelta
 import json
@@ -226,20 +226,40 @@ def documents():
     return render_template('documents.html')
 
 # Phase 2: Codex Integration API Endpoints
+_codex_monitor = None
+
+def get_codex_monitor():
+    """Shared CodexMonitor so status reads hit its cached status record"""
+    global _codex_monitor
+    if _codex_monitor is None:
+        from codex_monitor import CodexMonitor
+        _codex_monitor = CodexMonitor()
+    return _codex_monitor
+
+_codex_event_hub = None
+
+def get_codex_event_hub():
+    """Shared fan-out so every connected dashboard is served by one watcher"""
+    global _codex_event_hub
+    if _codex_event_hub is None:
+        from codex_stream import CodexEventHub
+        _codex_event_hub = CodexEventHub(get_codex_monitor())
+    return _codex_event_hub
+
 @app.route('/api/codex-status')
 @login_required
 def codex_status():
     """API endpoint for Codex background task status"""
     try:
-        from codex_monitor import CodexMonitor
-        monitor = CodexMonitor()
+        monitor = get_codex_monitor()
         status = monitor.check_status()
         return jsonify({
             "status": status["status"] if "status" in status else "idle",
             "is_running": status["is_running"],
             "message": status["message"],
             "current_task": status.get("current_task", None),
-            "log_file": status.get("log_file", None)
+            "log_file": status.get("log_file", None),
+            "active_jobs": monitor.job_registry.active()
         })
     except Exception as e:
         return jsonify({
@@ -251,15 +271,23 @@ def codex_status():
 @app.route('/api/codex-logs')
 @login_required
 def codex_logs():
-    """API endpoint for recent Codex logs"""
+    """API endpoint for recent Codex logs
+    
+    Pass the returned offset and file_id back to receive only lines appended since.
+    """
     try:
-        from codex_monitor import CodexMonitor
-        monitor = CodexMonitor()
+        monitor = get_codex_monitor()
         lines = request.args.get('lines', 20, type=int)
-        logs = monitor.get_log_tail(lines)
+        offset = request.args.get('offset', None, type=int)
+        file_id = request.args.get('file_id', None, type=int)
+        chunk = monitor.read_log_since(offset, file_id, lines)
         return jsonify({
-            "logs": logs,
-            "lines": lines
+            "logs": chunk["data"] if chunk["log_file"] else "No log files available",
+            "lines": lines,
+            "offset": chunk["offset"],
+            "file_id": chunk["file_id"],
+            "reset": chunk["reset"],
+            "log_file": chunk["log_file"]
         })
     except Exception as e:
         return jsonify({
@@ -267,6 +295,19 @@ def codex_logs():
             "logs": "Error retrieving logs"
         })
 
+@app.route('/api/codex-stream')
+@login_required
+def codex_stream():
+    """Server-Sent Events stream of Codex status transitions and new log lines"""
+    return Response(
+        stream_with_context(get_codex_event_hub().stream()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @app.route('/api/codex-start', methods=['POST'])
 @admin_required
 def codex_start():
@@ -278,9 +319,9 @@ def codex_start():
         if not task_description:
             return jsonify({"error": "Task description required"}), 400
         
-        from codex_monitor import CodexMonitor
-        monitor = CodexMonitor()
-        result = monitor.trigger_background_task(task_description)
+        priority = data.get('priority', 'medium')
+        monitor = get_codex_monitor()
+        result = monitor.trigger_background_task(task_description, priority)
         
         return jsonify(result)
     except Exception as e:
@@ -289,6 +330,91 @@ def codex_start():
             "message": f"Failed to start Codex task: {str(e)}"
         })
 
+@app.route('/api/codex-cancel/<job_id>', methods=['POST'])
+@admin_required
+def codex_cancel(job_id):
+    """API endpoint to cancel a queued or running Codex job"""
+    try:
+        result = get_codex_monitor().cancel_background_task(job_id)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "message": f"Failed to cancel Codex task: {str(e)}"
+        })
+
+_cost_ledger = None
+
+def get_cost_ledger():
+    """Sonar token/cost ledger written by the research agents"""
+    global _cost_ledger
+    if _cost_ledger is None:
+        from agents.cost_ledger import CostLedger
+        _cost_ledger = CostLedger(os.path.join(app.root_path, 'research_data', 'cost_ledger.sqlite3'))
+    return _cost_ledger
+
+@app.route('/api/research-costs')
+@admin_required
+def research_costs():
+    """API endpoint for Sonar spend
+    
+    group_by is a comma-separated subset of day, agent, model, template; since/until are
+    YYYY-MM-DD days and agent/model/template filter exactly.
+    """
+    try:
+        ledger = get_cost_ledger()
+        group_by = [column for column in request.args.get('group_by', 'agent,model').split(',') if column]
+        filters = {column: request.args.get(column) for column in ('agent', 'model', 'template')}
+        return jsonify({
+            "group_by": group_by,
+            "totals": ledger.totals(group_by, since=request.args.get('since'), until=request.args.get('until'), **filters),
+            "summary": ledger.summary(request.args.get('days', 30, type=int))
+        })
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "totals": []
+        })
+
+_research_store = None
+
+def get_research_store():
+    """Indexed research artifacts written by the agents"""
+    global _research_store
+    if _research_store is None:
+        from agents.research_store import ResearchStore
+        _research_store = ResearchStore(os.path.join(app.root_path, 'research_data', 'research_store.sqlite3'))
+        _research_store.index_pending()
+    return _research_store
+
+@app.route('/api/research/search')
+@login_required
+def research_search():
+    """API endpoint for full-text search over stored research
+
+    q is the search text ("phrases", prefix* and OR are supported); agent, type and model
+    filter exactly; since/until are ISO dates; matched terms are [bracketed] in snippets.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Search text (q) required", "results": []}), 400
+    try:
+        results = get_research_store().search(
+            query,
+            agent=request.args.get('agent'),
+            artifact_type=request.args.get('type'),
+            model=request.args.get('model'),
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            limit=min(request.args.get('limit', 20, type=int), 100)
+        )
+        return jsonify({"query": query, "count": len(results), "results": results})
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "results": []
+        })
+
 @app.route('/codex')
 @admin_required
 def codex_dashboard():
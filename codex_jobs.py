@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Codex Job Registry - Per-job state for concurrent Codex tasks in SQLite
+Every change also republishes a snapshot of the active jobs to the atomic status record
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from codex_status import CodexStatusStore
+
+ACTIVE_STATES = ("queued", "running")
+JOB_FIELDS = (
+    "job_id", "task", "priority", "state", "pid", "log_file", "progress", "exit_code",
+    "queued_at", "started_at", "finished_at", "updated_at", "cpu_seconds", "max_rss_kb"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    task TEXT,
+    priority TEXT DEFAULT 'medium',
+    state TEXT NOT NULL DEFAULT 'running',
+    pid INTEGER,
+    log_file TEXT,
+    progress INTEGER DEFAULT 0,
+    exit_code INTEGER,
+    queued_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL,
+    cpu_seconds REAL,
+    max_rss_kb INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state_updated ON jobs (state, updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at DESC);
+"""
+
+
+def _timestamp(epoch: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(epoch).strftime("%Y%m%d_%H%M%S") if epoch else None
+
+
+class JobRegistry:
+    def __init__(self, log_dir, db_name: str = "codex_jobs.sqlite3"):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.status_store = CodexStatusStore(self.log_dir)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.log_dir / db_name), timeout=10,
+                                    check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def record(self, job_id: str, **fields) -> Dict:
+        """Create or update one job and republish the status snapshot"""
+        fields = {k: v for k, v in fields.items() if k in JOB_FIELDS and k != "job_id"}
+        fields["updated_at"] = time.time()
+        columns = ["job_id"] + list(fields)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in fields)
+
+        with self.lock:
+            # The write lock also serializes snapshots, so the newest write always publishes last
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT(job_id) DO UPDATE SET {updates}",
+                    [job_id] + list(fields.values())
+                )
+                self._publish_snapshot()
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return self.get(job_id)
+
+    def start(self, job_id: str, task: str, log_file, pid: Optional[int] = None) -> Dict:
+        now = time.time()
+        existing = self.get(job_id)
+        return self.record(
+            job_id, task=task, state="running", log_file=str(log_file), pid=pid or os.getpid(),
+            started_at=(existing or {}).get("started_at") or now,
+            queued_at=(existing or {}).get("queued_at") or now
+        )
+
+    def progress(self, job_id: str, percent: int) -> Dict:
+        return self.record(job_id, progress=max(0, min(100, int(percent))))
+
+    def finish(self, job_id: str, state: str = "completed", exit_code: Optional[int] = None, **fields) -> Dict:
+        existing = self.get(job_id) or {}
+        fields.setdefault("finished_at", existing.get("finished_at") or time.time())
+        if state == "completed":
+            fields["progress"] = 100
+        if exit_code is not None:
+            fields["exit_code"] = exit_code
+        return self.record(job_id, state=state, **fields)
+
+    def interrupt(self, job_id: str) -> Optional[Dict]:
+        """Mark a job interrupted unless it already reported an outcome"""
+        job = self.get(job_id)
+        if job and job["state"] in ACTIVE_STATES:
+            return self.finish(job_id, "interrupted")
+        return job
+
+    def _query(self, sql: str, params=()) -> List[Dict]:
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        rows = self._query("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def active(self) -> List[Dict]:
+        """Queued and running jobs, most recently updated first (one indexed query)"""
+        return self._query("SELECT * FROM jobs WHERE state IN (?, ?) ORDER BY updated_at DESC", ACTIVE_STATES)
+
+    def by_state(self, state: str, limit: int = 50) -> List[Dict]:
+        return self._query("SELECT * FROM jobs WHERE state = ? ORDER BY updated_at DESC LIMIT ?", (state, limit))
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        return self._query("SELECT * FROM jobs ORDER BY updated_at DESC LIMIT ?", (limit,))
+
+    def _publish_snapshot(self):
+        """Write the status record: overall state, the focus job and every active job"""
+        active = [dict(row) for row in self.conn.execute(
+            "SELECT * FROM jobs WHERE state IN (?, ?) ORDER BY updated_at DESC", ACTIVE_STATES
+        )]
+        running = sorted((job for job in active if job["state"] == "running"),
+                         key=lambda job: job["started_at"] or 0, reverse=True)
+        if running:
+            focus, status = running[0], "RUNNING"
+        else:
+            row = self.conn.execute("SELECT * FROM jobs WHERE state NOT IN (?, ?) ORDER BY updated_at DESC LIMIT 1",
+                                    ACTIVE_STATES).fetchone()
+            focus = dict(row) if row else None
+            status = "QUEUED" if active else (focus["state"].upper() if focus else "IDLE")
+
+        focus = focus or {}
+        self.status_store.write(
+            status,
+            job_id=focus.get("job_id"),
+            current_task=focus.get("task"),
+            start_time=_timestamp(focus.get("started_at")),
+            log_file=focus.get("log_file"),
+            pid=focus.get("pid"),
+            progress=focus.get("progress"),
+            active_jobs=[{
+                "job_id": job["job_id"],
+                "task": job["task"],
+                "state": job["state"],
+                "progress": job["progress"],
+                "log_file": job["log_file"],
+                "start_time": _timestamp(job["started_at"])
+            } for job in active]
+        )
+
+
+def main():
+    """CLI used by shell helpers (job id from $CODEX_JOB_ID):
+    codex_jobs.py LOG_DIR start TASK LOG_FILE | progress PERCENT | finish [STATE] | interrupt"""
+    import sys
+
+    job_id = os.environ.get("CODEX_JOB_ID")
+    if len(sys.argv) < 3 or not job_id:
+        print(main.__doc__)
+        sys.exit(1)
+
+    registry = JobRegistry(sys.argv[1])
+    command = sys.argv[2]
+    if command == "start":
+        registry.start(job_id, sys.argv[3], sys.argv[4], pid=os.getppid())
+    elif command == "progress":
+        registry.progress(job_id, int(sys.argv[3]))
+    elif command == "finish":
+        registry.finish(job_id, sys.argv[3].lower() if len(sys.argv) > 3 else "completed")
+    elif command == "interrupt":
+        registry.interrupt(job_id)
+    else:
+        print(main.__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,70 @@ Checks status of running Codex tasks and provides progress updates
 """
 
 import os
-import subprocess
 import glob
 from datetime import datetime
 from pathlib import Path
 
+from codex_jobs import JobRegistry
+from codex_status import CodexStatusStore, StatusWatcher
+from codex_supervisor import CodexSupervisor
+from log_tailer import LogTailer
+
 class CodexMonitor:
     def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF"):
         self.project_root = Path(project_root)
         self.log_dir = self.project_root / "logs"
+        self.status_store = CodexStatusStore(self.log_dir)
+        self.watcher = None
+        self.log_tailer = LogTailer()
+        self.supervisor = None
+        self.max_concurrent_tasks = 2
+        self._job_registry = None
+    
+    @property
+    def job_registry(self):
+        """Per-job state store; created on first use"""
+        if self._job_registry is None:
+            self._job_registry = JobRegistry(self.log_dir)
+        return self._job_registry
         
     def check_status(self):
         """Check if Codex is currently running and return status"""
+        record = self.status_store.read()
+        
+        if record is None:
+            return self._check_legacy_status()
+        
+        status = record.get("status")
+        
+        if status == "RUNNING":
+            result = self._get_running_status(record)
+        elif status == "COMPLETED":
+            result = self._get_completed_status(record)
+        elif status in ("INTERRUPTED", "CANCELLED", "FAILED"):
+            result = self._get_interrupted_status()
+            result["status"] = status
+        elif status in ("IDLE", "QUEUED"):
+            result = {
+                "is_running": False,
+                "status": status,
+                "message": "🤖 Codex is idle - ready for new tasks!" if status == "IDLE"
+                           else "⏳ Codex tasks are queued and waiting for a free slot"
+            }
+        else:
+            result = {
+                "is_running": False,
+                "status": "Unknown",
+                "message": "🤔 Unknown Codex status"
+            }
+        
+        result["active_jobs"] = record.get("active_jobs", [])
+        if len(result["active_jobs"]) > 1:
+            result["message"] += f"\n\n📋 **{len(result['active_jobs'])} active jobs**"
+        return result
+    
+    def _check_legacy_status(self):
+        """Fall back to the per-field status files written by older helpers"""
         status_file = self.log_dir / "codex_status"
         
         if not status_file.exists():
@@ -29,9 +81,21 @@ class CodexMonitor:
         status = status_file.read_text().strip()
         
         if status == "RUNNING":
-            return self._get_running_status()
+            try:
+                record = {
+                    "current_task": (self.log_dir / "current_task").read_text().strip(),
+                    "start_time": (self.log_dir / "task_start_time").read_text().strip(),
+                    "log_file": self._find_latest_log()
+                }
+            except Exception as e:
+                return {
+                    "is_running": True,
+                    "status": "RUNNING",
+                    "message": f"🔄 Codex is running but status details unavailable: {e}"
+                }
+            return self._get_running_status(record)
         elif status == "COMPLETED":
-            return self._get_completed_status()
+            return self._get_completed_status({"log_file": self._find_latest_log()})
         elif status == "INTERRUPTED":
             return self._get_interrupted_status()
         else:
@@ -41,14 +105,12 @@ class CodexMonitor:
                 "message": "🤔 Unknown Codex status"
             }
     
-    def _get_running_status(self):
+    def _get_running_status(self, record):
         """Get details about currently running task"""
         try:
-            current_task = (self.log_dir / "current_task").read_text().strip()
-            start_time = (self.log_dir / "task_start_time").read_text().strip()
-            
-            # Find latest log file
-            latest_log = self._get_latest_log()
+            current_task = record["current_task"]
+            start_time = record["start_time"]
+            latest_log = record.get("log_file") or "No log files found"
             
             return {
                 "is_running": True,
@@ -69,10 +131,10 @@ class CodexMonitor:
                 "message": f"🔄 Codex is running but status details unavailable: {e}"
             }
     
-    def _get_completed_status(self):
+    def _get_completed_status(self, record):
         """Get details about last completed task"""
         try:
-            latest_log = self._get_latest_log()
+            latest_log = record.get("log_file") or "No log files found"
             return {
                 "is_running": False,
                 "status": "COMPLETED",
@@ -103,12 +165,30 @@ class CodexMonitor:
         }
     
     def _get_latest_log(self):
-        """Find the most recent Codex log file"""
+        """Log file of the most recent Codex task, taken from the status record"""
+        record = self.status_store.read()
+        if record is not None:
+            return record.get("log_file") or "No log files found"
+        return self._find_latest_log()
+    
+    def _find_latest_log(self):
+        """Scan for the newest codex_*.log (only needed before a status record exists)"""
         log_files = glob.glob(str(self.log_dir / "codex_*.log"))
         if log_files:
             return max(log_files, key=os.path.getctime)
         return "No log files found"
     
+    def watch(self, callback):
+        """Call callback(record) whenever the status record changes"""
+        if self.watcher is None:
+            self.watcher = StatusWatcher(self.status_store)
+        return self.watcher.subscribe(callback)
+    
+    def unwatch(self, callback):
+        """Stop calling a callback registered with watch()"""
+        if self.watcher is not None:
+            self.watcher.unsubscribe(callback)
+    
     def get_log_tail(self, lines=20):
         """Get the last N lines from the latest log file"""
         latest_log = self._get_latest_log()
@@ -117,35 +197,51 @@ class CodexMonitor:
             return "No log files available"
         
         try:
-            result = subprocess.run(
-                ['tail', f'-{lines}', latest_log], 
-                capture_output=True, 
-                text=True
-            )
-            return result.stdout
+            return self.log_tailer.tail(latest_log, lines)
         except Exception as e:
             return f"Error reading log: {e}"
     
-    def trigger_background_task(self, task_description):
-        """Start a Codex task in the background"""
-        script_path = self.project_root / "scripts" / "codex-helper.sh"
+    def read_log_since(self, offset=None, file_id=None, lines=20):
+        """Complete log lines appended since a cursor from a previous call.
         
+        Without an offset, returns the last N lines and a cursor positioned after them.
+        """
+        latest_log = self._get_latest_log()
+        
+        if latest_log == "No log files found" or not os.path.exists(latest_log):
+            return {"data": "", "offset": 0, "file_id": None, "reset": False, "log_file": None}
+        
+        if offset is None:
+            result = self.log_tailer.tail_with_cursor(latest_log, lines)
+        else:
+            result = self.log_tailer.read_since(latest_log, offset, file_id)
+        result["log_file"] = latest_log
+        return result
+    
+    def get_supervisor(self):
+        """Process pool that admits, runs and reaps Codex jobs"""
+        if self.supervisor is None:
+            self.supervisor = CodexSupervisor(self.project_root, max_concurrency=self.max_concurrent_tasks,
+                                              registry=self.job_registry)
+        return self.supervisor
+    
+    def trigger_background_task(self, task_description, priority="medium"):
+        """Queue a Codex task on the supervisor; it starts when a slot is free"""
         try:
-            # Start the background process
-            process = subprocess.Popen(
-                ['bash', str(script_path), task_description],
-                cwd=self.project_root,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            job = self.get_supervisor().submit(task_description, priority)
+            state = "Background execution in progress" if job["state"] == "running" else "Queued - waiting for a free slot"
             
             return {
                 "success": True,
-                "pid": process.pid,
-                "message": f"🚀 **Codex task started successfully!**\n\n"
+                "job_id": job["job_id"],
+                "pid": job["pid"],
+                "state": job["state"],
+                "log_file": job["log_file"],
+                "message": f"🚀 **Codex task accepted!**\n\n"
                           f"**Task**: {task_description}\n"
-                          f"**PID**: {process.pid}\n"
-                          f"**Status**: Background execution in progress\n\n"
+                          f"**Job**: {job['job_id']}\n"
+                          f"**PID**: {job['pid'] or 'pending'}\n"
+                          f"**Status**: {state}\n\n"
                           f"You can:\n"
                           f"- Continue our conversation\n"
                           f"- Ask me to check progress anytime\n"
@@ -157,6 +253,10 @@ class CodexMonitor:
                 "success": False,
                 "message": f"❌ Failed to start Codex task: {e}"
             }
+    
+    def cancel_background_task(self, job_id):
+        """Cancel a queued or running Codex job"""
+        return self.get_supervisor().cancel(job_id)
 
 def main():
     """CLI interface for monitoring Codex"""
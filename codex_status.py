@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Codex Status Channel - One atomically replaced JSON record for background task state
+The job registry renames a temp file over logs/codex_status.json; readers and watchers never scan the log directory
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+STATUS_FILENAME = "codex_status.json"
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class CodexStatusStore:
+    """Read and write the single Codex status record"""
+
+    def __init__(self, log_dir):
+        self.log_dir = Path(log_dir)
+        self.path = self.log_dir / STATUS_FILENAME
+        self._cached_stamp = None
+        self._cached_record = None
+        self._lock = threading.Lock()
+
+    def read(self) -> Optional[Dict]:
+        """Current record, or None if no task has ever reported; one stat when unchanged"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp != self._cached_stamp:
+                try:
+                    record = json.loads(self.path.read_text())
+                except (FileNotFoundError, json.JSONDecodeError):
+                    return self._cached_record
+                self._cached_stamp, self._cached_record = stamp, record
+            return dict(self._cached_record)
+
+    def write(self, status: str, **fields) -> Dict:
+        """Replace the whole record atomically"""
+        record = {"status": status, "updated_at": time.time(), **fields}
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.log_dir), prefix=".codex_status.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return record
+
+
+class StatusWatcher:
+    """Push status record changes to subscribers.
+
+    Uses inotify on Linux so an idle watcher costs nothing; elsewhere it
+    falls back to polling the record's mtime.
+    """
+
+    def __init__(self, store: CodexStatusStore, poll_interval: float = 0.5):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.subscribers: List[Callable[[Optional[Dict]], None]] = []
+        self.backend = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback: Callable[[Optional[Dict]], None]):
+        with self._lock:
+            self.subscribers.append(callback)
+        self.start()
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+            idle = not self.subscribers
+        # Nobody left to notify: the thread is started again by the next subscribe()
+        if idle:
+            self.stop()
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="codex-status-watcher", daemon=True)
+            self._thread.start()
+        # Changes made after start() returns are guaranteed to be seen
+        self._ready.wait(timeout=2)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+    def _publish(self):
+        record = self.store.read()
+        with self._lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(record)
+            except Exception:
+                pass
+
+    def _run(self):
+        self.store.log_dir.mkdir(parents=True, exist_ok=True)
+        fd = _inotify_watch(self.store.log_dir)
+        if fd is None:
+            self.backend = "poll"
+            self._poll_loop()
+        else:
+            self.backend = "inotify"
+            self._ready.set()
+            try:
+                self._inotify_loop(fd)
+            finally:
+                os.close(fd)
+
+    def _inotify_loop(self, fd: int):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], self.poll_interval)
+            if not ready:
+                continue
+            try:
+                buffer = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+
+            changed, offset = False, 0
+            while offset < len(buffer):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+                start = offset + _EVENT_HEADER.size
+                name = buffer[start:start + name_len].rstrip(b"\0").decode(errors="replace")
+                changed = changed or name == STATUS_FILENAME
+                offset = start + name_len
+            if changed:
+                self._publish()
+
+    def _poll_loop(self):
+        last = None
+        while not self._stop.is_set():
+            try:
+                stat = os.stat(self.store.path)
+                stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                stamp = None
+            if stamp != last:
+                last = stamp
+                if self._ready.is_set():
+                    self._publish()
+            self._ready.set()
+            self._stop.wait(self.poll_interval)
+
+
+def _inotify_watch(directory: Path) -> Optional[int]:
+    """Open an inotify descriptor watching directory, or None if unavailable"""
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    if libc.inotify_add_watch(fd, str(directory).encode(), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
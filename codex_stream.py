@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Codex Event Hub - Shared fan-out of Codex status transitions and log lines to streaming clients
+One status watcher and one log cursor serve every connected dashboard; each client gets a bounded buffer
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional
+
+from codex_monitor import CodexMonitor
+
+
+class StreamClient:
+    """Bounded per-client event buffer; overflow drops the oldest events and flags a resync"""
+
+    def __init__(self, max_buffer: int):
+        self.events = deque()
+        self.max_buffer = max_buffer
+        self.needs_resync = False
+        self.dropped = 0
+        self.condition = threading.Condition()
+
+    def push(self, event: Dict):
+        with self.condition:
+            if len(self.events) >= self.max_buffer:
+                self.events.popleft()
+                self.dropped += 1
+                self.needs_resync = True
+            self.events.append(event)
+            self.condition.notify()
+
+    def pop(self, timeout: float) -> Optional[Dict]:
+        """Next event, a resync marker after overflow, or None on timeout"""
+        with self.condition:
+            if not self.events and not self.needs_resync:
+                self.condition.wait(timeout)
+            if self.needs_resync:
+                self.needs_resync = False
+                self.events.clear()
+                return {"event": "resync"}
+            if self.events:
+                return self.events.popleft()
+            return None
+
+
+class CodexEventHub:
+    def __init__(self, monitor: CodexMonitor, log_poll_interval: float = 0.5,
+                 keepalive_interval: float = 15.0, client_buffer: int = 256):
+        self.monitor = monitor
+        self.log_poll_interval = log_poll_interval
+        self.keepalive_interval = keepalive_interval
+        self.client_buffer = client_buffer
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.log_cursor = {"offset": 0, "file_id": None}
+        self._wake = threading.Event()
+        self._thread = None
+        self._watch_handle = None
+        # Serializes starting and stopping the status watcher; kept apart from self.lock,
+        # which the watcher's own callback takes
+        self._watch_lock = threading.Lock()
+
+    def subscribe(self) -> StreamClient:
+        client = StreamClient(self.client_buffer)
+        with self._watch_lock:
+            if self._watch_handle is None:
+                self._watch_handle = self.monitor.watch(self._on_status)
+            with self.lock:
+                self.clients.add(client)
+                if self._thread is None or not self._thread.is_alive():
+                    # Position the shared cursor now so nothing written after subscribe() is missed
+                    chunk = self.monitor.read_log_since(lines=0)
+                    self.log_cursor = {"offset": chunk["offset"], "file_id": chunk["file_id"]}
+                    self._thread = threading.Thread(target=self._log_loop, name="codex-log-fanout", daemon=True)
+                    self._thread.start()
+        return client
+
+    def unsubscribe(self, client: StreamClient):
+        """Drop a client; the last one to leave also stops the status watcher"""
+        with self._watch_lock:
+            with self.lock:
+                self.clients.discard(client)
+                if self.clients or self._watch_handle is None:
+                    return
+                handle, self._watch_handle = self._watch_handle, None
+            self.monitor.unwatch(handle)
+
+    def publish(self, event_type: str, data: Dict):
+        with self.lock:
+            self.sequence += 1
+            event = {"event": event_type, "id": self.sequence, "data": data}
+            clients = list(self.clients)
+        for client in clients:
+            client.push(event)
+
+    def snapshot(self) -> Dict:
+        """Current status plus recent log lines and the cursor that follows them"""
+        status = self.monitor.check_status()
+        chunk = self.monitor.read_log_since(lines=20)
+        return {"status": status, "log": chunk}
+
+    def _on_status(self, record):
+        self.publish("status", self.monitor.check_status())
+        # A new task means a new log file; read it right away
+        self._wake.set()
+
+    def _log_loop(self):
+        """Single log cursor shared by all clients; exits when the last client leaves"""
+        while True:
+            with self.lock:
+                if not self.clients:
+                    self._thread = None
+                    return
+            try:
+                chunk = self.monitor.read_log_since(self.log_cursor["offset"], self.log_cursor["file_id"])
+                self.log_cursor = {"offset": chunk["offset"], "file_id": chunk["file_id"]}
+                if chunk["data"]:
+                    self.publish("log", chunk)
+            except OSError:
+                pass
+            self._wake.wait(self.log_poll_interval)
+            self._wake.clear()
+
+    def stream(self, client: Optional[StreamClient] = None) -> Iterator[str]:
+        """Server-Sent Events for one client; unsubscribes when the client disconnects"""
+        if client is None:
+            client = self.subscribe()
+        try:
+            yield format_sse("snapshot", self.snapshot())
+            last_sent = time.time()
+            while True:
+                event = client.pop(timeout=self.keepalive_interval)
+                if event is None:
+                    if time.time() - last_sent >= self.keepalive_interval:
+                        yield ": keepalive\n\n"
+                        last_sent = time.time()
+                    continue
+                if event["event"] == "resync":
+                    # Client fell behind its buffer: replace what it missed with a fresh snapshot
+                    yield format_sse("resync", self.snapshot())
+                else:
+                    yield format_sse(event["event"], event["data"], event["id"])
+                last_sent = time.time()
+        finally:
+            self.unsubscribe(client)
+
+
+def format_sse(event_type: str, data: Dict, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Codex Supervisor - Bounded process pool for background Codex jobs
+Priority/FIFO admission, output streamed straight to each job's log file, reaping with CPU/RSS accounting
+"""
+
+import heapq
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from task_scheduler import PRIORITY_ORDER
+
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class CodexJob:
+    def __init__(self, job_id: str, task: str, priority: str, log_file: Path):
+        self.job_id = job_id
+        self.task = task
+        self.priority = priority
+        self.log_file = log_file
+        self.state = "queued"
+        self.pid = None
+        self.process = None
+        self.exit_code = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cpu_seconds = None
+        self.max_rss_kb = None
+        self.cancel_requested = False
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict:
+        wall = None
+        if self.started_at:
+            wall = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "job_id": self.job_id,
+            "task": self.task,
+            "priority": self.priority,
+            "state": self.state,
+            "pid": self.pid,
+            "log_file": str(self.log_file),
+            "exit_code": self.exit_code,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wall_seconds": wall,
+            "cpu_seconds": self.cpu_seconds,
+            "max_rss_kb": self.max_rss_kb
+        }
+
+
+class CodexSupervisor:
+    def __init__(self, project_root, max_concurrency: int = 2,
+                 command_factory: Optional[Callable[[CodexJob], List[str]]] = None,
+                 kill_grace_seconds: float = 5.0, registry=None):
+        self.project_root = Path(project_root)
+        self.log_dir = self.project_root / "logs"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_concurrency = max(1, max_concurrency)
+        self.command_factory = command_factory or self._helper_command
+        self.kill_grace_seconds = kill_grace_seconds
+        self.registry = registry
+        self.jobs: Dict[str, CodexJob] = {}
+        self.queue = []
+        self.running = set()
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+
+    def _helper_command(self, job: CodexJob) -> List[str]:
+        return ["bash", str(self.project_root / "scripts" / "codex-helper.sh"), job.task]
+
+    def submit(self, task: str, priority: str = "medium") -> Dict:
+        """Queue a job; it starts as soon as a slot is free"""
+        seq = next(self.sequence)
+        job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{seq:04d}"
+        job = CodexJob(job_id, task, priority, self.log_dir / f"codex_{job_id}.log")
+        with self.lock:
+            self.jobs[job_id] = job
+            rank = PRIORITY_ORDER.get(priority, len(PRIORITY_ORDER))
+            heapq.heappush(self.queue, (rank, seq, job_id))
+        self._record(job)
+        self._admit()
+        return job.to_dict()
+
+    def _admit(self):
+        """Start queued jobs while slots are free, highest priority first, FIFO within a priority"""
+        while True:
+            with self.lock:
+                if len(self.running) >= self.max_concurrency or not self.queue:
+                    return
+                _, _, job_id = heapq.heappop(self.queue)
+                job = self.jobs[job_id]
+                if job.state != "queued":
+                    continue
+                job.state = "running"
+                self.running.add(job_id)
+            self._start(job)
+
+    def _start(self, job: CodexJob):
+        env = dict(os.environ,
+                   CODEX_JOB_ID=job.job_id,
+                   CODEX_LOG_FILE=str(job.log_file),
+                   CODEX_REPO_ROOT=str(self.project_root))
+        try:
+            # Output goes straight to the log file: no pipes to drain, no buffer to fill
+            with open(job.log_file, "ab") as log:
+                job.process = subprocess.Popen(
+                    self.command_factory(job),
+                    cwd=str(self.project_root),
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    start_new_session=True
+                )
+        except Exception as e:
+            with open(job.log_file, "a") as log:
+                log.write(f"❌ Failed to start Codex job: {e}\n")
+            self._finish(job, "failed", None)
+            return
+
+        job.pid = job.process.pid
+        job.started_at = time.time()
+        self._record(job)
+        threading.Thread(target=self._reap, args=(job,), name=f"codex-reaper-{job.job_id}", daemon=True).start()
+
+    def _reap(self, job: CodexJob):
+        """Wait for the job's exit and collect its resource usage"""
+        try:
+            _, status, usage = os.wait4(job.pid, 0)
+        except OSError as e:
+            # Already reaped elsewhere (Popen.poll/__del__) or not waitable: the job still has to
+            # finish, or it would hold its concurrency slot for good
+            with open(job.log_file, "a") as log:
+                log.write(f"❌ Could not reap Codex job: {e}\n")
+            self._finish(job, "failed", job.process.returncode)
+            return
+        exit_code = os.waitstatus_to_exitcode(status)
+        job.process.returncode = exit_code
+        job.cpu_seconds = round(usage.ru_utime + usage.ru_stime, 3)
+        # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+        job.max_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+        if job.cancel_requested:
+            state = "cancelled"
+        else:
+            state = "completed" if exit_code == 0 else "failed"
+        self._finish(job, state, exit_code)
+
+    def _finish(self, job: CodexJob, state: str, exit_code: Optional[int]):
+        with self.lock:
+            job.state = state
+            job.exit_code = exit_code
+            job.finished_at = time.time()
+            self.running.discard(job.job_id)
+        self._record(job)
+        job.done.set()
+        self._admit()
+
+    def _record(self, job: CodexJob):
+        """Mirror the supervisor's view of a job into the shared registry"""
+        if self.registry is None:
+            return
+        fields = {key: value for key, value in job.to_dict().items()
+                  if key not in ("job_id", "wall_seconds") and value is not None}
+        if job.state == "completed":
+            fields["progress"] = 100
+        self.registry.record(job.job_id, **fields)
+
+    def cancel(self, job_id: str) -> Dict:
+        """Drop a queued job, or terminate a running one (SIGTERM, then SIGKILL after a grace period)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return {"success": False, "error": f"Unknown job: {job_id}"}
+            if job.state not in ("queued", "running") or (job.state == "running" and job.pid is None):
+                return {"success": False, "error": f"Job {job_id} is {job.state}"}
+            was_queued = job.state == "queued"
+            if was_queued:
+                job.state = "cancelled"
+                job.finished_at = time.time()
+            else:
+                job.cancel_requested = True
+
+        if was_queued:
+            self._record(job)
+            job.done.set()
+            return {"success": True, "job": job.to_dict()}
+
+        self._signal(job, signal.SIGTERM)
+        timer = threading.Timer(self.kill_grace_seconds, self._signal, args=(job, signal.SIGKILL))
+        timer.daemon = True
+        timer.start()
+        return {"success": True, "job": job.to_dict()}
+
+    def _signal(self, job: CodexJob, sig):
+        if job.done.is_set():
+            return
+        try:
+            os.killpg(job.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict:
+        job = self.jobs[job_id]
+        job.done.wait(timeout)
+        return job.to_dict()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    def list_jobs(self) -> List[Dict]:
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [job.to_dict() for job in jobs]
+
+    def stats(self) -> Dict:
+        with self.lock:
+            states = [job.state for job in self.jobs.values()]
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": states.count("running"),
+            "queued": states.count("queued"),
+            **{state: states.count(state) for state in FINISHED_STATES}
+        }
+
+    def shutdown(self, cancel_running: bool = True):
+        """Cancel everything still queued and, optionally, running"""
+        for job in list(self.jobs.values()):
+            if job.state == "queued" or (cancel_running and job.state == "running"):
+                self.cancel(job.job_id)
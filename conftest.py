@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures: Mission Control queue tasks and a local fake Sonar API
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.perplexity_sonar_agent import PerplexitySonarAgent
+from agents.rate_limiter import reset_limits
+
+USAGE = {"prompt_tokens": 120, "completion_tokens": 80, "total_tokens": 200}
+PIECES = ["1. DOMAIN: Agricultural ", "biotechnology\n", "2. TASK_TYPE: ", "Monitoring\n"]
+CITATIONS = ["https://example.org/xylella"]
+
+
+@pytest.fixture
+def make_task():
+    """Builder for queue tasks; extra fields such as duration or payload are passed through"""
+    def build(agent, task_type, dependencies=None, priority="medium", **fields):
+        return dict({"agent": agent, "task_type": task_type, "priority": priority,
+                     "dependencies": dependencies or []}, **fields)
+    return build
+
+
+class FakeSonarHandler(BaseHTTPRequestHandler):
+    """Chat completions answered as one JSON body, or as a chunked event stream when the request asks to stream"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(payload)
+            error = server.errors.pop(0) if server.errors else None
+        if error is not None:
+            self.send_response(error)
+            self.send_header("Retry-After", "0.1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if payload.get("stream"):
+            self._stream(payload)
+        else:
+            self._answer(payload)
+
+    def _answer(self, payload: dict):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.client_ports.add(self.client_address[1])
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+
+        body = json.dumps({
+            "model": payload["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "".join(PIECES)}}],
+            "citations": CITATIONS,
+            "usage": USAGE
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, payload: dict):
+        """The same answer split into PIECES over the same delay; break_after and terminate cut it short"""
+        server = self.server
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._chunk(": keep-alive\n\n")
+        for i, piece in enumerate(PIECES):
+            time.sleep(server.delay / len(PIECES))
+            if server.break_after is not None and i == server.break_after:
+                self._chunk("data: {not json\n\n")
+                break
+            chunk = {"id": "cmpl-1", "model": payload["model"], "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            if i == len(PIECES) - 1 and server.terminate:
+                chunk["choices"][0]["finish_reason"] = "stop"
+                chunk["usage"] = USAGE
+                chunk["citations"] = CITATIONS
+            self._chunk(f"data: {json.dumps(chunk)}\n\n")
+        if server.terminate:
+            self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, text: str):
+        data = text.encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Fake Sonar API; set errors (statuses to answer first), delay, break_after or terminate to shape replies"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSonarHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = server.peak = 0
+    server.client_ports = set()
+    server.errors = []
+    server.delay = 0.2
+    server.break_after = None
+    server.terminate = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def agent(tmp_path, stub_server):
+    """A Sonar agent pointed at stub_server with fast pacing and retries"""
+    (tmp_path / "logs").mkdir()
+    agent = PerplexitySonarAgent(project_root=str(tmp_path))
+    agent.configure_apis(sonar_key="test-key")
+    agent.api_url = f"http://127.0.0.1:{stub_server.server_address[1]}/chat/completions"
+    agent.requests_per_second = 100
+    agent.request_burst = 10
+    agent.retry_base_delay = 0.01
+    reset_limits()
+    yield agent
+    agent.close()
+    reset_limits()
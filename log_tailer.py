@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Log Tailer - In-process tail and cursor-based incremental reads for Codex logs
+Replaces forking `tail -N`; open handles are cached per log and reopened on rotation
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class LogTailer:
+    def __init__(self, block_size: int = 8192, max_handles: int = 16, max_read_bytes: int = 1024 * 1024):
+        self.block_size = block_size
+        self.max_handles = max_handles
+        self.max_read_bytes = max_read_bytes
+        self.handles = OrderedDict()  # path -> (file object, inode)
+        self.lock = threading.Lock()
+
+    def _handle(self, path: str):
+        """Cached binary handle for path, reopened if the file was rotated or replaced"""
+        path = str(path)
+        stat = os.stat(path)
+        cached = self.handles.get(path)
+        if cached is not None:
+            handle, inode = cached
+            if inode == stat.st_ino:
+                self.handles.move_to_end(path)
+                return handle, stat.st_size
+            handle.close()
+            del self.handles[path]
+
+        handle = open(path, "rb")
+        self.handles[path] = (handle, stat.st_ino)
+        while len(self.handles) > self.max_handles:
+            _, (old, _) = self.handles.popitem(last=False)
+            old.close()
+        return handle, stat.st_size
+
+    def _read_tail(self, path: str, lines: int) -> Tuple[bytes, int, int]:
+        """Bytes from the start of the last N complete lines to the end, with the size and file id"""
+        with self.lock:
+            handle, size = self._handle(path)
+            file_id = self.handles[str(path)][1]
+            position, chunks, newlines = size, [], 0
+            # A trailing newline terminates the last line rather than starting a new one, and
+            # even for zero lines the last newline is needed to find where a partial line starts
+            wanted = max(lines, 0) + 1
+            while position > 0 and newlines < wanted:
+                step = min(self.block_size, position)
+                position -= step
+                handle.seek(position)
+                chunk = handle.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+        return b"".join(reversed(chunks)), size, file_id
+
+    def tail(self, path: str, lines: int = 20) -> str:
+        """Last N lines of path (a partial last line included), read backward from the end in blocks"""
+        data, _, _ = self._read_tail(path, lines)
+        tail_lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+        return "".join(tail_lines[-lines:]) if lines > 0 else ""
+
+    def tail_with_cursor(self, path: str, lines: int = 20) -> Dict:
+        """Last N complete lines plus the read_since cursor for everything after them.
+
+        A partial last line is left out and the cursor points at its start, so the
+        next read_since returns it whole once the writer finishes it.
+        """
+        data, size, file_id = self._read_tail(path, lines)
+        end = data.rfind(b"\n") + 1
+        partial = len(data) - end
+        tail_lines = data[:end].decode("utf-8", errors="replace").splitlines(keepends=True)
+        return {
+            "data": "".join(tail_lines[-lines:]) if lines > 0 else "",
+            "offset": size - partial,
+            "file_id": file_id,
+            "size": size,
+            "reset": False
+        }
+
+    def read_since(self, path: str, offset: int = 0, file_id: Optional[int] = None) -> Dict:
+        """Complete lines appended after byte offset.
+
+        Returns the text, the offset and file_id to pass next time and
+        whether the cursor was reset because the log was truncated or rotated.
+        """
+        with self.lock:
+            handle, size = self._handle(path)
+            current_id = self.handles[str(path)][1]
+            reset = offset > size or offset < 0 or (file_id is not None and file_id != current_id)
+            if reset:
+                offset = 0
+            handle.seek(offset)
+            data = handle.read(min(size - offset, self.max_read_bytes))
+
+        # Hold back a partial last line unless it alone fills the read window
+        end = data.rfind(b"\n") + 1
+        if end == 0 and len(data) < self.max_read_bytes:
+            data = b""
+        elif end:
+            data = data[:end]
+
+        return {
+            "data": data.decode("utf-8", errors="replace"),
+            "offset": offset + len(data),
+            "file_id": current_id,
+            "size": size,
+            "reset": reset
+        }
+
+    def close(self):
+        with self.lock:
+            for handle, _ in self.handles.values():
+                handle.close()
+            self.handles.clear()
@@ -6,14 +6,40 @@ Orchestrates Codex, Jules, Perplexity, Sonar, and dynamically discovered agents
 """
 
 import json
+import os
+import socket
 import time
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import logging
 
 from agent_summoner import AgentSummoner
+from agents.plugins import AgentPluginRegistry
+from agents.tracing import TRACER, write_json
+from task_scheduler import TaskScheduler
+from task_matcher import MultiPatternMatcher
+from task_store import TaskStore
+
+# Simple capability matching (can be enhanced with NLP)
+CAPABILITY_KEYWORDS = {
+    'codex': ['browser', 'automation', 'github', 'integration', 'cli', 'system'],
+    'jules': ['development', 'ui', 'ux', 'dashboard', 'frontend', 'design'],
+    'perplexity_sonar': ['research', 'analysis', 'academic', 'literature', 'study'],
+    'market_intelligence': ['competitor', 'market', 'funding', 'commercial'],
+    'eu_regulations': ['regulatory', 'compliance', 'eu', 'efsa', 'legislation']
+}
+CAPABILITY_MATCHER = MultiPatternMatcher(CAPABILITY_KEYWORDS)
+
+# Task types each core agent can run; shared with mission_worker for routing
+CORE_AGENT_CAPABILITIES = {
+    "codex": ["browser_automation", "github_integration", "system_integration"],
+    "jules": ["development", "ui_ux", "pull_requests", "professional_dashboards"],
+    "perplexity_sonar": ["research", "web_search", "analysis", "academic_literature"],
+    "market_intelligence": ["competitor_analysis", "market_trends", "funding_landscape"],
+    "eu_regulations": ["regulatory_monitoring", "compliance_tracking", "efsa_guidelines"]
+}
 
 class EnhancedMissionControl:
     def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF"):
@@ -33,11 +59,8 @@ class EnhancedMissionControl:
         
         # Core agent status tracking
         self.core_agents = {
-            "codex": {"status": "standby", "last_task": None, "capabilities": ["browser_automation", "github_integration", "system_integration"]},
-            "jules": {"status": "standby", "last_task": None, "capabilities": ["development", "ui_ux", "pull_requests", "professional_dashboards"]},
-            "perplexity_sonar": {"status": "standby", "last_task": None, "capabilities": ["research", "web_search", "analysis", "academic_literature"]},
-            "market_intelligence": {"status": "standby", "last_task": None, "capabilities": ["competitor_analysis", "market_trends", "funding_landscape"]},
-            "eu_regulations": {"status": "standby", "last_task": None, "capabilities": ["regulatory_monitoring", "compliance_tracking", "efsa_guidelines"]}
+            agent: {"status": "standby", "last_task": None, "capabilities": list(capabilities)}
+            for agent, capabilities in CORE_AGENT_CAPABILITIES.items()
         }
         
         # Dynamic agent registry (discovered via Agent Summoner)
@@ -50,6 +73,43 @@ class EnhancedMissionControl:
         self.completed_tasks = []
         self.summoning_history = []
         
+        # Concurrent execution limits (worker pool size and per-agent slots)
+        self.max_parallel_tasks = 4
+        self.agent_concurrency_limits = {agent: 1 for agent in self.core_agents}
+        
+        # Durable queue and history: survives restarts, replays what is still pending
+        self.task_store = TaskStore(self.data_dir / "mission_control.sqlite3")
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.task_lease_seconds = 3600
+        
+        # Research agents are loaded once and called in-process (subprocess isolation is opt-in)
+        self.agent_plugins = AgentPluginRegistry(self.project_root, logger=self.logger)
+        
+        # Worker mode: tasks are only persisted here and mission_worker processes run them
+        self.worker_mode = False
+        self._restore_state()
+        
+    def _restore_state(self):
+        """Reload queue, completed work, discovered agents and summoning history from the task store"""
+        start_time = time.time()
+        reclaimed = self.task_store.reclaim_expired()
+        self.task_queue = self.task_store.tasks(("pending",))
+        self.completed_tasks = self.task_store.tasks(("done",))
+        self.discovered_agents = self.task_store.discovered_agents()
+        self.summoning_history = self.task_store.summoning_history()
+        
+        if self.task_queue or self.completed_tasks or self.summoning_history:
+            self.logger.info(
+                f"♻️ Restored {len(self.task_queue)} queued and {len(self.completed_tasks)} completed tasks, "
+                f"{len(self.discovered_agents)} discovered agents ({reclaimed} expired leases reclaimed) "
+                f"in {time.time() - start_time:.3f}s"
+            )
+    
+    def _enqueue_tasks(self, tasks: List[Dict]):
+        """Persist new tasks before they join the in-memory queue"""
+        self.task_store.enqueue_many(tasks)
+        self.task_queue.extend(tasks)
+        
     def setup_logging(self):
         """Setup mission control logging"""
         log_file = self.logs_dir / f"mission_control_{datetime.now().strftime('%Y%m%d')}.log"
@@ -77,8 +137,13 @@ class EnhancedMissionControl:
         
         self.logger.info(f"✅ Credentials secured for {agent}")
         
-    def intelligent_task_processing(self, user_request: str) -> Dict:
-        """Process user request with intelligent agent discovery and coordination"""
+    def intelligent_task_processing(self, user_request: str, on_stage: Optional[Callable[[Dict], None]] = None,
+                                    speculative_discovery: bool = False) -> Dict:
+        """Process user request with intelligent agent discovery and coordination.
+
+        ``on_stage`` receives each Agent Summoner stage (analysis, discovery,
+        evaluation) as soon as it completes.
+        """
         self.logger.info(f"🧠 INTELLIGENT TASK PROCESSING: {user_request[:100]}...")
         
         start_time = time.time()
@@ -93,7 +158,11 @@ class EnhancedMissionControl:
         # Step 2: Task requires agent discovery - summon optimal agents
         self.logger.info("🧙‍♂️ No suitable core agents found - initiating Agent Summoner")
         
-        summoning_result = self.agent_summoner.summon_agent(user_request)
+        summoning_result = self.agent_summoner.summon_agent(
+            user_request,
+            on_stage=on_stage,
+            speculative_discovery=speculative_discovery
+        )
         
         if 'error' in summoning_result:
             self.logger.error(f"❌ Agent summoning failed: {summoning_result['error']}")
@@ -108,14 +177,16 @@ class EnhancedMissionControl:
         total_time = time.time() - start_time
         
         # Step 5: Record summoning history and performance
-        self.summoning_history.append({
+        session = {
             'user_request': user_request,
             'summoning_result': summoning_result,
             'integration_result': integration_result,
             'execution_result': execution_result,
             'total_processing_time': round(total_time, 2),
             'timestamp': datetime.now().isoformat()
-        })
+        }
+        self.task_store.append_summoning(session)
+        self.summoning_history.append(session)
         
         self.logger.info(f"🎉 INTELLIGENT PROCESSING COMPLETE - {total_time:.2f} seconds")
         
@@ -135,23 +206,8 @@ class EnhancedMissionControl:
         
     def _match_core_agents(self, user_request: str) -> List[str]:
         """Match user request to existing core agent capabilities"""
-        request_lower = user_request.lower()
-        matched_agents = []
-        
-        # Simple capability matching (can be enhanced with NLP)
-        capability_keywords = {
-            'codex': ['browser', 'automation', 'github', 'integration', 'cli', 'system'],
-            'jules': ['development', 'ui', 'ux', 'dashboard', 'frontend', 'design'],
-            'perplexity_sonar': ['research', 'analysis', 'academic', 'literature', 'study'],
-            'market_intelligence': ['competitor', 'market', 'funding', 'commercial'],
-            'eu_regulations': ['regulatory', 'compliance', 'eu', 'efsa', 'legislation']
-        }
-        
-        for agent, keywords in capability_keywords.items():
-            if any(keyword in request_lower for keyword in keywords):
-                matched_agents.append(agent)
-                
-        return matched_agents
+        matches = CAPABILITY_MATCHER.match(user_request)
+        return [agent for agent in CAPABILITY_KEYWORDS if agent in matches]
         
     def _execute_with_core_agents(self, user_request: str, suitable_agents: List[str]) -> Dict:
         """Execute task using core agents"""
@@ -170,7 +226,7 @@ class EnhancedMissionControl:
                 "created_at": datetime.now().isoformat()
             }
             
-            self.task_queue.append(task)
+            self._enqueue_tasks([task])
             self.core_agents[agent]["status"] = "assigned"
             
         return {
@@ -201,6 +257,7 @@ class EnhancedMissionControl:
                 'summoning_session': summoning_result.get('summoned_at')
             }
             
+            self.task_store.save_discovered_agent(agent_name, agent_config)
             self.discovered_agents[agent_name] = agent_config
             integrated_agents.append(agent_name)
             
@@ -280,12 +337,12 @@ class EnhancedMissionControl:
         }
         
         # Add to task queue
-        self.task_queue.extend([codex_task, jules_task])
-        self.agents["codex"]["status"] = "assigned"
-        self.agents["jules"]["status"] = "queued"
+        self._enqueue_tasks([codex_task, jules_task])
+        self.core_agents["codex"]["status"] = "assigned"
+        self.core_agents["jules"]["status"] = "queued"
         
         self.logger.info("📋 Codex → Jules pipeline queued")
-        return {"codex_task_id": len(self.task_queue)-2, "jules_task_id": len(self.task_queue)-1}
+        return {"codex_task_id": codex_task["task_id"], "jules_task_id": jules_task["task_id"]}
         
     def coordinate_research_agents(self, research_priorities: List[str]):
         """Coordinate parallel research across Perplexity, Sonar, and local agents"""
@@ -343,7 +400,7 @@ class EnhancedMissionControl:
         }
         
         research_tasks = [perplexity_task, market_task, regulatory_task]
-        self.task_queue.extend(research_tasks)
+        self._enqueue_tasks(research_tasks)
         
         # Update agent statuses
         for task in research_tasks:
@@ -353,45 +410,65 @@ class EnhancedMissionControl:
         return research_tasks
         
     def execute_task_queue(self):
-        """Execute queued tasks with dependency management"""
+        """Execute queued tasks concurrently, starting dependents as soon as prerequisites finish"""
         self.logger.info(f"⚙️ Processing {len(self.task_queue)} queued tasks")
         
-        while self.task_queue:
-            # Find tasks with satisfied dependencies
-            executable_tasks = []
+        if not self.task_queue:
+            return
+        
+        # Anything queued without going through the store is persisted first
+        untracked = [task for task in self.task_queue if "task_id" not in task]
+        if untracked:
+            self.task_store.enqueue_many(untracked)
+            
+        if self.worker_mode:
+            self.logger.info(f"👷 {len(self.task_queue)} tasks left in the shared queue for mission workers")
+            return
+            
+        # Lease the pending tasks so a crash mid-run hands them back once the lease expires
+        leased = self.task_store.lease(self.worker_id, self.task_lease_seconds, limit=len(self.task_queue))
+        
+        scheduler = TaskScheduler(
+            self._execute_leased_task,
+            max_workers=self.max_parallel_tasks,
+            agent_limits=self.agent_concurrency_limits,
+            logger=self.logger
+        )
+        # Only types with nothing left queued count as done; the scheduler tracks the leased ones
+        satisfied_types, _ = self.task_store.dependency_types()
+        outcome = scheduler.run(leased, completed_types=satisfied_types)
+        
+        # Tasks behind a type that can now never be done are parked; the rest wait for the next run
+        _, dead_types = self.task_store.dependency_types()
+        blocked, waiting = self.task_store.block_unrunnable(outcome["blocked"], dead_types)
+        self.task_store.release(task["task_id"] for task in waiting)
+        self.completed_tasks.extend(outcome["completed"])
+        self.task_queue = self.task_store.tasks(("pending",))
+        
+        if blocked:
+            self.logger.warning(f"⛔ {len(blocked)} tasks blocked by failed dependencies")
+        if waiting:
+            self.logger.warning(f"⚠️ {len(waiting)} tasks waiting on unmet dependencies")
+        if outcome["failed"]:
+            self.logger.warning(f"⚠️ {len(outcome['failed'])} tasks failed; {len(self.task_queue)} remain queued")
             
-            for i, task in enumerate(self.task_queue):
-                if self._dependencies_satisfied(task):
-                    executable_tasks.append((i, task))
-                    
-            if not executable_tasks:
-                self.logger.warning("⚠️ No executable tasks - checking dependencies")
-                break
-                
-            # Execute tasks (simulate for now)
-            for i, task in executable_tasks:
-                self._execute_task(task)
-                self.completed_tasks.append(task)
-                
-            # Remove executed tasks from queue
-            for i, _ in reversed(executable_tasks):
-                self.task_queue.pop(i)
-                
         self.logger.info("✅ Task queue processing completed")
         
-    def _dependencies_satisfied(self, task: Dict) -> bool:
-        """Check if task dependencies are satisfied"""
-        if not task.get("dependencies"):
-            return True
-            
-        for dep in task["dependencies"]:
-            if not any(completed_task.get("task_type") == dep for completed_task in self.completed_tasks):
-                return False
-                
-        return True
+    def _execute_leased_task(self, task: Dict):
+        """Run a leased task and record the outcome in the task store"""
+        try:
+            self._execute_task(task)
+        except Exception as e:
+            self.task_store.fail(task["task_id"], str(e))
+            raise
+        self.task_store.ack(task["task_id"], task.get("result"), owner=self.worker_id)
         
     def _execute_task(self, task: Dict):
-        """Execute a single task (simulation for now)"""
+        """Execute a single task (Codex and Jules are still simulated)"""
+        with TRACER.span("mission.execute_task", agent=task["agent"], task_type=task["task_type"]):
+            self._run_task(task)
+            
+    def _run_task(self, task: Dict):
         agent = task["agent"]
         task_type = task["task_type"]
         
@@ -400,17 +477,12 @@ class EnhancedMissionControl:
             self.core_agents[agent]["status"] = "active"
             self.core_agents[agent]["last_task"] = task_type
         
-        # Simulate task execution
         if agent == "codex":
             self._simulate_codex_task(task)
         elif agent == "jules":
             self._simulate_jules_task(task)
-        elif agent == "perplexity_sonar":
-            self._execute_perplexity_task(task)
-        elif agent == "market_intelligence":
-            self._execute_market_task(task)
-        elif agent == "eu_regulations":
-            self._execute_regulatory_task(task)
+        elif agent in self.agent_plugins:
+            self._execute_plugin_task(task)
             
         if agent in self.core_agents:
             self.core_agents[agent]["status"] = "completed"
@@ -426,44 +498,14 @@ class EnhancedMissionControl:
         self.logger.info("🔬 Simulating Jules development work...")
         time.sleep(3)  # Simulate work
         
-    def _execute_perplexity_task(self, task: Dict):
-        """Execute Perplexity + Sonar research"""
-        self.logger.info("🧠 Executing Perplexity + Sonar research...")
-        
-        try:
-            subprocess.run([
-                "python3", 
-                str(self.agents_dir / "perplexity_sonar_agent.py")
-            ], cwd=self.project_root, timeout=1800)
-        except subprocess.TimeoutExpired:
-            self.logger.warning("⚠️ Perplexity task timeout")
-        except Exception as e:
-            self.logger.error(f"❌ Perplexity task error: {e}")
-            
-    def _execute_market_task(self, task: Dict):
-        """Execute market intelligence research"""
-        self.logger.info("📊 Executing market intelligence research...")
-        
-        try:
-            subprocess.run([
-                "python3",
-                str(self.agents_dir / "market_intelligence_agent.py")
-            ], cwd=self.project_root, timeout=900)
-        except Exception as e:
-            self.logger.error(f"❌ Market task error: {e}")
-            
-    def _execute_regulatory_task(self, task: Dict):
-        """Execute regulatory monitoring"""
-        self.logger.info("🏛️ Executing regulatory monitoring...")
-        
-        try:
-            subprocess.run([
-                "python3",
-                str(self.agents_dir / "research_agent_eu_regulations.py"),
-                "brief"
-            ], cwd=self.project_root, timeout=1200)
-        except Exception as e:
-            self.logger.error(f"❌ Regulatory task error: {e}")
+    def _execute_plugin_task(self, task: Dict) -> Dict:
+        """Run a research agent through its warm plugin; the structured result is kept on the task"""
+        outcome = self.agent_plugins.run(task["agent"], task, isolated=task.get("isolated"))
+        if outcome["status"] != "success":
+            raise RuntimeError(f"{task['agent']} failed: {outcome['error']}")
+        task["result"] = outcome["result"]
+        self.logger.info(f"🔌 {task['agent']} returned in {outcome['duration_seconds']:.1f}s ({outcome['mode']})")
+        return outcome["result"]
             
     def generate_status_report(self) -> Dict:
         """Generate comprehensive mission control status report"""
@@ -481,17 +523,20 @@ class EnhancedMissionControl:
                 "total_summoning_cost": sum(session.get('summoning_result', {}).get('summoning_stats', {}).get('total_cost', 0) 
                                           for session in self.summoning_history)
             },
+            "research_cache": self.agent_summoner.researcher.cache.stats(),
+            "research_costs": self.agent_summoner.researcher.cost_ledger.summary(),
             "task_queue_size": len(self.task_queue),
             "active_core_tasks": len([a for a in self.core_agents.values() if a["status"] == "active"]),
             "completed_tasks": len(self.completed_tasks),
             "system_health": self._assess_system_health(),
             "recommendations": self._generate_recommendations()
         }
+        if TRACER.enabled:
+            status_report["trace_rollup"] = TRACER.rollup()
         
         # Save status report
         status_file = self.logs_dir / f"status_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(status_file, 'w') as f:
-            json.dump(status_report, f, indent=2)
+        write_json(status_file, status_report, indent=2)
             
         self.logger.info(f"✅ Status report saved: {status_file}")
         return status_report
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Mission Worker - Worker processes that drain the shared Mission Control task store
+Each worker leases tasks its agents can handle (by core agent capabilities), runs the agent plugin in-process and acks the result
+"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from agents.plugins import AgentPluginRegistry
+from mission_control import CORE_AGENT_CAPABILITIES
+from task_store import TaskStore
+
+
+class MissionWorker:
+    def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF",
+                 agents: Optional[Iterable[str]] = None, worker_id: Optional[str] = None,
+                 lease_seconds: float = 3600, poll_interval: float = 2.0, batch_size: int = 1):
+        self.project_root = Path(project_root)
+        self.logs_dir = self.project_root / "logs"
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        # Agents run in-process through warm plugins, built once per worker process
+        self.plugins = AgentPluginRegistry(self.project_root, logger=self.logger)
+        self.agents = [agent for agent in (agents or self.plugins.names()) if agent in self.plugins]
+        self.capabilities = {agent: CORE_AGENT_CAPABILITIES.get(agent, []) for agent in self.agents}
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.batch_size = max(1, batch_size)
+
+        # Same store as EnhancedMissionControl, so coordinator and workers share one queue
+        self.task_store = TaskStore(self.project_root / "research_data" / "mission_control.sqlite3")
+        self.stats = {"completed": 0, "failed": 0, "released": 0, "blocked": 0}
+
+    def route(self, task: Dict) -> Optional[str]:
+        """Agent this worker should run the task on: the addressed agent, else one whose capabilities cover the task type"""
+        if task.get("agent") in self.capabilities:
+            return task["agent"]
+        for agent, capabilities in self.capabilities.items():
+            if task.get("task_type") in capabilities:
+                return agent
+        return None
+
+    def _run_agent(self, agent: str, task: Dict) -> Dict:
+        outcome = self.plugins.run(agent, task, isolated=task.get("isolated"))
+        if outcome["status"] != "success":
+            raise RuntimeError(outcome["error"])
+        return outcome["result"]
+
+    def run_once(self) -> int:
+        """Lease and run one batch; returns how many tasks were executed"""
+        task_types = [task_type for capabilities in self.capabilities.values() for task_type in capabilities]
+        satisfied_types = dead_types = None
+        skipped = []
+        while True:
+            leased = self.task_store.lease(self.worker_id, self.lease_seconds, limit=self.batch_size,
+                                           agents=self.agents, task_types=task_types, exclude=skipped)
+            if not leased:
+                return 0
+
+            # Dependencies name task types whose queued work must all be done. Tasks behind a
+            # type that can never be done are parked as blocked (as TaskScheduler reports them);
+            # tasks still waiting go back untouched and are skipped so they cannot starve the
+            # rest of the queue
+            if satisfied_types is None:
+                satisfied_types, dead_types = self.task_store.dependency_types()
+            blocked, leased = self.task_store.block_unrunnable(leased, dead_types)
+            if blocked:
+                self.stats["blocked"] += len(blocked)
+                self.logger.warning(f"⛔ [{self.worker_id}] {len(blocked)} task(s) blocked by failed dependencies")
+            ready = [task for task in leased if all(dep in satisfied_types for dep in task.get("dependencies", []))]
+            waiting = [task["task_id"] for task in leased if task not in ready]
+            if waiting:
+                self.task_store.release(waiting)
+                self.stats["released"] += len(waiting)
+                skipped += waiting
+            if ready:
+                break
+
+        for task in ready:
+            self._execute(task)
+        return len(ready)
+
+    def _execute(self, task: Dict):
+        agent = self.route(task)
+        task_type = task.get("task_type")
+        start_time = time.time()
+        self.logger.info(f"🚀 [{self.worker_id}] Executing {task_type} on {agent} (task {task['task_id']})")
+
+        try:
+            output = self._run_agent(agent, task)
+        except Exception as e:
+            state = self.task_store.fail(task["task_id"], str(e))
+            self.stats["failed"] += 1
+            self.logger.error(f"❌ [{self.worker_id}] {task_type} failed on {agent}: {e} (task now {state})")
+            return
+
+        result = {
+            "worker": self.worker_id,
+            "agent": agent,
+            "duration_seconds": round(time.time() - start_time, 3),
+            "completed_at": datetime.now().isoformat(),
+            "summary": output.get("executive_summary") if isinstance(output, dict) else None
+        }
+        if self.task_store.ack(task["task_id"], result, owner=self.worker_id):
+            self.stats["completed"] += 1
+            self.logger.info(f"✅ [{self.worker_id}] {task_type} completed in {result['duration_seconds']:.1f}s")
+        else:
+            self.logger.warning(f"⚠️ [{self.worker_id}] Lease on task {task['task_id']} lost before ack")
+
+    def run(self, drain: bool = False, max_tasks: Optional[int] = None) -> Dict:
+        """Work until stopped; with drain, exit once no runnable work is left"""
+        self.logger.info(f"👷 Worker {self.worker_id} serving {', '.join(self.agents)}")
+        executed = 0
+        while max_tasks is None or executed < max_tasks:
+            ran = self.run_once()
+            executed += ran
+            if ran == 0:
+                if drain:
+                    break
+                time.sleep(self.poll_interval)
+        return dict(self.stats, worker=self.worker_id)
+
+
+def _worker_main(project_root: str, agents: Optional[List[str]], drain: bool):
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - MISSION_WORKER - %(levelname)s - %(message)s'
+    )
+    MissionWorker(project_root, agents=agents).run(drain=drain)
+
+
+def run_fleet(project_root, processes: Optional[int] = None, agents: Optional[List[str]] = None,
+              drain: bool = False) -> List[int]:
+    """Start worker processes against the shared task store and wait for them; returns exit codes"""
+    processes = processes or os.cpu_count() or 1
+    workers = [
+        multiprocessing.Process(target=_worker_main, args=(str(project_root), agents, drain), daemon=False)
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+    return [worker.exitcode for worker in workers]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run Mission Control worker processes")
+    parser.add_argument("--project-root", default="/Users/panda/Desktop/Claude Code/eufm XF")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--agents", default=None, help="comma-separated agents to serve (default: all)")
+    parser.add_argument("--drain", action="store_true", help="exit once the queue has no work for these agents")
+    args = parser.parse_args()
+
+    agents = args.agents.split(",") if args.agents else None
+    print(f"👷 Starting {args.processes or os.cpu_count()} Mission Control workers")
+    exit_codes = run_fleet(args.project_root, args.processes, agents, args.drain)
+    print(f"✅ Workers exited: {exit_codes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Prompt Packing - Compact stage-to-stage context for the Agent Summoner
+Pulls only the structured sections the next prompt needs out of a Sonar answer, drops repeated
+lines and fits the result to a token budget using a fast local token estimate
+"""
+
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from response_sections import SECTION_ALIASES, split_sections
+
+SECTION_TITLES = {key: aliases[0].replace("_", " ").upper() for key, aliases in SECTION_ALIASES.items()}
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: one token per ~4 characters of each word, one per punctuation mark"""
+    return sum((len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1
+               for piece in TOKEN_RE.findall(text))
+
+
+def _normalize(line: str) -> str:
+    return re.sub(r"[\W_]+", " ", line).strip().lower()
+
+
+def dedupe_lines(lines: Iterable[str], seen: Optional[set] = None) -> List[str]:
+    """Drop blank, decoration-only and repeated lines (compared case/punctuation-insensitively)"""
+    seen = set() if seen is None else seen
+    kept = []
+    for line in lines:
+        line = " ".join(line.split())
+        key = _normalize(line)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return kept
+
+
+def fit_to_budget(lines: List[str], budget: int) -> List[str]:
+    """Keep whole lines in order until the budget is spent; a single over-long line is cut at a word boundary"""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        remaining = budget - used - 2  # newline and the trailing ellipsis
+        if remaining > 8:
+            words, partial = line.split(), []
+            for word in words:
+                if estimate_tokens(" ".join(partial + [word])) > remaining:
+                    break
+                partial.append(word)
+            if partial:
+                kept.append(" ".join(partial) + " …")
+        break
+    return kept
+
+
+def _cost(lines: List[str]) -> int:
+    return sum(estimate_tokens(line) + 1 for line in lines)
+
+
+def pack_sections(text: str, wanted: List[str], budget: int) -> str:
+    """Pack the wanted sections of a structured answer, in priority order, into about `budget` tokens.
+
+    Every wanted section first gets an even share of the budget, so a long early section
+    cannot crowd out a later one; whatever is left over then goes to truncated sections in
+    priority order. If the answer has none of the wanted headings, its de-duplicated lines
+    are packed instead.
+    """
+    _, sections = split_sections(text)
+    seen = set()
+    found = [(key, dedupe_lines(sections[key], seen)) for key in wanted if key in sections]
+    found = [(key, lines) for key, lines in found if lines]
+    if not found:
+        return "\n".join(fit_to_budget(dedupe_lines(text.splitlines()), budget))
+
+    titles = {key: f"{SECTION_TITLES[key]}:" for key, _ in found}
+    bodies, remaining = {}, budget
+    for position, (key, lines) in enumerate(found):
+        share = remaining // (len(found) - position)
+        bodies[key] = fit_to_budget(lines, share - _cost([titles[key]]))
+        if bodies[key]:
+            remaining -= _cost([titles[key]] + bodies[key])
+
+    for key, lines in found:
+        if remaining <= 0:
+            break
+        if len(bodies[key]) < len(lines) or (bodies[key] and bodies[key][-1].endswith(" …")):
+            before = _cost(bodies[key]) + (_cost([titles[key]]) if bodies[key] else 0)
+            bodies[key] = fit_to_budget(lines, before + remaining - _cost([titles[key]]))
+            remaining -= _cost([titles[key]] + bodies[key]) - before
+
+    packed = []
+    for key, _ in found:
+        if bodies[key]:
+            packed.extend([titles[key]] + bodies[key])
+    return "\n".join(packed)
+
+
+def compact_prompt(prompt: str) -> str:
+    """Strip the source-code indentation and blank-line padding that triple-quoted prompts carry"""
+    lines = [line.strip() for line in prompt.strip().splitlines()]
+    compacted = []
+    for line in lines:
+        if line or (compacted and compacted[-1]):
+            compacted.append(line)
+    return "\n".join(compacted).strip()
+
+
+def pack_fields(fields: List[Tuple[str, Optional[str]]], budget: int, skip_values: Iterable[str] = ("not specified",)) -> str:
+    """Render LABEL: value lines, skipping empty/placeholder values and values already given, within budget"""
+    skip = {_normalize(value) for value in skip_values}
+    seen = set()
+    lines = []
+    for label, value in fields:
+        value = " ".join(str(value or "").split())
+        key = _normalize(value)
+        if not key or key in skip or key in seen:
+            continue
+        seen.add(key)
+        lines.append(f"{label}: {value}")
+    return "\n".join(fit_to_budget(lines, budget))
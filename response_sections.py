@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Response Sections - Single-pass section parser for Sonar answers
+Tokenizes an answer into a heading -> body map once (numbered, markdown, bold and colon-style
+headings) and caches it per response text; the incremental parser exposes each section as soon
+as the next heading closes it, so streamed answers can be read before they finish
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Section key -> heading phrases the models use for it (matched case-insensitively at line start)
+SECTION_ALIASES = {
+    "agents": ["existing ai agents", "ai agents", "existing agents"],
+    "apis": ["api services", "apis", "commercial apis"],
+    "open_source": ["open source tools", "open-source tools", "open source"],
+    "integration": ["integration methods", "integration", "implementation"],
+    "cost": ["cost estimates", "cost considerations", "pricing", "costs", "cost"],
+    "benchmarks": ["performance benchmarks", "benchmarks", "performance"],
+    "recommendations": ["recommendations", "top 3 recommended approaches", "recommended approaches"],
+    "domain": ["domain"],
+    "task_type": ["task_type", "task type"],
+    "complexity": ["complexity"],
+    "capabilities": ["required_capabilities", "required capabilities", "capabilities"],
+    "resources": ["estimated_resources", "estimated resources", "resources"],
+    "constraints": ["constraints"],
+    "success_criteria": ["success_criteria", "success criteria"],
+    "optimal_configuration": ["optimal configuration"],
+    "implementation_plan": ["implementation plan"],
+    "cost_benefit": ["cost-benefit analysis", "cost benefit analysis"],
+    "risks": ["risk assessment", "risks"],
+    "success_metrics": ["success metrics"],
+    "alternatives": ["alternative options", "alternatives"]
+}
+
+_ALIAS_PATTERN = "|".join(sorted((re.escape(alias) for aliases in SECTION_ALIASES.values() for alias in aliases),
+                                 key=len, reverse=True))
+# A heading: optional bullet, markdown, bold and numbering, a known section name, then a colon or the end of the line
+HEADING_RE = re.compile(
+    r"^\s*(?:[-*•]\s+)?(?P<marker>#{1,6}\s*)?(?P<bold>\*\*)?\s*(?P<number>\d+[.)]\s*)?(?:\*\*)?\s*"
+    r"(?P<name>" + _ALIAS_PATTERN + r")\s*(?:\*\*)?\s*"
+    r"(?P<colon>:)?\s*(?:\*\*)?\s*(?P<rest>.*)$",
+    re.IGNORECASE
+)
+_ALIAS_TO_KEY = {alias: key for key, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+
+def section_key(name: str) -> Optional[str]:
+    """Section key for a heading or field name ("TASK_TYPE", "Required capabilities", "domain")"""
+    name = name.strip().lower()
+    return name if name in SECTION_ALIASES else _ALIAS_TO_KEY.get(name, _ALIAS_TO_KEY.get(name.replace("_", " ")))
+
+
+def _is_heading(match) -> bool:
+    """Reject prose that merely starts with a section word ("- Cost: $5/month" inside a list)"""
+    rest = match.group("rest").strip()
+    if rest and not match.group("colon"):
+        return False
+    return bool(not rest or match.group("marker") or match.group("number") or match.group("bold")
+                or match.group("name").isupper())
+
+
+class ResponseSections:
+    """Parsed view of one answer: preamble lines plus {section key: body lines}"""
+
+    def __init__(self, preamble: Tuple[str, ...], sections: Dict[str, Tuple[str, ...]]):
+        self.preamble = preamble
+        self.sections = sections
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.sections
+
+    def lines(self, key: str) -> Tuple[str, ...]:
+        return self.sections.get(key, ())
+
+    def field(self, key: str, default: str = "Not specified") -> str:
+        """First non-empty line of a section: the inline value of "DOMAIN: x", else the line below"""
+        for line in self.lines(key):
+            if line.strip():
+                return line.strip()
+        return default
+
+    def text(self, key: str) -> str:
+        return "\n".join(self.lines(key)).strip()
+
+
+class SectionParser:
+    """Incremental parser: feed() text chunks as they arrive, close() at the end of the stream"""
+
+    def __init__(self):
+        self.preamble: List[str] = []
+        self.sections: Dict[str, List[str]] = {}
+        self.completed: List[str] = []
+        self.current: Optional[str] = None
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume a chunk; returns the keys of sections that the chunk completed"""
+        self.buffer += chunk
+        if "\n" not in self.buffer:
+            return []
+        *lines, self.buffer = self.buffer.split("\n")
+        closed = []
+        for line in lines:
+            closed.extend(self._line(line.rstrip("\r")))
+        return closed
+
+    def close(self) -> List[str]:
+        """Flush the trailing partial line and complete the last open section"""
+        closed = self._line(self.buffer) if self.buffer else []
+        self.buffer = ""
+        if self.current is not None:
+            closed.append(self._complete())
+        return closed
+
+    def _line(self, line: str) -> List[str]:
+        match = HEADING_RE.match(line)
+        if not (match and _is_heading(match)):
+            (self.sections[self.current] if self.current is not None else self.preamble).append(line)
+            return []
+        closed = [self._complete()] if self.current is not None else []
+        key = _ALIAS_TO_KEY[match.group("name").lower()]
+        # A repeated heading continues its section rather than replacing it
+        self.current = key
+        body = self.sections.setdefault(key, [])
+        rest = match.group("rest").strip().strip("*").strip()
+        if rest:
+            body.append(rest)
+        return closed
+
+    def _complete(self) -> str:
+        key, self.current = self.current, None
+        if key not in self.completed:
+            self.completed.append(key)
+        return key
+
+    def result(self) -> ResponseSections:
+        """Snapshot of everything parsed so far (open sections included)"""
+        return ResponseSections(tuple(self.preamble), {key: tuple(lines) for key, lines in self.sections.items()})
+
+
+@lru_cache(maxsize=128)
+def parse_sections(content: str) -> ResponseSections:
+    """Parse a complete answer once; repeated lookups on the same text reuse the cached map"""
+    parser = SectionParser()
+    parser.feed(content)
+    parser.close()
+    return parser.result()
+
+
+def split_sections(text: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Split an answer into (preamble lines, {section key: lines}) on recognised headings"""
+    parsed = parse_sections(text)
+    return list(parsed.preamble), {key: list(lines) for key, lines in parsed.sections.items()}
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: per-string analyze_task_complexity vs vectorized analyze_batch
+Usage: python3 scripts/benchmark_task_batch.py [corpus_size]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from smart_task_detector import SmartTaskDetector
+from benchmark_task_matcher import make_corpus
+
+
+def main():
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    corpus = make_corpus(corpus_size, random.Random(7))
+    detector = SmartTaskDetector()
+    detector.analyze_batch(corpus[:10])  # NumPy import and lookup tables are one-time costs
+
+    start = time.perf_counter()
+    scalar = [detector.analyze_task_complexity(text) for text in corpus]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    arrays = detector.analyze_batch_arrays(corpus)
+    arrays_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = detector.analyze_batch(corpus)
+    batch_time = time.perf_counter() - start
+
+    print(f"📊 {corpus_size} task descriptions")
+    print(f"  scalar loop            {corpus_size / scalar_time:12,.0f} texts/s")
+    print(f"  analyze_batch_arrays   {corpus_size / arrays_time:12,.0f} texts/s")
+    print(f"  analyze_batch (dicts)  {corpus_size / batch_time:12,.0f} texts/s")
+    print(f"  delegated: {int(arrays['should_delegate'].sum())}/{corpus_size}")
+    print(f"  identical to scalar path: {'✅' if batch == scalar else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
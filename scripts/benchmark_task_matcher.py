@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: naive per-keyword substring scans vs the shared compiled matcher
+Usage: python3 scripts/benchmark_task_matcher.py [corpus_size] [extra_terms]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from task_matcher import MultiPatternMatcher
+
+BASE_TABLE = {
+    "authentication": ["auth", "login", "user", "session", "jwt", "oauth",
+                       "user authentication", "login system", "user management"],
+    "dashboard": ["dashboard", "analytics", "charts", "graphs", "visualization",
+                  "create dashboard", "build dashboard", "analytics dashboard"],
+    "notification": ["notification", "alert", "reminder", "email", "sms",
+                     "notification system", "alert system", "reminder system"],
+    "api": ["api", "endpoint", "rest", "graphql", "webhook", "api integration", "rest api", "create api"],
+    "database": ["database", "db", "sql", "mongodb", "postgres", "mysql",
+                 "database integration", "data model", "database schema"],
+    "full_system": ["complete", "full", "entire", "comprehensive", "system",
+                    "complete system", "full implementation", "entire application"],
+    "action": ["create", "build", "implement", "develop", "design",
+               "add", "integrate", "setup", "configure", "deploy"]
+}
+
+FRAGMENTS = [
+    "create a", "build the", "implement", "we need", "please add", "monitor",
+    "user authentication", "analytics dashboard", "reminder system", "rest api",
+    "database schema", "for the xylella consortium", "with email alerts", "in flask",
+    "for horizon europe deadlines", "with responsive design", "and charts", "using postgres",
+    "covering the entire application", "for field trial data", "with jwt sessions"
+]
+
+
+def naive_match(table, text):
+    """The original approach: lowercase, then one substring test per term"""
+    text = text.lower()
+    return {label: {term for term in terms if term in text} for label, terms in table.items()}
+
+
+def grow_table(table, extra_terms, rng):
+    grown = {label: list(terms) for label, terms in table.items()}
+    labels = list(grown)
+    for i in range(extra_terms):
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+        grown[labels[i % len(labels)]].append(word)
+    return grown
+
+
+def make_corpus(size, rng):
+    return [" ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(4, 14))) for _ in range(size)]
+
+
+def bench(label, fn, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed * 1000:9.1f} ms  ({len(corpus) / elapsed:,.0f} texts/s)")
+    return elapsed
+
+
+def main():
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    extra_terms = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = random.Random(42)
+    corpus = make_corpus(corpus_size, rng)
+
+    for name, table in [("base tables", BASE_TABLE), (f"+{extra_terms} terms", grow_table(BASE_TABLE, extra_terms, rng))]:
+        terms = sum(len(t) for t in table.values())
+        print(f"\n📊 {name}: {terms} terms, {corpus_size} task strings")
+        build_start = time.perf_counter()
+        matcher = MultiPatternMatcher(table)
+        print(f"  {'matcher build':<22} {(time.perf_counter() - build_start) * 1000:9.1f} ms")
+        naive = bench("naive substring scan", lambda text: naive_match(table, text), corpus)
+        compiled = bench("compiled matcher", matcher.match, corpus)
+        print(f"  speedup: {naive / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
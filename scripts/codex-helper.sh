@@ -2,26 +2,34 @@
 # Background Codex Task Execution Helper
 set -e
 
-REPO_ROOT="/Users/panda/Desktop/Claude Code/eufm XF"
+REPO_ROOT="${CODEX_REPO_ROOT:-/Users/panda/Desktop/Claude Code/eufm XF}"
 LOG_DIR="$REPO_ROOT/logs"
 mkdir -p "$LOG_DIR"
 
+# Each run reports into the job registry under its own id; the supervisor passes one in
+export CODEX_JOB_ID="${CODEX_JOB_ID:-$(date +"%Y%m%d_%H%M%S")_$$}"
+
+codex_job() {
+    python3 "$REPO_ROOT/codex_jobs.py" "$LOG_DIR" "$@"
+}
+
 run_codex_task() {
     local task="$1"
     local timestamp=$(date +"%Y%m%d_%H%M%S")
-    local log_file="$LOG_DIR/codex_${timestamp}.log"
+    local log_file="${CODEX_LOG_FILE:-$LOG_DIR/codex_${timestamp}.log}"
+    # Under the supervisor stdout already goes to the log file; don't write it twice
+    local tee_target="$log_file"
+    [ -n "$CODEX_LOG_FILE" ] && tee_target="/dev/null"
     
-    echo "🤖 Starting Codex task: $task" | tee "$log_file"
-    echo "📝 Logs will be saved to: $log_file" | tee -a "$log_file"
-    echo "🕒 Started at: $(date)" | tee -a "$log_file"
-    echo "=====================================\n" | tee -a "$log_file"
+    echo "🤖 Starting Codex task: $task" | tee -a "$tee_target"
+    echo "📝 Logs will be saved to: $log_file" | tee -a "$tee_target"
+    echo "🕒 Started at: $(date)" | tee -a "$tee_target"
+    echo "=====================================\n" | tee -a "$tee_target"
     
     cd "$REPO_ROOT"
     
-    # Create a status file
-    echo "RUNNING" > "$LOG_DIR/codex_status"
-    echo "$task" > "$LOG_DIR/current_task"
-    echo "$timestamp" > "$LOG_DIR/task_start_time"
+    # Register the job (updates the shared status record with its log path)
+    codex_job start "$task" "$log_file"
     
     # Simulate Codex execution with Claude Code agent
     {
@@ -33,38 +41,47 @@ run_codex_task() {
         # This would be where we call the actual Task agent
         # For now, we'll create a placeholder that shows the concept
         python3 -c "
+import os
 import sys
 import time
 sys.path.insert(0, '.')
+from codex_jobs import JobRegistry
+
+registry = JobRegistry('$LOG_DIR')
+job_id = os.environ['CODEX_JOB_ID']
 
 print('🤖 Codex Agent Started')
 print('📊 Planning implementation strategy...')
 time.sleep(2)
+registry.progress(job_id, 25)
 
 print('🔨 Setting up development environment...')
 time.sleep(1)
+registry.progress(job_id, 40)
 
 print('📝 Writing code components...')
 time.sleep(3)
+registry.progress(job_id, 75)
 
 print('🧪 Running tests and validation...')
 time.sleep(2)
+registry.progress(job_id, 95)
 
 print('✅ Task completed successfully!')
 print('📄 Results saved to project directory')
 "
         
         echo "🎉 Codex task completed at: $(date)"
-        echo "COMPLETED" > "$LOG_DIR/codex_status"
+        codex_job finish completed
         
-    } 2>&1 | tee -a "$log_file"
+    } 2>&1 | tee -a "$tee_target"
     
     echo "✅ Task completed! Check $log_file for full results."
 }
 
 # Handle cleanup on exit
 cleanup() {
-    echo "INTERRUPTED" > "$LOG_DIR/codex_status" 2>/dev/null || true
+    codex_job interrupt 2>/dev/null || true
 }
 trap cleanup EXIT
 
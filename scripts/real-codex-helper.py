@@ -11,11 +11,24 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from codex_jobs import JobRegistry
+from task_matcher import MultiPatternMatcher
+
+COMPLEX_KEYWORDS = [
+    "create", "build", "implement", "design", "system",
+    "dashboard", "authentication", "notification", "api",
+    "database", "integration", "real-time", "full",
+    "complete", "comprehensive"
+]
+COMPLEX_MATCHER = MultiPatternMatcher({"complex": COMPLEX_KEYWORDS})
+
 class RealCodexExecutor:
     def __init__(self, project_root="/Users/panda/Desktop/Claude Code/eufm XF"):
         self.project_root = Path(project_root)
         self.log_dir = self.project_root / "logs"
         self.log_dir.mkdir(exist_ok=True)
+        self.job_registry = JobRegistry(self.log_dir)
         
     def execute_task(self, task_description):
         """Execute task using Claude Code Task agent"""
@@ -27,10 +40,9 @@ class RealCodexExecutor:
         print(f"🕒 Started at: {datetime.now()}")
         print("=" * 50)
         
-        # Update status files
-        (self.log_dir / "codex_status").write_text("RUNNING")
-        (self.log_dir / "current_task").write_text(task_description)
-        (self.log_dir / "task_start_time").write_text(timestamp)
+        # Register the job under the supervisor's id, or our own when run by hand
+        self.job_id = os.environ.get("CODEX_JOB_ID") or f"{timestamp}_{os.getpid()}"
+        self.job_registry.start(self.job_id, task_description, log_file)
         
         try:
             # Log everything
@@ -51,25 +63,19 @@ class RealCodexExecutor:
                     result = self.handle_simple_task(task_description, log)
                 
                 log.write(f"\n🎉 Task completed at: {datetime.now()}\n")
-                (self.log_dir / "codex_status").write_text("COMPLETED")
+                self.job_registry.finish(self.job_id, "completed")
                 
                 return result
                 
         except Exception as e:
             with open(log_file, 'a') as log:
                 log.write(f"❌ Error occurred: {e}\n")
-            (self.log_dir / "codex_status").write_text("ERROR")
+            self.job_registry.finish(self.job_id, "failed")
             raise
     
     def is_complex_task(self, task):
         """Determine if task requires Task agent delegation"""
-        complex_keywords = [
-            "create", "build", "implement", "design", "system",
-            "dashboard", "authentication", "notification", "api",
-            "database", "integration", "real-time", "full",
-            "complete", "comprehensive"
-        ]
-        return any(keyword in task.lower() for keyword in complex_keywords)
+        return COMPLEX_MATCHER.contains_any(task)
     
     def delegate_to_task_agent(self, task_description, log):
         """Delegate to Claude Code Task agent - Phase 1 Implementation"""
@@ -99,6 +105,7 @@ class RealCodexExecutor:
             # Simulate progress updates
             progress = int((i + 1) / len(steps) * 100)
             log.write(f"   Progress: {progress}%\n")
+            self.job_registry.progress(self.job_id, progress)
         
         # Simulate creating actual deliverables
         log.write("\n📄 Deliverables created:\n")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Similarity Index - Local near-duplicate lookup for requests and analyses
+Texts become sets of hashed word n-grams, MinHash signatures and LSH band buckets, so a lookup
+only compares against entries that share a bucket; candidates are confirmed with exact Jaccard
+similarity. Pure Python, stable across processes, no network model.
+"""
+
+import hashlib
+import random
+import re
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "for", "of", "to", "in", "on", "at", "by", "with", "from", "into",
+    "about", "our", "my", "me", "we", "i", "you", "your", "is", "are", "be", "all", "any", "new",
+    "please", "need", "want", "some", "that", "this", "these", "those", "it", "its"
+}
+
+# Request verbs that ask for the same work
+SYNONYMS = {
+    "track": "monitor", "watch": "monitor", "follow": "monitor", "observe": "monitor",
+    "find": "search", "identify": "search", "discover": "search", "locate": "search",
+    "analyse": "analyze", "assess": "analyze", "evaluate": "analyze", "review": "analyze",
+    "summarise": "summarize", "summary": "summarize",
+    "update": "change", "modification": "change", "amendment": "change"
+}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def tokens(text: str) -> List[str]:
+    """Lowercased content words with synonyms folded and plurals reduced"""
+    words = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(SYNONYMS.get(word, word))
+    return words
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def shingles(text: str, ngram: int = 2) -> FrozenSet[int]:
+    """Hashed word 1..n-grams: unigrams carry the vocabulary, longer grams some word order"""
+    words = tokens(text)
+    grams = set()
+    for size in range(1, ngram + 1):
+        for i in range(len(words) - size + 1):
+            grams.add(_hash(" ".join(words[i:i + size])))
+    return frozenset(grams)
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class SimilarityIndex:
+    """MinHash/LSH index of texts; query() returns stored keys above a Jaccard threshold.
+
+    With ``bands`` bands of ``num_perm / bands`` rows, pairs around
+    (1 / bands) ** (bands / num_perm) similarity become candidates half the time;
+    the defaults (64 permutations, 16 bands of 4) surface nearly every pair above 0.7.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, ngram: int = 2, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        generator = random.Random(seed)
+        self.permutations = [(generator.randrange(1, _MERSENNE_PRIME), generator.randrange(0, _MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+        self.buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [{} for _ in range(bands)]
+        self.entries: Dict[Hashable, FrozenSet[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def signature(self, grams: FrozenSet[int]) -> Tuple[int, ...]:
+        if not grams:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(min(((a * gram + b) % _MERSENNE_PRIME) & _MAX_HASH for gram in grams)
+                     for a, b in self.permutations)
+
+    def _bands(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Hashable, text: str):
+        """Index text under key; adding a key that is already indexed does nothing"""
+        grams = shingles(text, self.ngram)
+        if not grams or key in self.entries:
+            return
+        self.entries[key] = grams
+        for band, rows in self._bands(self.signature(grams)):
+            self.buckets[band].setdefault(rows, set()).add(key)
+
+    def query(self, text: str, threshold: float, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """(key, similarity) of indexed texts at or above threshold, most similar first"""
+        grams = shingles(text, self.ngram)
+        if not grams:
+            return []
+        candidates = set()
+        for band, rows in self._bands(self.signature(grams)):
+            candidates.update(self.buckets[band].get(rows, ()))
+        scored = [(key, jaccard(grams, self.entries[key])) for key in candidates]
+        scored = sorted(((key, round(score, 4)) for key, score in scored if score >= threshold),
+                        key=lambda item: item[1], reverse=True)
+        return scored[:limit] if limit is not None else scored
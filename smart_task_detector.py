@@ -8,6 +8,23 @@ import re
 import json
 from typing import Dict, List, Tuple
 from codex_monitor import CodexMonitor
+from task_matcher import MultiPatternMatcher
+
+COMPLEXITY_SCORES = {
+    "low": 1,
+    "medium": 2,
+    "high": 3,
+    "very_high": 5
+}
+
+# Recommendation text by tier: not delegated, simple, moderate, complex, highly complex
+RECOMMENDATIONS = (
+    "Handle directly - Simple task or informational request",
+    "📝 SIMPLE - Can handle directly or delegate for learning",
+    "⚡ MODERATE - Consider Codex for efficiency",
+    "🚀 COMPLEX - Strongly recommend Codex delegation",
+    "🔥 HIGHLY COMPLEX - Delegate to Codex immediately"
+)
 
 class SmartTaskDetector:
     def __init__(self):
@@ -52,21 +69,55 @@ class SmartTaskDetector:
             "create", "build", "implement", "develop", "design", 
             "add", "integrate", "setup", "configure", "deploy"
         ]
+        
+        self.build_matcher()
+        
+    def build_matcher(self):
+        """Compile all keyword tables into one matcher (call again after editing the tables)"""
+        table = {"action": self.action_verbs}
+        for pattern_name, pattern_info in self.complex_patterns.items():
+            table[(pattern_name, "keywords")] = pattern_info["keywords"]
+            table[(pattern_name, "phrases")] = pattern_info["phrases"]
+        self.matcher = MultiPatternMatcher(table)
+        self._label_csr = None
+        
+    def _label_arrays(self):
+        """Matcher column -> count slots as CSR arrays (row starts, row lengths, flat slots), built once.
+
+        Slots are laid out as [keyword counts per pattern, phrase counts per pattern, action].
+        """
+        if self._label_csr is None:
+            import numpy as np
+            pattern_names = list(self.complex_patterns)
+            slots = []
+            for term in self.matcher.vocabulary:
+                term_slots = []
+                for label in self.matcher.labels_by_term[term]:
+                    if label == "action":
+                        term_slots.append(2 * len(pattern_names))
+                    else:
+                        offset = 0 if label[1] == "keywords" else len(pattern_names)
+                        term_slots.append(offset + pattern_names.index(label[0]))
+                slots.append(term_slots)
+            lengths = np.array([len(term_slots) for term_slots in slots], dtype=np.int64)
+            flat = np.array([slot for term_slots in slots for slot in term_slots], dtype=np.int64)
+            self._label_csr = (np.cumsum(lengths) - lengths, lengths, flat)
+        return self._label_csr
     
     def analyze_task_complexity(self, task_description: str) -> Dict:
         """Analyze task and determine if it should be delegated to Codex"""
-        task_lower = task_description.lower()
+        matches = self.matcher.match(task_description)
         
         # Check for action verbs
-        has_action = any(verb in task_lower for verb in self.action_verbs)
+        has_action = "action" in matches
         
         # Analyze patterns
         matched_patterns = []
         total_complexity_score = 0
         
         for pattern_name, pattern_info in self.complex_patterns.items():
-            keyword_matches = sum(1 for keyword in pattern_info["keywords"] if keyword in task_lower)
-            phrase_matches = sum(1 for phrase in pattern_info["phrases"] if phrase in task_lower)
+            keyword_matches = len(matches.get((pattern_name, "keywords"), ()))
+            phrase_matches = len(matches.get((pattern_name, "phrases"), ()))
             
             if keyword_matches > 0 or phrase_matches > 0:
                 matched_patterns.append({
@@ -77,13 +128,7 @@ class SmartTaskDetector:
                 })
                 
                 # Add to complexity score
-                complexity_scores = {
-                    "low": 1,
-                    "medium": 2,
-                    "high": 3,
-                    "very_high": 5
-                }
-                total_complexity_score += complexity_scores.get(pattern_info["complexity"], 1)
+                total_complexity_score += COMPLEXITY_SCORES.get(pattern_info["complexity"], 1)
         
         # Check length and detail level
         word_count = len(task_description.split())
@@ -110,16 +155,101 @@ class SmartTaskDetector:
     def _get_recommendation(self, score: int, should_delegate: bool) -> str:
         """Generate human-readable recommendation"""
         if not should_delegate:
-            return "Handle directly - Simple task or informational request"
+            return RECOMMENDATIONS[0]
         
         if score >= 8:
-            return "🔥 HIGHLY COMPLEX - Delegate to Codex immediately"
+            return RECOMMENDATIONS[4]
         elif score >= 5:
-            return "🚀 COMPLEX - Strongly recommend Codex delegation"
+            return RECOMMENDATIONS[3]
         elif score >= 3:
-            return "⚡ MODERATE - Consider Codex for efficiency"
+            return RECOMMENDATIONS[2]
         else:
-            return "📝 SIMPLE - Can handle directly or delegate for learning"
+            return RECOMMENDATIONS[1]
+    
+    def analyze_batch_arrays(self, task_descriptions: List[str]) -> Dict:
+        """Score a whole batch of task descriptions with NumPy array operations.
+
+        Returns per-text arrays (rows follow the input order, pattern columns
+        follow ``complex_patterns``) for threshold tuning over large backlogs.
+        """
+        import numpy as np
+        
+        pattern_names = list(self.complex_patterns)
+        n_texts, n_patterns = len(task_descriptions), len(pattern_names)
+        n_slots = 2 * n_patterns + 1
+        
+        # Sparse term-incidence matrix in COO form: (row, term column) for each distinct term found
+        rows, columns = self.matcher.find_terms_batch(task_descriptions)
+        
+        # Sparse × membership product: every incidence adds one to each (row, slot) its term belongs to
+        starts, lengths, flat = self._label_arrays()
+        counts = lengths[columns]
+        ends = np.cumsum(counts)
+        offsets = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts, counts)
+        slots = flat[np.repeat(starts[columns], counts) + offsets]
+        table = np.bincount(np.repeat(rows, counts) * n_slots + slots,
+                            minlength=n_texts * n_slots).reshape(n_texts, n_slots)
+        keyword_matches = table[:, :n_patterns]
+        phrase_matches = table[:, n_patterns:2 * n_patterns]
+        has_action = table[:, -1] > 0
+        
+        matched = (keyword_matches + phrase_matches) > 0
+        weights = np.array([COMPLEXITY_SCORES.get(self.complex_patterns[name]["complexity"], 1)
+                            for name in pattern_names], dtype=np.int64)
+        word_count = np.fromiter(map(len, map(str.split, task_descriptions)),
+                                 dtype=np.int64, count=len(task_descriptions))
+        complexity_score = matched.astype(np.int64) @ weights + np.minimum(word_count // 10, 3)
+        should_delegate = has_action & (complexity_score >= 2) & matched.any(axis=1)
+        tier = np.select(
+            [~should_delegate, complexity_score >= 8, complexity_score >= 5, complexity_score >= 3],
+            [0, 4, 3, 2],
+            default=1
+        )
+        
+        return {
+            "pattern_names": pattern_names,
+            "keyword_matches": keyword_matches,
+            "phrase_matches": phrase_matches,
+            "matched": matched,
+            "has_action_verb": has_action,
+            "word_count": word_count,
+            "complexity_score": complexity_score,
+            "should_delegate": should_delegate,
+            "recommendation_tier": tier
+        }
+        
+    def analyze_batch(self, task_descriptions: List[str]) -> List[Dict]:
+        """Vectorized analyze_task_complexity for many texts; results match the scalar path"""
+        arrays = self.analyze_batch_arrays(task_descriptions)
+        pattern_names = arrays["pattern_names"]
+        
+        # Plain lists: indexing NumPy scalars one at a time costs more than the scoring itself
+        complexities = [self.complex_patterns[name]["complexity"] for name in pattern_names]
+        keyword_matches = arrays["keyword_matches"].tolist()
+        phrase_matches = arrays["phrase_matches"].tolist()
+        results = []
+        for row, (should_delegate, score, has_action, word_count, tier) in enumerate(zip(
+                arrays["should_delegate"].tolist(), arrays["complexity_score"].tolist(),
+                arrays["has_action_verb"].tolist(), arrays["word_count"].tolist(),
+                arrays["recommendation_tier"].tolist())):
+            matched_patterns = []
+            for column, (keywords, phrases) in enumerate(zip(keyword_matches[row], phrase_matches[row])):
+                if keywords or phrases:
+                    matched_patterns.append({
+                        "pattern": pattern_names[column],
+                        "complexity": complexities[column],
+                        "keyword_matches": keywords,
+                        "phrase_matches": phrases
+                    })
+            results.append({
+                "should_delegate": should_delegate,
+                "complexity_score": score,
+                "matched_patterns": matched_patterns,
+                "has_action_verb": has_action,
+                "word_count": word_count,
+                "recommendation": RECOMMENDATIONS[tier]
+            })
+        return results
     
     def auto_delegate_if_complex(self, task_description: str) -> Dict:
         """Automatically delegate task if it's complex enough"""
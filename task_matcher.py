@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Task Matcher - Shared multi-pattern keyword engine
+All keyword tables compile into one trie-shaped regex; each text is scanned once
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, Iterator, List, Set, Tuple
+
+_END = ""  # trie key marking the end of a term
+
+
+def _trie_regex(node: Dict) -> str:
+    """Render a character trie as a regex with shared prefixes factored out"""
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _END in node:
+        return "(?:" + body + ")?"
+    return body
+
+
+class MultiPatternMatcher:
+    """Find every table term occurring in a text with a single compiled regex scan.
+
+    Terms are matched case-insensitively and only where they start on a word
+    boundary, so "ui" matches "UI" and "ui-kit" but not "build", while stems
+    such as "user" still match "users". Overlapping terms ("user" inside
+    "user authentication") are all reported. Because the alternation is
+    trie-shaped, scan cost grows with the text, not with the number of terms.
+    """
+
+    def __init__(self, table: Dict[Hashable, Iterable[str]]):
+        self.labels_by_term: Dict[str, Set[Hashable]] = {}
+        for label, terms in table.items():
+            for term in terms:
+                term = term.lower()
+                if term:
+                    self.labels_by_term.setdefault(term, set()).add(label)
+
+        self.trie: Dict = {}
+        for term in self.labels_by_term:
+            node = self.trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[_END] = term
+
+        # Zero-width lookahead captures the longest term at every word-start position;
+        # any shorter terms starting there are exactly its term-prefixes
+        body = _trie_regex(self.trie)
+        self.pattern = re.compile(r"(?<!\w)(?=(" + body + "))") if body else None
+        self.prefix_terms = {term: self._term_prefixes(term) for term in self.labels_by_term}
+
+        # Batch variant: " \n" row separators are captured by the same group, and map to column -1
+        self.vocabulary = list(self.labels_by_term)
+        self.batch_pattern = re.compile(r"(?<!\w)(?=(" + body + r"|\n))") if body else None
+        self.longest_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        self.longest_ids["\n"] = -1
+        self.prefix_columns = [[self.longest_ids[t] for t in self.prefix_terms[term]] for term in self.vocabulary]
+        self._prefix_csr = None
+
+    def _term_prefixes(self, term: str) -> Tuple[str, ...]:
+        prefixes = []
+        node = self.trie
+        for char in term:
+            node = node[char]
+            if _END in node:
+                prefixes.append(node[_END])
+        return tuple(prefixes)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (start, term) for each word-boundary match in text"""
+        if self.pattern is None:
+            return
+        for candidate in self.pattern.finditer(text.lower()):
+            start = candidate.start()
+            for term in self.prefix_terms[candidate.group(1)]:
+                yield start, term
+
+    def find_terms(self, text: str) -> Set[str]:
+        """Distinct terms present in text"""
+        if self.pattern is None:
+            return set()
+        terms = set()
+        for longest in self.pattern.findall(text.lower()):
+            terms.update(self.prefix_terms[longest])
+        return terms
+
+    def find_terms_batch(self, texts: List[str]):
+        """Term incidence for many texts as sorted, de-duplicated (rows, columns) NumPy arrays.
+
+        Columns index ``self.vocabulary``. The whole batch is scanned by one
+        regex call; rows and prefix expansion are computed with array operations.
+        """
+        import numpy as np
+
+        empty = np.zeros(0, dtype=np.int64)
+        if self.batch_pattern is None or not texts:
+            return empty, empty
+
+        joined = " \n".join(text.replace("\n", " ") for text in texts).lower()
+        found = self.batch_pattern.findall(joined)
+        ids = np.fromiter(map(self.longest_ids.__getitem__, found), dtype=np.int64, count=len(found))
+        separators = ids < 0
+        rows = np.cumsum(separators)[~separators]
+        ids = ids[~separators]
+        if not len(ids):
+            return empty, empty
+
+        # Expand every longest match into all the terms that are its prefixes (CSR gather)
+        starts, lengths, flat = self._prefix_arrays()
+        counts = lengths[ids]
+        ends = np.cumsum(counts)
+        offsets = np.arange(ends[-1]) - np.repeat(ends - counts, counts)
+        columns = flat[np.repeat(starts[ids], counts) + offsets]
+        rows = np.repeat(rows, counts)
+
+        # De-duplicate through a dense (text, term) bitmap of len(texts) * len(vocabulary) bytes:
+        # cheaper than sorting the keys, and the set bits come out already in order
+        seen = np.zeros(len(texts) * len(self.vocabulary), dtype=bool)
+        seen[rows * len(self.vocabulary) + columns] = True
+        keys = np.flatnonzero(seen)
+        return keys // len(self.vocabulary), keys % len(self.vocabulary)
+
+    def _prefix_arrays(self):
+        """prefix_columns as CSR arrays (row starts, row lengths, flat columns), built once"""
+        if self._prefix_csr is None:
+            import numpy as np
+            lengths = np.array([len(columns) for columns in self.prefix_columns], dtype=np.int64)
+            flat = np.array([column for columns in self.prefix_columns for column in columns], dtype=np.int64)
+            self._prefix_csr = (np.cumsum(lengths) - lengths, lengths, flat)
+        return self._prefix_csr
+
+    def contains_any(self, text: str) -> bool:
+        """True as soon as any term matches"""
+        return self.pattern is not None and self.pattern.search(text.lower()) is not None
+
+    def match(self, text: str) -> Dict[Hashable, Set[str]]:
+        """Matched terms grouped by table label"""
+        matches: Dict[Hashable, Set[str]] = {}
+        for term in self.find_terms(text):
+            for label in self.labels_by_term[term]:
+                matches.setdefault(label, set()).add(term)
+        return matches
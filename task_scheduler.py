@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Task Scheduler - Dependency-aware concurrent executor for Mission Control
+Runs queued agent tasks as a DAG keyed by task_type, with per-agent concurrency limits
+"""
+
+import heapq
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional
+
+from agents.tracing import TRACER
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+class TaskScheduler:
+    def __init__(self, execute_fn: Callable[[Dict], None], max_workers: int = 4,
+                 agent_limits: Optional[Dict[str, int]] = None, default_agent_limit: int = 1,
+                 logger: Optional[logging.Logger] = None):
+        self.execute_fn = execute_fn
+        self.max_workers = max(1, max_workers)
+        self.agent_limits = agent_limits or {}
+        self.default_agent_limit = max(1, default_agent_limit)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _agent_limit(self, agent: str) -> int:
+        return max(1, self.agent_limits.get(agent, self.default_agent_limit))
+
+    def run(self, tasks: List[Dict], completed_types: Iterable[str] = ()) -> Dict:
+        """Execute tasks as soon as their dependencies are met.
+
+        A dependency names a task_type. It is satisfied once every queued task of
+        that type has finished successfully, or - if none is queued - when a task
+        of that type already appears in ``completed_types``.
+        """
+        history = set(completed_types)
+        remaining = defaultdict(int)
+        for task in tasks:
+            remaining[task.get("task_type")] += 1
+
+        failed_types = set()
+        indegree = {}
+        waiting_on = defaultdict(list)
+        ready = []
+        seq = 0
+
+        def push_ready(index: int):
+            nonlocal seq
+            task = tasks[index]
+            rank = PRIORITY_ORDER.get(task.get("priority"), len(PRIORITY_ORDER))
+            heapq.heappush(ready, (rank, seq, index, time.time()))
+            seq += 1
+
+        for index, task in enumerate(tasks):
+            unmet = {dep for dep in task.get("dependencies") or []
+                     if remaining.get(dep, 0) > 0 or dep not in history}
+            indegree[index] = len(unmet)
+            for dep in unmet:
+                waiting_on[dep].append(index)
+            if not unmet:
+                push_ready(index)
+
+        running = {}
+        running_per_agent = defaultdict(int)
+        completed, failed = [], []
+        deferred = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mc-task") as pool:
+            while ready or running:
+                # Dispatch everything the worker pool and agent limits allow
+                while ready and len(running) < self.max_workers:
+                    entry = heapq.heappop(ready)
+                    task = tasks[entry[2]]
+                    agent = task.get("agent")
+                    if running_per_agent[agent] >= self._agent_limit(agent):
+                        deferred.append(entry)
+                        continue
+                    running_per_agent[agent] += 1
+                    task["queue_wait_seconds"] = round(time.time() - entry[3], 3)
+                    TRACER.record("scheduler.queue_wait", time.time() - entry[3], agent=agent)
+                    running[pool.submit(self.execute_fn, task)] = entry[2]
+                for entry in deferred:
+                    heapq.heappush(ready, entry)
+                deferred.clear()
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    task = tasks[index]
+                    task_type = task.get("task_type")
+                    running_per_agent[task.get("agent")] -= 1
+
+                    error = future.exception()
+                    if error is not None:
+                        self.logger.error(f"❌ {task_type} failed on {task.get('agent')}: {error}")
+                        failed.append(task)
+                        failed_types.add(task_type)
+                    else:
+                        completed.append(task)
+
+                    remaining[task_type] -= 1
+                    if remaining[task_type] == 0 and task_type not in failed_types:
+                        history.add(task_type)
+                        for dependent in waiting_on.pop(task_type, []):
+                            indegree[dependent] -= 1
+                            if indegree[dependent] == 0:
+                                push_ready(dependent)
+
+        finished = {id(task) for task in completed} | {id(task) for task in failed}
+        blocked = [task for task in tasks if id(task) not in finished]
+
+        return {
+            "completed": completed,
+            "failed": failed,
+            "blocked": blocked
+        }
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Task Store - Crash-safe SQLite (WAL) backend for the Mission Control task queue
+Enqueue/lease/ack semantics with lease expiry, plus durable discovered agents and summoning history
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from task_scheduler import PRIORITY_ORDER
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT,
+    task_type TEXT,
+    priority_rank INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    task TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (state, priority_rank, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (state, lease_expires);
+CREATE TABLE IF NOT EXISTS discovered_agents (
+    name TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summoning_history (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    session TEXT NOT NULL
+);
+"""
+
+
+class TaskStore:
+    def __init__(self, db_path, max_attempts: int = 3):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        """Immediate write transaction: other processes' writers wait, readers carry on (WAL)"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def _write(self, statements):
+        """Run (sql, params) pairs in one transaction; returns the cursors"""
+        with self._transaction() as conn:
+            return [conn.execute(sql, params) for sql, params in statements]
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # Task queue
+
+    def enqueue(self, task: Dict) -> int:
+        return self.enqueue_many([task])[0]
+
+    def enqueue_many(self, tasks: Iterable[Dict]) -> List[int]:
+        """Persist tasks as pending; each task dict gets its task_id"""
+        tasks = list(tasks)
+        now = time.time()
+        with self._transaction() as conn:
+            for task in tasks:
+                stored = {key: value for key, value in task.items() if key not in ("task_id", "state", "attempts")}
+                cursor = conn.execute(
+                    "INSERT INTO tasks (agent, task_type, priority_rank, task, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (task.get("agent"), task.get("task_type"),
+                     PRIORITY_ORDER.get(task.get("priority"), len(PRIORITY_ORDER)),
+                     json.dumps(stored, default=str), now, now)
+                )
+                task["task_id"] = cursor.lastrowid
+        return [task["task_id"] for task in tasks]
+
+    def lease(self, owner: str, lease_seconds: float = 1800, limit: int = 1,
+              agents: Optional[Iterable[str]] = None, task_types: Optional[Iterable[str]] = None,
+              exclude: Iterable[int] = ()) -> List[Dict]:
+        """Claim up to `limit` pending tasks (highest priority, oldest first) for `owner`.
+
+        With agents and/or task_types, only tasks addressed to one of those agents or
+        of one of those types are claimed; task ids in exclude are skipped. Expired
+        leases are reclaimed first, so tasks held by a crashed worker run again.
+        """
+        now = time.time()
+        agent_filter, params = "", []
+        if agents is not None or task_types is not None:
+            clauses = []
+            for column, values in (("agent", agents), ("task_type", task_types)):
+                values = list(values or [])
+                if values:
+                    clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                    params += values
+            if not clauses:
+                return []
+            agent_filter = f" AND ({' OR '.join(clauses)})"
+        exclude = list(exclude)
+        if exclude:
+            agent_filter += f" AND task_id NOT IN ({', '.join('?' * len(exclude))})"
+            params += exclude
+
+        with self._transaction() as conn:
+            self._reclaim_expired(conn, now)
+            rows = conn.execute(
+                "SELECT task_id, task, attempts FROM tasks WHERE state = 'pending'"
+                f"{agent_filter} ORDER BY priority_rank, task_id LIMIT ?",
+                params + [limit]
+            ).fetchall()
+            for task_id, _, _ in rows:
+                conn.execute(
+                    "UPDATE tasks SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                    (owner, now + lease_seconds, now, task_id)
+                )
+
+        return [dict(json.loads(task), task_id=task_id, attempts=attempts + 1) for task_id, task, attempts in rows]
+
+    def renew(self, task_id: int, owner: str, lease_seconds: float = 1800) -> bool:
+        """Extend a lease still held by owner"""
+        cursor, = self._write([(
+            "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+            "WHERE task_id = ? AND state = 'leased' AND lease_owner = ?",
+            (time.time() + lease_seconds, time.time(), task_id, owner)
+        )])
+        return cursor.rowcount == 1
+
+    def ack(self, task_id: int, result: Optional[Dict] = None, owner: Optional[str] = None) -> bool:
+        """Mark a leased task done; with owner, only if that owner still holds the lease"""
+        owner_filter, params = ("", []) if owner is None else (" AND lease_owner = ?", [owner])
+        cursor, = self._write([(
+            "UPDATE tasks SET state = 'done', result = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            f"WHERE task_id = ? AND state = 'leased'{owner_filter}",
+            [json.dumps(result, default=str) if result is not None else None, time.time(), task_id] + params
+        )])
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: int, error: str, retry: bool = True) -> str:
+        """Record a failure; the task returns to pending until max_attempts is reached"""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None:
+                return "missing"
+            state = "pending" if retry and row[0] < self.max_attempts else "failed"
+            conn.execute(
+                "UPDATE tasks SET state = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE task_id = ?",
+                (state, error, time.time(), task_id)
+            )
+        return state
+
+    def release(self, task_ids: Iterable[int]):
+        """Return leased tasks to pending without counting an attempt"""
+        now = time.time()
+        self._write([(
+            "UPDATE tasks SET state = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE task_id = ? AND state = 'leased'",
+            (now, task_id)
+        ) for task_id in task_ids])
+
+    def block(self, task_ids: Iterable[int], error: str):
+        """Park leased tasks that can never run (a dependency failed) as blocked"""
+        now = time.time()
+        self._write([(
+            "UPDATE tasks SET state = 'blocked', error = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE task_id = ? AND state = 'leased'",
+            (error, now, task_id)
+        ) for task_id in task_ids])
+
+    def _reclaim_expired(self, conn, now: float) -> int:
+        """Expired leases go back to pending, or to failed once they have used every attempt"""
+        cursor = conn.execute(
+            "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = 'lease expired', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE state = 'leased' AND lease_expires < ?",
+            (self.max_attempts, now, now)
+        )
+        return cursor.rowcount
+
+    def reclaim_expired(self) -> int:
+        """Return tasks whose lease ran out to the pending queue"""
+        with self._transaction() as conn:
+            return self._reclaim_expired(conn, time.time())
+
+    def tasks(self, states: Iterable[str] = ("pending",)) -> List[Dict]:
+        """Tasks in the given states, in queue order"""
+        states = list(states)
+        rows = self._query(
+            f"SELECT task_id, task, state, attempts, error FROM tasks WHERE state IN ({', '.join('?' * len(states))}) "
+            "ORDER BY priority_rank, task_id",
+            states
+        )
+        return [dict(json.loads(task), task_id=task_id, state=state, attempts=attempts, **({"error": error} if error else {}))
+                for task_id, task, state, attempts, error in rows]
+
+    def task_types(self, states: Iterable[str]) -> Set[str]:
+        """Distinct task types with a task in any of the given states"""
+        states = list(states)
+        return {row[0] for row in self._query(
+            f"SELECT DISTINCT task_type FROM tasks WHERE state IN ({', '.join('?' * len(states))})", states)}
+
+    def dependency_types(self) -> Tuple[Set[str], Set[str]]:
+        """(satisfied, dead) task types for dependency checks.
+
+        A type is satisfied once it has a done task and none left pending or leased,
+        so a done task from an earlier run cannot stand in for newly queued work. It
+        is dead when only failed or blocked tasks of it remain: it can never be done.
+        """
+        open_types = self.task_types(("pending", "leased"))
+        done_types = self.task_types(("done",))
+        return done_types - open_types, self.task_types(("failed", "blocked")) - done_types - open_types
+
+    def block_unrunnable(self, tasks: Iterable[Dict], dead_types: Set[str]) -> Tuple[List[Dict], List[Dict]]:
+        """Block the leased tasks that depend on a dead type; returns (blocked, the rest)"""
+        blocked, rest = {}, []
+        for task in tasks:
+            failed_dependencies = [dep for dep in task.get("dependencies") or [] if dep in dead_types]
+            if failed_dependencies:
+                blocked.setdefault(f"dependency failed: {', '.join(failed_dependencies)}", []).append(task)
+            else:
+                rest.append(task)
+        for error, group in blocked.items():
+            self.block((task["task_id"] for task in group), error)
+        return [task for group in blocked.values() for task in group], rest
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._query("SELECT state, COUNT(*) FROM tasks GROUP BY state"))
+
+    # Discovered agents and summoning history
+
+    def save_discovered_agent(self, name: str, config: Dict):
+        self._write([(
+            "INSERT OR REPLACE INTO discovered_agents (name, config, updated_at) VALUES (?, ?, ?)",
+            (name, json.dumps(config, default=str), time.time())
+        )])
+
+    def discovered_agents(self) -> Dict[str, Dict]:
+        return {name: json.loads(config) for name, config in
+                self._query("SELECT name, config FROM discovered_agents ORDER BY name")}
+
+    def append_summoning(self, session: Dict) -> int:
+        cursor, = self._write([(
+            "INSERT INTO summoning_history (timestamp, session) VALUES (?, ?)",
+            (session.get("timestamp"), json.dumps(session, default=str))
+        )])
+        return cursor.lastrowid
+
+    def summoning_history(self, limit: Optional[int] = None) -> List[Dict]:
+        """Sessions oldest first; with limit, only the most recent ones"""
+        if limit is None:
+            rows = self._query("SELECT session FROM summoning_history ORDER BY session_id")
+        else:
+            rows = self._query("SELECT session FROM (SELECT session_id, session FROM summoning_history "
+                               "ORDER BY session_id DESC LIMIT ?) ORDER BY session_id", (limit,))
+        return [json.loads(session) for session, in rows]
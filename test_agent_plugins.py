@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test warm in-process agent plugins and opt-in subprocess isolation
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.plugins import AgentPlugin, AgentPluginRegistry
+from mission_control import EnhancedMissionControl
+
+REGULATIONS_TASK = {"agent": "eu_regulations", "task_type": "regulatory_monitoring",
+                    "payload": {"scan": "regulations"}}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "logs").mkdir()
+    return AgentPluginRegistry(tmp_path)
+
+
+def test_in_process_agents_stay_warm_and_return_results(registry):
+    first = registry.run("eu_regulations", REGULATIONS_TASK)
+    agent = registry.instances["eu_regulations"]
+    second = registry.run("eu_regulations", REGULATIONS_TASK)
+
+    assert first["status"] == second["status"] == "success"
+    assert first["mode"] == "in_process"
+    assert "regulation_updates" in first["result"]
+    assert registry.instances["eu_regulations"] is agent
+
+
+def test_isolated_run_returns_structured_result(registry):
+    outcome = registry.run("eu_regulations", REGULATIONS_TASK, isolated=True)
+    assert outcome["status"] == "success", outcome.get("error")
+    assert outcome["mode"] == "subprocess"
+    assert "regulation_updates" in outcome["result"]
+    assert "eu_regulations" not in registry.instances
+
+
+def test_errors_are_reported(registry):
+    registry.register(AgentPlugin("broken", "agents.research_agent_eu_regulations", "EURegulationsAgent",
+                                  entry="missing_entry"))
+    assert registry.run("broken", REGULATIONS_TASK)["status"] == "error"
+    assert registry.run("broken", REGULATIONS_TASK, isolated=True)["status"] == "error"
+    assert registry.run("unknown", REGULATIONS_TASK)["error"] == "No plugin registered for unknown"
+
+
+def test_mission_control_keeps_plugin_result_on_task(tmp_path):
+    mc = EnhancedMissionControl(project_root=str(tmp_path))
+    task = dict(REGULATIONS_TASK)
+    mc._execute_task(task)
+    assert "regulation_updates" in task["result"]
+    assert mc.core_agents["eu_regulations"]["status"] == "completed"
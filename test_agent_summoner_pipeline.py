@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Test streaming/pipelined Agent Summoner stages with a fake Sonar researcher
+"""
+
+import json
+from datetime import datetime
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agent_summoner import AgentSummoner
+
+CALL_SECONDS = 0.2
+
+FAKE_ANSWERS = {
+    "agent_analysis": "1. DOMAIN: Agricultural biotechnology\n2. TASK_TYPE: Monitoring\n3. COMPLEXITY: 6\n",
+    "agent_discovery": "1. EXISTING AI AGENTS: PatentBot\n7. RECOMMENDATIONS:\n1. Use PatentBot\n2. Use Lens.org API\n",
+    "agent_evaluation": "1. OPTIMAL CONFIGURATION:\nPatentBot with weekly alerts\n2. IMPLEMENTATION PLAN: ...\n"
+}
+
+
+@pytest.fixture
+def summoner(tmp_path):
+    (tmp_path / "logs").mkdir()
+    summoner = AgentSummoner(project_root=str(tmp_path))
+    summoner.calls = []
+
+    def fake_research(query, model="sonar-pro", query_class="default"):
+        summoner.calls.append((query_class, query, time.time()))
+        time.sleep(CALL_SECONDS)
+        return {
+            "query": query,
+            "model": model,
+            "status": "success",
+            "cost": 0.009,
+            "response": {"choices": [{"message": {"content": FAKE_ANSWERS[query_class]}}]}
+        }
+
+    summoner.researcher.perplexity_research = fake_research
+    return summoner
+
+
+def test_stages_stream_in_order(summoner):
+    events = list(summoner.iter_summoning("Monitor competitor patent filings"))
+
+    assert [e["stage"] for e in events] == ["analysis", "discovery", "evaluation", "complete"]
+    assert events[0]["elapsed_seconds"] < 2 * CALL_SECONDS
+    assert events[0]["result"]["domain"] == "Agricultural biotechnology"
+
+    final = events[-1]["result"]
+    assert final["summoning_stats"]["time_to_first_output_seconds"] == events[0]["elapsed_seconds"]
+    assert len(final["agent_discovery"]["recommendations"]) == 2
+
+
+def test_discovery_uses_raw_analysis_text(summoner):
+    summoner.summon_agent("Monitor competitor patent filings")
+
+    discovery_query = next(q for cls, q, _ in summoner.calls if cls == "agent_discovery")
+    assert "TASK ANALYSIS:" in discovery_query
+    assert "Agricultural biotechnology" in discovery_query
+
+
+def test_speculative_discovery_overlaps_analysis(summoner):
+    seen = []
+    start = time.time()
+    result = summoner.summon_agent("Monitor competitor patent filings",
+                                   on_stage=lambda e: seen.append(e["stage"]),
+                                   speculative_discovery=True)
+    elapsed = time.time() - start
+
+    assert seen == ["analysis", "discovery", "evaluation", "complete"]
+    assert elapsed < 2.8 * CALL_SECONDS
+    assert result["agent_discovery"]["task_analysis"]["domain"] == "Agricultural biotechnology"
+    starts = {cls: at for cls, _, at in summoner.calls}
+    assert abs(starts["agent_discovery"] - starts["agent_analysis"]) < CALL_SECONDS / 2
+
+
+@pytest.mark.parametrize("analysis_fails", [True, False])
+def test_abandoned_speculative_discovery_is_not_awaited(summoner, analysis_fails):
+    def slow_discovery(query, task_analysis):
+        time.sleep(10 * CALL_SECONDS)
+        return {"discovery_content": ""}
+
+    summoner._run_discovery = slow_discovery
+    if analysis_fails:
+        summoner.analyze_task = lambda request: {"error": "analysis failed"}
+
+    start = time.time()
+    events = summoner.iter_summoning("Monitor competitor patent filings", speculative_discovery=True)
+    first = next(events)
+    # Stop reading after the first event, as a caller that only wanted the analysis would
+    events.close()
+
+    assert first["stage"] == ("error" if analysis_fails else "analysis")
+    assert time.time() - start < 3 * CALL_SECONDS
+
+
+def test_each_stage_stored_once_and_round_trips(summoner):
+    result = summoner.summon_agent("Monitor competitor patent filings")
+
+    stored = summoner.research_store.find(agent="agent_summoner")
+    assert sorted(entry["artifact_type"] for entry in stored) == [
+        "agent_discovery", "agent_evaluation", "agent_summoning", "task_analysis"]
+    assert {entry["domain"] for entry in stored} == {"Agricultural biotechnology"}
+
+    summoning = summoner.research_store.latest("agent_summoner", "agent_summoning")
+    assert summoning["data"] == result
+    # Stages are written once instead of once per stage that embeds them
+    assert sum(entry["size"] for entry in stored) < len(json.dumps(result, separators=(",", ":")))
+
+
+@pytest.fixture
+def batch_queries(summoner):
+    """Fake batched Sonar calls; returns the (query_class, number of queries) of each fan-out"""
+    queries = []
+
+    def fake_research_many(pairs, query_class="default"):
+        queries.append((query_class, len(pairs)))
+        results = []
+        for query, model in pairs:
+            if query_class == "agent_analysis":
+                domain = "Regulatory affairs" if "regulatory" in query.lower() else "Agricultural biotechnology"
+                content = f"1. DOMAIN: {domain}\n2. TASK_TYPE: Monitoring\n"
+            else:
+                content = FAKE_ANSWERS[query_class]
+            results.append({"status": "success", "model": model, "cost": 0.009,
+                            "response": {"choices": [{"message": {"content": content}}]}})
+        return results
+
+    summoner.researcher.research_many = fake_research_many
+    return queries
+
+
+def test_batch_dedupes_and_shares_discovery(summoner, batch_queries):
+    queries = batch_queries
+    requests = [
+        "Monitor competitor patent filings in agricultural biotechnology",
+        "monitor competitor patent filings in agricultural biotechnology!",
+        "Track competitor patent filings in agricultural biotech",
+        "Track EU regulatory changes for plant protection products"
+    ]
+    batch = summoner.summon_agents_batch(requests)
+    stats = batch["batch_stats"]
+
+    assert stats["unique_requests"] == 3
+    assert stats["duplicates"] == 1
+    assert stats["discovery_buckets"] == 2
+    assert queries == [("agent_analysis", 3), ("agent_discovery", 2), ("agent_evaluation", 3)]
+    assert stats["api_queries"] == 8
+    assert stats["cost_saved"] > 0
+
+    results = batch["results"]
+    assert [r["user_request"] for r in results] == requests
+    assert results[1]["deduplicated_from"] == requests[0]
+    assert results[1]["summoning_stats"]["total_cost"] == 0.0
+    assert results[0]["agent_discovery"]["shared_with"] == 2
+    assert results[3]["agent_discovery"]["shared_with"] == 1
+
+    stored = summoner.research_store.latest("agent_summoner", "agent_summoning_batch")
+    assert stored["data"]["results"] == results
+    assert len(summoner.research_store.find(artifact_type="agent_discovery")) == 3
+
+
+def test_batch_reuses_recent_summonings_and_feeds_the_index(summoner, batch_queries):
+    first = summoner.summon_agent("Monitor competitor patent filings")
+    requests = [
+        "Track competitor patent filings",
+        "Monitor new competitor patent filings weekly",
+        "Track EU regulatory changes for plant protection products"
+    ]
+
+    batch = summoner.summon_agents_batch(requests)
+    results = batch["results"]
+
+    # Only the unrelated request goes through discovery and evaluation
+    assert batch_queries == [("agent_analysis", 2), ("agent_discovery", 1), ("agent_evaluation", 1)]
+    assert batch["batch_stats"]["reused"] == 2 and batch["batch_stats"]["api_queries"] == 4
+    assert results[0]["reused_from"]["match"] == "request"
+    assert results[0]["summoning_stats"]["research_queries"] == 0
+    assert results[1]["reused_from"]["match"] == "analysis"
+    assert results[1]["agent_evaluation"] == first["agent_evaluation"]
+    assert "reused_from" not in results[2]
+    assert len(summoner.research_store.find(artifact_type="agent_evaluation")) == 2
+    stored = summoner.research_store.latest("agent_summoner", "agent_summoning_batch")
+    assert stored["data"]["results"] == results
+
+    report = summoner.get_reuse_report()
+    assert report["lookups"] == 4 and report["request_hits"] == 1 and report["analysis_hits"] == 1
+
+    # New batch summonings join the index for later requests
+    calls = len(summoner.calls)
+    repeat = summoner.summon_agent("Track EU regulatory changes for plant protection products!")
+    assert repeat["reused_from"]["user_request"] == requests[2]
+    assert len(summoner.calls) == calls
+
+
+def test_near_duplicate_request_reuses_summoning(summoner):
+    first = summoner.summon_agent("Monitor competitor patent filings")
+    calls = len(summoner.calls)
+
+    events = list(summoner.iter_summoning("Track competitor patent filings"))
+    reused = events[-1]["result"]
+
+    assert [e["stage"] for e in events] == ["analysis", "discovery", "evaluation", "complete"]
+    assert len(summoner.calls) == calls
+    assert reused["user_request"] == "Track competitor patent filings"
+    assert reused["reused_from"]["match"] == "request"
+    assert reused["reused_from"]["user_request"] == "Monitor competitor patent filings"
+    assert reused["agent_evaluation"] == first["agent_evaluation"]
+    assert reused["summoning_stats"]["research_queries"] == 0
+    assert reused["summoning_stats"]["total_cost"] == 0.0
+
+    # The reused summoning is stored by reference to the first one's stages
+    assert summoner.research_store.latest("agent_summoner", "agent_summoning")["data"] == reused
+    assert len(summoner.research_store.find(artifact_type="agent_evaluation")) == 1
+    report = summoner.get_reuse_report()
+    assert report["request_hits"] == 1 and report["calls_saved"] == 3 and report["hit_rate"] == 0.5
+
+
+def test_similar_analysis_reuses_discovery_and_evaluation(summoner):
+    summoner.summon_agent("Monitor competitor patent filings")
+    summoner.calls.clear()
+
+    result = summoner.summon_agent("Monitor new competitor patent filings weekly")
+
+    assert [cls for cls, _, _ in summoner.calls] == ["agent_analysis"]
+    assert result["reused_from"]["match"] == "analysis"
+    assert result["task_analysis"]["original_request"] == "Monitor new competitor patent filings weekly"
+    assert result["summoning_stats"]["research_queries"] == 1
+    assert len(summoner.research_store.find(artifact_type="agent_discovery")) == 1
+    assert summoner.research_store.latest("agent_summoner", "agent_summoning")["data"] == result
+
+
+def test_reuse_survives_restart_and_can_be_disabled(summoner, tmp_path):
+    summoner.summon_agent("Monitor competitor patent filings")
+
+    restarted = AgentSummoner(project_root=str(tmp_path))
+    restarted.researcher.perplexity_research = summoner.researcher.perplexity_research
+    calls = len(summoner.calls)
+    assert restarted.summon_agent("Track competitor patent filings")["reused_from"]["match"] == "request"
+    assert len(summoner.calls) == calls
+
+    fresh = restarted.summon_agent("Track competitor patent filings", reuse=False)
+    assert "reused_from" not in fresh
+    assert len(summoner.calls) == calls + 3
+
+
+def test_research_deltas_are_forwarded_while_streaming(summoner):
+    answer = summoner.researcher.perplexity_research
+
+    def streaming_research(query, model="sonar-pro", query_class="default", on_delta=None):
+        result = answer(query, model, query_class)
+        for line in result["response"]["choices"][0]["message"]["content"].splitlines(keepends=True):
+            on_delta(line)
+        return result
+
+    summoner.researcher.perplexity_research = streaming_research
+    deltas = []
+    summoner.on_research_delta = lambda query_class, text: deltas.append((query_class, text))
+
+    summoner.summon_agent("Monitor competitor patent filings")
+
+    assert [cls for cls, _ in deltas][0] == "agent_analysis"
+    assert {cls for cls, _ in deltas} == {"agent_analysis", "agent_discovery", "agent_evaluation"}
+    assert "".join(text for cls, text in deltas if cls == "agent_analysis") == FAKE_ANSWERS["agent_analysis"]
+
+
+def test_analysis_reuse_of_imported_legacy_summoning(summoner, tmp_path):
+    legacy = summoner.summon_agent("Monitor competitor patent filings")
+    fresh_root = tmp_path / "fresh"
+    (fresh_root / "logs").mkdir(parents=True)
+    legacy_dir = fresh_root / "research_data" / "agent_summoner"
+    legacy_dir.mkdir(parents=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    (legacy_dir / f"agent_summoning_{stamp}.json").write_text(json.dumps(legacy))
+
+    fresh = AgentSummoner(project_root=str(fresh_root))
+    fresh.researcher.perplexity_research = summoner.researcher.perplexity_research
+    assert fresh.research_store.import_json_files(fresh_root / "research_data")["imported"] == 1
+    summoner.calls.clear()
+
+    result = fresh.summon_agent("Monitor new competitor patent filings weekly")
+
+    assert [cls for cls, _, _ in summoner.calls] == ["agent_analysis"]
+    assert result["reused_from"]["match"] == "analysis"
+    assert fresh.research_store.latest("agent_summoner", "agent_summoning")["data"] == result
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the per-job Codex registry and the status snapshot it publishes
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from codex_jobs import JobRegistry
+from codex_monitor import CodexMonitor
+from codex_supervisor import CodexSupervisor
+
+
+def test_concurrent_jobs_keep_separate_state(tmp_path):
+    registry = JobRegistry(tmp_path / "logs")
+    registry.start("a", "build dashboard", tmp_path / "logs" / "codex_a.log", pid=1)
+    registry.start("b", "write report", tmp_path / "logs" / "codex_b.log", pid=2)
+    registry.progress("a", 40)
+    registry.progress("b", 70)
+
+    assert registry.get("a")["progress"] == 40
+    assert registry.get("b")["log_file"].endswith("codex_b.log")
+    assert {job["job_id"] for job in registry.active()} == {"a", "b"}
+
+    registry.finish("a")
+    assert registry.get("a")["state"] == "completed"
+    assert registry.get("a")["progress"] == 100
+    assert [job["job_id"] for job in registry.active()] == ["b"]
+    assert [job["job_id"] for job in registry.by_state("completed")] == ["a"]
+    assert [job["job_id"] for job in registry.recent(1)] == ["a"]
+
+
+def test_snapshot_lists_every_active_job(tmp_path):
+    monitor = CodexMonitor(project_root=str(tmp_path))
+    registry = monitor.job_registry
+    registry.start("a", "build dashboard", tmp_path / "logs" / "codex_a.log")
+    registry.start("b", "write report", tmp_path / "logs" / "codex_b.log")
+
+    status = monitor.check_status()
+    assert status["status"] == "RUNNING"
+    assert status["current_task"] == "write report"
+    assert [job["job_id"] for job in status["active_jobs"]] == ["b", "a"]
+
+    registry.finish("a")
+    registry.finish("b", "failed", exit_code=1)
+    status = monitor.check_status()
+    assert status["status"] == "FAILED"
+    assert status["active_jobs"] == []
+
+
+def test_cli_interrupt_only_overrides_active_jobs(tmp_path):
+    logs = tmp_path / "logs"
+    script = Path(__file__).parent / "codex_jobs.py"
+    registry = JobRegistry(logs)
+
+    def cli(job_id, *args):
+        env = dict(os.environ, CODEX_JOB_ID=job_id)
+        subprocess.run([sys.executable, str(script), str(logs), *args], check=True, env=env)
+
+    cli("done", "start", "task", str(logs / "codex_done.log"))
+    cli("done", "progress", "50")
+    assert registry.get("done")["progress"] == 50
+    cli("done", "finish", "completed")
+    cli("done", "interrupt")
+    assert registry.get("done")["state"] == "completed"
+
+    cli("killed", "start", "task", str(logs / "codex_killed.log"))
+    cli("killed", "interrupt")
+    assert registry.get("killed")["state"] == "interrupted"
+
+
+def test_supervisor_mirrors_jobs_into_registry(tmp_path):
+    (tmp_path / "logs").mkdir()
+    registry = JobRegistry(tmp_path / "logs")
+    supervisor = CodexSupervisor(tmp_path, max_concurrency=1, registry=registry,
+                                 command_factory=lambda job: [sys.executable, "-c", "raise SystemExit(2)"])
+
+    job_id = supervisor.submit("broken")["job_id"]
+    supervisor.wait(job_id, timeout=10)
+
+    job = registry.get(job_id)
+    assert job["state"] == "failed"
+    assert job["exit_code"] == 2
+    assert job["pid"] and job["cpu_seconds"] is not None
+    assert registry.active() == []
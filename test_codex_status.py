@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the atomic Codex status record, its watcher and CodexMonitor's use of it
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+import codex_monitor
+from codex_monitor import CodexMonitor
+from codex_status import CodexStatusStore, StatusWatcher
+
+
+def test_record_round_trip_is_atomic(tmp_path):
+    store = CodexStatusStore(tmp_path / "logs")
+    assert store.read() is None
+
+    store.write("RUNNING", current_task="build dashboard", log_file="codex_1.log", pid=42)
+    record = store.read()
+    assert record["status"] == "RUNNING"
+    assert record["current_task"] == "build dashboard"
+    assert record["pid"] == 42
+
+    store.write("COMPLETED", current_task="build dashboard")
+    assert store.read()["status"] == "COMPLETED"
+    # Atomic rename leaves no temp files behind
+    assert [p.name for p in (tmp_path / "logs").iterdir()] == ["codex_status.json"]
+
+
+def test_monitor_reads_log_path_without_scanning(tmp_path, monkeypatch):
+    monitor = CodexMonitor(project_root=str(tmp_path))
+    log_file = tmp_path / "logs" / "codex_20250101_000000.log"
+    monitor.job_registry.start("job-1", "sync partners", log_file)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("status checks must not scan the log directory")
+
+    monkeypatch.setattr(codex_monitor.glob, "glob", no_scan)
+    status = monitor.check_status()
+
+    assert status["is_running"] is True
+    assert status["current_task"] == "sync partners"
+    assert status["log_file"] == str(log_file)
+
+
+def test_monitor_falls_back_to_legacy_files(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    (logs / "codex_status").write_text("COMPLETED")
+    (logs / "codex_20250101_000000.log").write_text("done\n")
+
+    status = CodexMonitor(project_root=str(tmp_path)).check_status()
+
+    assert status["status"] == "COMPLETED"
+    assert status["log_file"].endswith("codex_20250101_000000.log")
+
+
+def test_watcher_pushes_changes(tmp_path):
+    store = CodexStatusStore(tmp_path / "logs")
+    watcher = StatusWatcher(store, poll_interval=0.05)
+    seen, changed = [], threading.Event()
+
+    def on_change(record):
+        if record:
+            seen.append(record["status"])
+            if record["status"] == "COMPLETED":
+                changed.set()
+
+    watcher.subscribe(on_change)
+    try:
+        store.write("RUNNING", current_task="write report")
+        store.write("COMPLETED", current_task="write report")
+        assert changed.wait(3)
+    finally:
+        watcher.stop()
+
+    assert watcher.backend in ("inotify", "poll")
+    assert seen[-1] == "COMPLETED"
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the shared Codex event hub behind the /api/codex-stream SSE endpoint
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from codex_monitor import CodexMonitor
+from codex_stream import CodexEventHub, StreamClient, format_sse
+
+
+def parse_sse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines() if not line.startswith(":"))
+    return fields.get("event"), json.loads(fields["data"]) if "data" in fields else None
+
+
+def next_event(stream, wanted, timeout=3):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        event, data = parse_sse(next(stream))
+        if event == wanted:
+            return data
+    raise AssertionError(f"no {wanted} event")
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    return CodexMonitor(project_root=str(tmp_path))
+
+
+def test_clients_share_one_watcher_and_receive_status_and_logs(monitor, tmp_path):
+    hub = CodexEventHub(monitor, log_poll_interval=0.05, keepalive_interval=0.2)
+    streams = [hub.stream() for _ in range(3)]
+    snapshots = [parse_sse(next(s)) for s in streams]
+    assert all(event == "snapshot" for event, _ in snapshots)
+    assert len(hub.clients) == 3
+    assert monitor.watcher is not None and len(monitor.watcher.subscribers) == 1
+
+    log = tmp_path / "logs" / "codex_20250101_000000.log"
+    monitor.job_registry.start("job-1", "build dashboard", log)
+    log.write_text("🤖 started\n")
+
+    for stream in streams:
+        status = next_event(stream, "status")
+        assert status["status"] == "RUNNING"
+        assert next_event(stream, "log")["data"] == "🤖 started\n"
+
+    for stream in streams:
+        stream.close()
+    assert not hub.clients
+
+
+def test_last_client_leaving_stops_the_status_watcher(monitor, tmp_path):
+    hub = CodexEventHub(monitor, log_poll_interval=0.05, keepalive_interval=0.2)
+    first = hub.stream()
+    next(first)
+    watcher_thread = monitor.watcher._thread
+    first.close()
+
+    assert monitor.watcher.subscribers == []
+    assert not watcher_thread.is_alive()
+
+    # The next dashboard to connect starts it again
+    second = hub.stream()
+    next(second)
+    monitor.job_registry.start("job-1", "build dashboard", tmp_path / "logs" / "codex_20250101_000000.log")
+    assert next_event(second, "status")["status"] == "RUNNING"
+    second.close()
+    assert monitor.watcher.subscribers == []
+
+
+def test_keepalive_when_idle(monitor):
+    hub = CodexEventHub(monitor, log_poll_interval=0.05, keepalive_interval=0.1)
+    stream = hub.stream()
+    next(stream)
+    assert next(stream) == ": keepalive\n\n"
+    stream.close()
+
+
+def test_slow_client_buffer_is_bounded_and_resyncs():
+    client = StreamClient(max_buffer=3)
+    for i in range(10):
+        client.push({"event": "log", "id": i, "data": {}})
+
+    assert len(client.events) == 3
+    assert client.dropped == 7
+    assert client.pop(timeout=0)["event"] == "resync"
+    assert client.pop(timeout=0) is None
+
+
+def test_format_sse():
+    message = format_sse("status", {"status": "RUNNING"}, 7)
+    assert message == 'id: 7\nevent: status\ndata: {"status": "RUNNING"}\n\n'
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the Codex job supervisor: admission limits, priority order, log streaming, cancellation and accounting
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from codex_monitor import CodexMonitor
+from codex_supervisor import CodexSupervisor
+
+
+def python_job(code):
+    """Command factory running `code` with the job's task string available as TASK"""
+    return lambda job: [sys.executable, "-c", f"TASK = {job.task!r}\n{code}"]
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "logs").mkdir()
+    return tmp_path
+
+
+def test_chatty_job_streams_to_log_without_deadlock(project):
+    # ~1 MB of output would fill an undrained pipe many times over
+    supervisor = CodexSupervisor(project, command_factory=python_job(
+        "import sys\nfor i in range(20000): print('x' * 50, i)\nsys.stderr.write('done\\n')"))
+
+    job = supervisor.wait(supervisor.submit("chatty")["job_id"], timeout=20)
+
+    assert job["state"] == "completed"
+    assert job["exit_code"] == 0
+    log = Path(job["log_file"]).read_text()
+    assert log.count("\n") == 20001
+    assert log.endswith("done\n")
+    assert job["cpu_seconds"] is not None and job["max_rss_kb"] > 0
+    assert job["wall_seconds"] > 0
+
+
+def test_concurrency_limit_and_priority_admission(project):
+    supervisor = CodexSupervisor(project, max_concurrency=1, command_factory=python_job(
+        "import time\ntime.sleep(0.3 if TASK == 'first' else 0.01)"))
+
+    first = supervisor.submit("first")
+    low = supervisor.submit("low", priority="low")
+    high = supervisor.submit("high", priority="high")
+    assert supervisor.stats()["running"] == 1
+    assert supervisor.get(low["job_id"])["state"] == "queued"
+
+    for job_id in (first["job_id"], low["job_id"], high["job_id"]):
+        supervisor.wait(job_id, timeout=10)
+    started = sorted(supervisor.list_jobs(), key=lambda job: job["started_at"])
+    assert [job["task"] for job in started] == ["first", "high", "low"]
+
+
+def test_failed_job_captures_exit_code(project):
+    supervisor = CodexSupervisor(project, command_factory=python_job("raise SystemExit(3)"))
+    job = supervisor.wait(supervisor.submit("broken")["job_id"], timeout=10)
+    assert job["state"] == "failed"
+    assert job["exit_code"] == 3
+
+
+def test_job_reaped_elsewhere_still_frees_its_slot(project, monkeypatch):
+    real_wait4 = os.wait4
+    calls = []
+
+    def reaped_elsewhere(pid, options):
+        # The first child is collected behind the supervisor's back, as Popen.poll would
+        if not calls:
+            os.waitpid(pid, 0)
+        calls.append(pid)
+        return real_wait4(pid, options)
+
+    monkeypatch.setattr(os, "wait4", reaped_elsewhere)
+    supervisor = CodexSupervisor(project, max_concurrency=1, command_factory=python_job("pass"))
+    first = supervisor.submit("first")
+    second = supervisor.submit("second")
+
+    job = supervisor.wait(first["job_id"], timeout=10)
+    assert job["state"] == "failed"
+    assert "Could not reap" in Path(job["log_file"]).read_text()
+    assert supervisor.wait(second["job_id"], timeout=10)["state"] == "completed"
+    assert supervisor.stats()["running"] == 0
+
+
+def test_cancel_running_and_queued_jobs(project):
+    supervisor = CodexSupervisor(project, max_concurrency=1, kill_grace_seconds=0.5,
+                                 command_factory=python_job("import time\ntime.sleep(30)"))
+    running = supervisor.submit("long")
+    queued = supervisor.submit("waiting")
+
+    assert supervisor.cancel(queued["job_id"])["success"]
+    assert supervisor.get(queued["job_id"])["state"] == "cancelled"
+
+    start = time.time()
+    assert supervisor.cancel(running["job_id"])["success"]
+    job = supervisor.wait(running["job_id"], timeout=5)
+    assert job["state"] == "cancelled"
+    assert time.time() - start < 5
+    assert supervisor.stats()["running"] == 0
+    assert not supervisor.cancel("missing")["success"]
+
+
+def test_monitor_enqueues_through_supervisor(project):
+    monitor = CodexMonitor(project_root=str(project))
+    monitor.supervisor = CodexSupervisor(project, command_factory=python_job("print('hello from', TASK)"))
+
+    result = monitor.trigger_background_task("write summary")
+    assert result["success"]
+    job = monitor.supervisor.wait(result["job_id"], timeout=10)
+    assert Path(job["log_file"]).read_text() == "hello from write summary\n"
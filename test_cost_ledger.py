@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test Sonar token/cost accounting and its daily aggregation
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.cost_ledger import CostLedger, load_prices
+from conftest import USAGE
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return CostLedger(tmp_path / "costs.sqlite3")
+
+
+def test_price_from_usage_and_table(ledger):
+    assert ledger.price("sonar-pro", {"prompt_tokens": 1_000_000, "completion_tokens": 0}) == pytest.approx(3.006)
+    assert ledger.price("sonar", {"prompt_tokens": 500, "completion_tokens": 500}) == pytest.approx(0.006)
+    # Unknown models fall back to whatever cost the API reported
+    assert ledger.price("new-model", {"cost": {"total_cost": 0.042}}) == 0.042
+    assert ledger.price("new-model", {}) == 0.0
+
+
+def test_prices_file_overrides_defaults(tmp_path, monkeypatch):
+    prices_file = tmp_path / "prices.json"
+    prices_file.write_text(json.dumps({"sonar": {"per_request": 0.0}, "custom": {"output_per_million": 2.0}}))
+    monkeypatch.setenv("SONAR_PRICES_FILE", str(prices_file))
+    prices = load_prices()
+    assert prices["sonar"] == {"input_per_million": 1.0, "output_per_million": 1.0, "per_request": 0.0}
+    assert prices["custom"] == {"output_per_million": 2.0}
+
+
+def test_calls_aggregate_into_daily_buckets(ledger):
+    today = time.time()
+    ledger.record("agent_summoner", "sonar-reasoning", "agent_analysis", USAGE, timestamp=today)
+    ledger.record("agent_summoner", "sonar-reasoning", "agent_analysis", USAGE, timestamp=today)
+    ledger.record("agent_summoner", "sonar-reasoning", "agent_analysis", USAGE, timestamp=today - DAY)
+    ledger.record("perplexity_sonar", "sonar-pro", "specialized_research", USAGE, timestamp=today)
+    ledger.record("agent_summoner", "sonar-reasoning", "agent_analysis", cached=True, saved_cost=0.01, timestamp=today)
+
+    assert ledger.conn.execute("SELECT COUNT(*) FROM usage_daily").fetchone()[0] == 3
+
+    by_template = {row["template"]: row for row in ledger.totals(("template",))}
+    analysis = by_template["agent_analysis"]
+    assert (analysis["calls"], analysis["cached_calls"], analysis["prompt_tokens"]) == (3, 1, 360)
+    assert analysis["cost"] == pytest.approx(3 * ledger.price("sonar-reasoning", USAGE))
+    assert analysis["saved_cost"] == 0.01
+
+    by_day = ledger.totals(("day",), agent="agent_summoner")
+    assert sorted(row["calls"] for row in by_day) == [1, 2]
+    # Most expensive first
+    assert [row["model"] for row in ledger.totals(("model",))] == ["sonar-reasoning", "sonar-pro"]
+
+    summary = ledger.summary(days=1)
+    assert summary["calls"] == 3
+    assert [row["template"] for row in summary["top_templates"]] == ["agent_analysis", "specialized_research"]
+
+
+def test_research_calls_are_booked_and_cache_hits_cost_nothing(agent, stub_server):
+    first = agent.perplexity_research("xylella vector control", query_class="regulatory")
+    repeat = agent.perplexity_research("xylella vector control", query_class="regulatory")
+
+    assert first["usage"] == USAGE
+    assert first["cost"] == round(agent.cost_ledger.price("sonar-pro", USAGE), 6)
+    assert repeat["cost"] == 0.0
+
+    row, = agent.cost_ledger.totals(("agent", "model", "template"))
+    assert (row["agent"], row["model"], row["template"]) == ("perplexity_sonar", "sonar-pro", "regulatory")
+    assert (row["calls"], row["cached_calls"]) == (1, 1)
+    assert row["saved_cost"] == first["cost"]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test in-process log tailing and cursor-based incremental reads
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from codex_monitor import CodexMonitor
+from log_tailer import LogTailer
+
+
+def write_lines(path, start, stop, mode="a"):
+    with open(path, mode) as f:
+        for i in range(start, stop):
+            f.write(f"line {i} {'x' * (i % 7)}\n")
+
+
+def test_tail_matches_last_lines_across_blocks(tmp_path):
+    log = tmp_path / "codex_1.log"
+    write_lines(log, 0, 500, "w")
+    tailer = LogTailer(block_size=64)
+
+    expected = log.read_text().splitlines(keepends=True)
+    assert tailer.tail(log, 20) == "".join(expected[-20:])
+    assert tailer.tail(log, 1000) == "".join(expected)
+    assert tailer.tail(log, 0) == ""
+
+
+def test_read_since_returns_only_new_complete_lines(tmp_path):
+    log = tmp_path / "codex_1.log"
+    write_lines(log, 0, 3, "w")
+    tailer = LogTailer()
+
+    first = tailer.read_since(log, 0)
+    assert first["data"].count("\n") == 3
+
+    with open(log, "a") as f:
+        f.write("line 3\nhalf a li")
+    second = tailer.read_since(log, first["offset"], first["file_id"])
+    assert second["data"] == "line 3\n"
+    assert second["reset"] is False
+
+    with open(log, "a") as f:
+        f.write("ne\n")
+    third = tailer.read_since(log, second["offset"], second["file_id"])
+    assert third["data"] == "half a line\n"
+    assert third["offset"] == os.path.getsize(log)
+
+
+def test_rotation_and_truncation_reset_the_cursor(tmp_path):
+    log = tmp_path / "codex_1.log"
+    write_lines(log, 0, 10, "w")
+    tailer = LogTailer()
+    cursor = tailer.read_since(log, 0)
+
+    # Rotation: a new file replaces the old one under the same name
+    os.rename(log, tmp_path / "codex_1.log.1")
+    write_lines(log, 100, 102, "w")
+    rotated = tailer.read_since(log, cursor["offset"], cursor["file_id"])
+    assert rotated["reset"] is True
+    assert rotated["data"].startswith("line 100")
+
+    # Truncation in place
+    log.write_text("fresh\n")
+    truncated = tailer.read_since(log, rotated["offset"], rotated["file_id"])
+    assert truncated["reset"] is True
+    assert truncated["data"] == "fresh\n"
+
+
+def test_handle_cache_is_bounded(tmp_path):
+    tailer = LogTailer(max_handles=2)
+    for i in range(4):
+        log = tmp_path / f"codex_{i}.log"
+        write_lines(log, 0, 2, "w")
+        tailer.tail(log, 1)
+    assert len(tailer.handles) == 2
+    tailer.close()
+    assert not tailer.handles
+
+
+def test_monitor_log_cursor_uses_status_record(tmp_path):
+    monitor = CodexMonitor(project_root=str(tmp_path))
+    log = tmp_path / "logs" / "codex_20250101_000000.log"
+    monitor.job_registry.start("job-1", "build api", log)
+    write_lines(log, 0, 30, "w")
+
+    initial = monitor.read_log_since(lines=5)
+    assert initial["data"].count("\n") == 5
+    assert monitor.get_log_tail(5) == initial["data"]
+
+    write_lines(log, 30, 32)
+    update = monitor.read_log_since(initial["offset"], initial["file_id"])
+    assert update["data"].startswith("line 30")
+    assert update["log_file"] == str(log)
+
+
+def test_tail_cursor_holds_back_a_line_being_written(tmp_path):
+    log = tmp_path / "codex_1.log"
+    write_lines(log, 0, 5, "w")
+    with open(log, "a") as f:
+        f.write("half a li")
+    tailer = LogTailer(block_size=16)
+
+    assert tailer.tail(log, 2).endswith("half a li")
+    cursor = tailer.tail_with_cursor(log, 2)
+    assert cursor["data"] == "".join(log.read_text().splitlines(keepends=True)[3:5])
+    assert cursor["offset"] == os.path.getsize(log) - len("half a li")
+
+    with open(log, "a") as f:
+        f.write("ne\n")
+    follow = tailer.read_since(log, cursor["offset"], cursor["file_id"])
+    assert follow["data"] == "half a line\n"
+
+    # Zero lines still positions the cursor at the start of the partial line
+    with open(log, "a") as f:
+        f.write("another part")
+    assert tailer.tail_with_cursor(log, 0)["offset"] == os.path.getsize(log) - len("another part")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test Mission Control worker processes draining the shared task store
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from mission_control import EnhancedMissionControl
+from mission_worker import MissionWorker, run_fleet
+
+
+@pytest.fixture
+def fake_agents(monkeypatch, tmp_path):
+    """Replace in-process agent runs with a record of (pid, worker, agent, task_type)"""
+    record = tmp_path / "runs.txt"
+
+    def run_agent(self, agent, task):
+        if task.get("payload", {}).get("explode"):
+            raise RuntimeError("agent crashed")
+        time.sleep(0.01)
+        with open(record, "a") as f:
+            f.write(f"{os.getpid()} {self.worker_id} {agent} {task['task_id']}\n")
+        return {"executive_summary": {"task": task["task_type"]}}
+
+    monkeypatch.setattr(MissionWorker, "_run_agent", run_agent)
+    return lambda: [line.split() for line in record.read_text().splitlines()] if record.exists() else []
+
+
+def test_routing_uses_core_agent_capabilities(tmp_path, make_task):
+    worker = MissionWorker(tmp_path)
+    assert worker.route(make_task("market_intelligence", "competitor_analysis")) == "market_intelligence"
+    assert worker.route(make_task("summoned_agent", "compliance_tracking")) == "eu_regulations"
+    assert worker.route(make_task("summoned_agent", "unknown")) is None
+    assert MissionWorker(tmp_path, agents=["codex", "eu_regulations"]).agents == ["eu_regulations"]
+
+
+def test_worker_drains_coordinator_queue(tmp_path, fake_agents):
+    (tmp_path / "logs").mkdir()
+    mc = EnhancedMissionControl(project_root=str(tmp_path))
+    mc.worker_mode = True
+    mc.coordinate_research_agents(["xylella"])
+    mc.coordinate_codex_jules_pipeline("dashboard")
+    mc.execute_task_queue()
+    assert mc.task_store.counts() == {"pending": 5}
+
+    stats = MissionWorker(tmp_path, worker_id="w1", poll_interval=0.01).run(drain=True)
+    assert stats["completed"] == 3
+    assert sorted(run[2] for run in fake_agents()) == ["eu_regulations", "market_intelligence", "perplexity_sonar"]
+
+    done = mc.task_store.tasks(("done",))
+    assert {task["task_type"] for task in done} == {"advanced_research", "competitor_analysis", "regulatory_monitoring"}
+    # Codex and Jules are not in-process agents, so their tasks stay queued for the coordinator
+    assert {task["agent"] for task in mc.task_store.tasks(("pending",))} == {"codex", "jules"}
+
+
+def test_failed_runs_are_retried_then_marked_failed(tmp_path, fake_agents, make_task):
+    worker = MissionWorker(tmp_path, poll_interval=0.01)
+    task = make_task("perplexity_sonar", "research", payload={"explode": True})
+    worker.task_store.enqueue(task)
+
+    worker.run(drain=True)
+    assert worker.stats["failed"] == worker.task_store.max_attempts
+    failed = worker.task_store.tasks(("failed",))
+    assert failed[0]["error"] == "agent crashed"
+
+
+def test_blocked_tasks_are_released(tmp_path, fake_agents, make_task):
+    worker = MissionWorker(tmp_path, poll_interval=0.01)
+    worker.task_store.enqueue(make_task("eu_regulations", "regulatory_monitoring", ["competitor_analysis"]))
+    assert worker.run_once() == 0
+    assert worker.task_store.tasks(("pending",))[0]["attempts"] == 0
+
+    worker.task_store.enqueue(make_task("market_intelligence", "competitor_analysis"))
+    worker.run(drain=True)
+    assert worker.task_store.counts() == {"done": 2}
+
+
+def test_tasks_behind_a_failed_dependency_are_blocked(tmp_path, fake_agents, make_task):
+    worker = MissionWorker(tmp_path, poll_interval=0.01)
+    worker.task_store.enqueue(make_task("market_intelligence", "competitor_analysis", payload={"explode": True}))
+    worker.task_store.enqueue(make_task("eu_regulations", "regulatory_monitoring", ["competitor_analysis"]))
+    worker.task_store.enqueue(make_task("eu_regulations", "compliance_tracking"))
+
+    stats = worker.run(drain=True)
+    assert stats["blocked"] == 1 and stats["completed"] == 1
+    assert worker.task_store.counts() == {"blocked": 1, "done": 1, "failed": 1}
+    blocked = worker.task_store.tasks(("blocked",))[0]
+    assert blocked["error"] == "dependency failed: competitor_analysis"
+    assert blocked["attempts"] == 0
+    assert worker.task_store.task_types(("done", "failed")) == {"competitor_analysis", "compliance_tracking"}
+    # Nothing is left to lease, so a later pass does no work at all
+    assert worker.run_once() == 0
+
+
+def test_earlier_done_work_does_not_satisfy_newly_queued_dependencies(tmp_path, fake_agents, make_task):
+    worker = MissionWorker(tmp_path, poll_interval=0.01)
+    worker.task_store.enqueue(make_task("market_intelligence", "competitor_analysis"))
+    worker.run(drain=True)
+
+    worker.task_store.enqueue(make_task("eu_regulations", "regulatory_monitoring", ["competitor_analysis"]))
+    worker.task_store.enqueue(make_task("market_intelligence", "competitor_analysis"))
+    # The regulatory task must wait for the new analysis, not the one left over from before
+    assert MissionWorker(tmp_path, agents=["eu_regulations"]).run_once() == 0
+
+    worker.run(drain=True)
+    assert [run[2] for run in fake_agents()] == ["market_intelligence", "market_intelligence", "eu_regulations"]
+    assert worker.task_store.counts() == {"done": 3}
+
+
+def test_concurrent_workers_never_run_a_task_twice(tmp_path, fake_agents, make_task):
+    store = MissionWorker(tmp_path).task_store
+    store.enqueue_many(make_task("market_intelligence", "market_trends") for _ in range(30))
+
+    workers = [MissionWorker(tmp_path, worker_id=f"w{i}", poll_interval=0.01) for i in range(4)]
+    threads = [threading.Thread(target=worker.run, kwargs={"drain": True}) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    task_ids = [run[3] for run in fake_agents()]
+    assert len(task_ids) == len(set(task_ids)) == 30
+    assert store.counts() == {"done": 30}
+
+
+def test_fleet_spreads_work_across_processes(tmp_path, fake_agents, make_task):
+    store = MissionWorker(tmp_path).task_store
+    store.enqueue_many(make_task("eu_regulations", "compliance_tracking") for _ in range(12))
+
+    assert run_fleet(tmp_path, processes=2, drain=True) == [0, 0]
+    runs = fake_agents()
+    assert len({run[3] for run in runs}) == 12
+    assert store.counts() == {"done": 12}
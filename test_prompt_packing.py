@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test stage-to-stage prompt packing for the Agent Summoner
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from prompt_packing import compact_prompt, estimate_tokens, pack_fields, pack_sections, split_sections
+from test_agent_summoner_pipeline import summoner  # noqa: F401 (fixture)
+
+FILLER = "\n".join(f"- Platform {i}: hosted model serving with dashboards, alerting and SLA tiers" for i in range(60))
+
+DISCOVERY_ANSWER = f"""## 1. Existing AI Agents
+{FILLER}
+**2. API SERVICES:** Lens.org API, EPO OPS
+4. INTEGRATION METHODS:
+- Poll the Lens.org API nightly
+- Poll the Lens.org API nightly
+5. Cost: about $50/month
+7. RECOMMENDATIONS:
+1. Use PatentBot for alerts
+2. Combine Lens.org with weekly digests
+"""
+
+
+def test_heading_styles_are_recognised():
+    _, sections = split_sections(DISCOVERY_ANSWER)
+    assert set(sections) == {"agents", "apis", "integration", "cost", "recommendations"}
+    assert sections["apis"] == ["Lens.org API, EPO OPS"]
+    assert sections["cost"] == ["about $50/month"]
+
+    # A list item that merely starts with a section word is not a heading
+    _, sections = split_sections("RECOMMENDATIONS:\n- Cost is low for the basic tier\n")
+    assert sections == {"recommendations": ["- Cost is low for the basic tier"]}
+
+
+def test_late_sections_survive_and_duplicates_are_dropped():
+    assert DISCOVERY_ANSWER.index("RECOMMENDATIONS") > 2000
+    packed = pack_sections(DISCOVERY_ANSWER, ["recommendations", "integration", "cost", "agents"], 200)
+
+    assert packed.startswith("RECOMMENDATIONS:\n1. Use PatentBot for alerts")
+    assert packed.count("Poll the Lens.org API nightly") == 1
+    assert "COST ESTIMATES:\nabout $50/month" in packed
+    assert "EXISTING AI AGENTS:" in packed
+    assert estimate_tokens(packed) + packed.count("\n") <= 200
+
+
+def test_unstructured_text_falls_back_to_deduped_lines():
+    text = "PatentBot tracks filings\n\nPatentBot tracks filings!\n" + "more words here " * 200
+    packed = pack_sections(text, ["recommendations"], 40)
+    assert packed.splitlines()[0] == "PatentBot tracks filings"
+    assert packed.endswith(" …")
+    assert estimate_tokens(packed) <= 40
+
+
+def test_fields_skip_placeholders_and_repeats():
+    packed = pack_fields([("DOMAIN", "Patents"), ("TASK TYPE", "Not specified"), ("COMPLEXITY", None),
+                          ("REQUIREMENTS", "patents")], 100)
+    assert packed == "DOMAIN: Patents"
+    assert compact_prompt("\n    Line one\n\n\n    Line two\n    ") == "Line one\n\nLine two"
+
+
+def test_evaluation_query_is_packed(summoner):
+    discovery = {"discovery_content": DISCOVERY_ANSWER,
+                 "task_analysis": {"domain": "Patents", "complexity": "6", "resources": "Not specified"}}
+    query = summoner._build_evaluation_query(discovery)
+
+    assert "Use PatentBot for alerts" in query
+    assert "Resources" not in query
+    assert "Platform 59" not in query
+    discovered = query.split("DISCOVERED AGENTS:\n")[1].split("\n\nTASK REQUIREMENTS:")[0]
+    assert estimate_tokens(discovered) + discovered.count("\n") <= summoner.evaluation_context_budget
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the shared adaptive rate limiter, backoff and circuit breaker
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.rate_limiter import (AdaptiveRateLimiter, CircuitBreaker, backoff_delay, breaker_for,
+                                 limiter_for, parse_delay, reset_limits)
+
+
+def test_parse_delay_formats():
+    assert parse_delay("2") == 2.0
+    assert parse_delay("1m30s") == 90.0
+    assert parse_delay("250ms") == 0.25
+    assert parse_delay("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_delay("soon") is None
+    assert parse_delay(None) is None
+
+
+def test_backoff_is_jittered_capped_and_respects_retry_after():
+    delays = [backoff_delay(5, base=0.5, cap=4.0) for _ in range(200)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert backoff_delay(0, retry_after=3.0) == 3.0
+
+
+def test_limiter_paces_threads_and_event_loops_from_one_budget():
+    limiter = AdaptiveRateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+
+    async def fire():
+        await asyncio.gather(*[limiter.acquire_async() for _ in range(2)])
+
+    asyncio.run(fire())
+    for thread in threads:
+        thread.join()
+
+    assert time.monotonic() - start >= 4 / 20 - 0.02
+    assert limiter.stats()["acquired"] == 5
+
+
+def test_throttling_halves_rate_and_success_recovers_to_ceiling():
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=1, increase=0.5)
+    limiter.on_throttled(retry_after=0.2)
+    assert limiter.rate == 1.0
+    assert limiter.reserve() >= 0.15
+
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.rate == 2.0
+
+
+def test_headers_set_ceiling_and_pause_when_exhausted():
+    limiter = AdaptiveRateLimiter(rate=5.0, burst=5)
+    limiter.on_success({"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0",
+                        "x-ratelimit-reset-requests": "300ms"})
+
+    assert limiter.max_rate == limiter.rate == 1.0
+    assert 0.2 <= limiter.reserve() <= 0.3
+
+
+def test_circuit_breaker_opens_then_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial while half-open
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_registry_shares_limits_per_key_and_model():
+    reset_limits()
+    assert limiter_for("key", "sonar") is limiter_for("key", "sonar", rate=50)
+    assert limiter_for("key", "sonar") is not limiter_for("key", "sonar-pro")
+    assert limiter_for("key", "sonar") is not limiter_for("other", "sonar")
+    assert breaker_for("key") is breaker_for("key")
+    reset_limits()
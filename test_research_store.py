@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test the indexed research-data store and the legacy JSON importer
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.research_store import ResearchStore, ref
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResearchStore(tmp_path / "research_data" / "research_store.sqlite3")
+
+
+def test_put_get_and_catalog_queries(store):
+    base = 1_757_000_000
+    first = store.put("market_intelligence", "competitor_scan", {"competitors": ["a"]}, created_at=base)
+    second = store.put("market_intelligence", "competitor_scan", {"competitors": ["a", "b"]}, created_at=base + DAY)
+    store.put("agent_summoner", "agent_discovery", {"discovery_content": "x" * 5000},
+              domain="Agricultural biotechnology", query="Track  patent filings", created_at=base + DAY)
+
+    latest = store.latest("market_intelligence", "competitor_scan")
+    assert latest["id"] == second
+    assert latest["data"] == {"competitors": ["a", "b"]}
+    assert store.get(first) == {"competitors": ["a"]}
+    assert store.get(999) is None
+
+    # Catalog queries carry metadata only
+    in_range = store.find(since=base, until=base + DAY / 2)
+    assert [entry["id"] for entry in in_range] == [first]
+    assert "data" not in in_range[0]
+
+    discovery, = store.find(domain="agricultural BIOTECHNOLOGY", query="track patent filings")
+    assert discovery["stored_size"] < discovery["size"] / 10
+    assert store.find(domain="Regulatory affairs") == []
+    assert store.stats()["artifacts"] == 3
+
+
+def test_references_resolve_and_transactions_roll_back(store):
+    analysis = store.put("agent_summoner", "task_analysis", {"domain": "Patents"})
+    discovery = store.put("agent_summoner", "agent_discovery", {"task_analysis": ref(analysis), "text": "x"})
+    summoning = store.put("agent_summoner", "agent_summoning",
+                          {"task_analysis": ref(analysis), "agent_discovery": ref(discovery), "runs": [ref(analysis)]})
+
+    data = store.get(summoning)
+    assert data["agent_discovery"] == {"task_analysis": {"domain": "Patents"}, "text": "x"}
+    assert data["agent_discovery"]["task_analysis"] is data["task_analysis"] is data["runs"][0]
+    assert store.get(summoning, resolve=False)["task_analysis"] == {"$ref": analysis}
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.put("agent_summoner", "task_analysis", {}, domain="Lost")
+            raise RuntimeError("stage failed")
+    assert store.find(domain="Lost") == [] and len(store.find()) == 3
+
+
+def test_import_legacy_json_files(store, tmp_path):
+    research_root = tmp_path / "research_data"
+    (research_root / "agent_summoner").mkdir()
+    (research_root / "market_intelligence").mkdir()
+    evaluation = {"agent_discovery": {"task_analysis": {"domain": "Patents", "original_request": "Track patents"}}}
+    (research_root / "agent_summoner" / "agent_evaluation_20250906_161031.json").write_text(json.dumps(evaluation, indent=2))
+    (research_root / "market_intelligence" / "market_brief_20250906.json").write_text(json.dumps({"date": "2025-09-06"}))
+    (research_root / "market_intelligence" / "notes.json").write_text("{}")
+    (research_root / "market_intelligence" / "broken_20250906.json").write_text("{not json")
+
+    stats = store.import_json_files(research_root)
+    assert (stats["imported"], stats["skipped"], stats["failed"]) == (2, 1, 1)
+
+    entry = store.latest("agent_summoner", "agent_evaluation", domain="Patents", query="track patents")
+    assert entry["data"] == evaluation
+    assert entry["source"] == "agent_summoner/agent_evaluation_20250906_161031.json"
+    assert store.latest("market_intelligence", "market_brief")["data"] == {"date": "2025-09-06"}
+
+    # Re-running only picks up new files
+    assert store.import_json_files(research_root, remove=True)["imported"] == 0
+    assert (research_root / "market_intelligence" / "market_brief_20250906.json").exists()
+
+
+def test_agents_write_through_the_store(tmp_path):
+    from agents.research_agent_eu_regulations import EURegulationsAgent
+
+    (tmp_path / "logs").mkdir()
+    agent = EURegulationsAgent(project_root=str(tmp_path))
+    agent.track_plant_protection_regulations()
+
+    assert agent.research_store.latest("eu_regulations", "regulations_scan")["data"]["regulation_updates"] == []
+    assert list((tmp_path / "research_data" / "eu_regulations").glob("*.json")) == []
+
+
+def test_search_ranks_filters_and_snippets(store):
+    store.put("perplexity_sonar", "specialized_research", {
+        "query": "EFSA approval timeline?",
+        "regulatory_pathway": {"model": "sonar-pro", "response": {"choices": [{"message": {
+            "content": "Registration goes through EFSA peer review. EFSA then issues its conclusion; "
+                       "phosphinic acid derivatives need a full dossier."}}]}}
+    }, created_at="2025-09-01")
+    store.put("eu_regulations", "daily_brief", {"recommendations": ["Track the EFSA-led regulatory review"]},
+              created_at="2025-09-06")
+    store.put("market_intelligence", "competitor_scan", {"notes": "No regulatory news this week"},
+              created_at="2025-09-06")
+
+    hits = store.search("EFSA")
+    assert {hit["agent"] for hit in hits} == {"perplexity_sonar", "eu_regulations"}
+    assert [hit["score"] for hit in hits] == sorted((hit["score"] for hit in hits), reverse=True)
+    answer = next(hit for hit in hits if hit["agent"] == "perplexity_sonar")
+    assert (answer["field"], answer["model"]) == ("regulatory_pathway.response.choices.message.content", "sonar-pro")
+    assert "[EFSA]" in answer["snippet"]
+    # Porter stemming plus punctuation-safe query parsing
+    assert {hit["agent"] for hit in store.search("reviews EFSA-led")} == {"eu_regulations"}
+    assert len(store.search("phosphin* OR competitor")) == 1
+    # The prompt is not indexed, only the answer
+    assert store.search("timeline") == []
+
+    assert [hit["agent"] for hit in store.search("EFSA", model="sonar-pro")] == ["perplexity_sonar"]
+    assert [hit["agent"] for hit in store.search("EFSA", since="2025-09-05")] == ["eu_regulations"]
+    assert store.search("EFSA", agent="market_intelligence") == []
+    assert store.search("  ") == []
+
+
+def test_artifacts_from_older_stores_are_indexed_once(store):
+    artifact_id = store.put("eu_regulations", "horizon_scan", {"summary": "Horizon Europe plant health call"})
+    store.conn.execute("DELETE FROM artifact_text")
+    store.conn.execute("UPDATE artifacts SET indexed = 0")
+    assert store.search("Horizon") == []
+
+    assert store.index_pending() == 1
+    assert store.index_pending() == 0
+    assert [hit["id"] for hit in store.search("plant health")] == [artifact_id]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the single-pass Sonar response section parser and the summoner extractors built on it
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from response_sections import SectionParser, parse_sections, section_key
+from test_agent_summoner_pipeline import summoner  # noqa: F401 (fixture)
+
+ANALYSIS = """Here is the analysis.
+1. DOMAIN: Agricultural biotechnology
+**2. Task Type:** Monitoring
+### Complexity
+7
+- **Required Capabilities:** patent search, alerting
+- Constraints: this bullet is prose inside the capabilities list
+SUCCESS_CRITERIA:
+Weekly digest delivered
+"""
+
+
+def test_heading_styles_map_to_sections():
+    sections = parse_sections(ANALYSIS)
+    assert sections.preamble == ("Here is the analysis.",)
+    assert sections.field("domain") == "Agricultural biotechnology"
+    assert sections.field("task_type") == "Monitoring"
+    assert sections.field("complexity") == "7"
+    assert sections.lines("capabilities") == ("patent search, alerting",
+                                              "- Constraints: this bullet is prose inside the capabilities list")
+    assert sections.field("success_criteria") == "Weekly digest delivered"
+    assert sections.field("resources") == "Not specified"
+    assert section_key("REQUIRED_CAPABILITIES") == section_key("capabilities") == "capabilities"
+
+
+def test_parse_is_cached_per_response():
+    assert parse_sections(ANALYSIS) is parse_sections(ANALYSIS)
+
+
+def test_incremental_feed_exposes_sections_before_the_end():
+    parser = SectionParser()
+    assert parser.feed("1. DOMAIN: Agri") == []
+    assert parser.feed("cultural biotechnology\n2. TASK") == []
+    # The domain line is complete, so its value can be read while the section is still open
+    assert parser.result().field("domain") == "Agricultural biotechnology"
+    assert parser.feed("_TYPE: Monitoring\n3. COMPLEXITY: 6") == ["domain"]
+    assert parser.close() == ["task_type", "complexity"]
+    assert parser.result().sections == parse_sections("1. DOMAIN: Agricultural biotechnology\n"
+                                                      "2. TASK_TYPE: Monitoring\n3. COMPLEXITY: 6").sections
+
+
+def test_summoner_extractors_read_the_section_map(summoner):
+    analysis = summoner._parse_analysis("Track patents", ANALYSIS)
+    assert (analysis["domain"], analysis["complexity"]) == ("Agricultural biotechnology", "7")
+    assert summoner._extract_field(ANALYSIS, "TASK_TYPE") == "Monitoring"
+
+    discovery = "7. RECOMMENDATIONS:\n1. Use PatentBot\n   with alerts\n2. Use Lens.org\n8. COST ESTIMATES: $50\n"
+    assert [r["description"] for r in summoner._parse_recommendations(discovery)] == [
+        "1. Use PatentBot with alerts", "2. Use Lens.org"]
+
+    evaluation = "**OPTIMAL CONFIGURATION:** PatentBot\nwith weekly alerts\n2. IMPLEMENTATION PLAN: later"
+    assert summoner._extract_recommended_action(evaluation) == "PatentBot with weekly alerts"
+    assert summoner._extract_recommended_action("no structure") == "Review full evaluation for recommendations"
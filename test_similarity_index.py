@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test the MinHash/LSH similarity index used for summoning reuse
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from similarity_index import SimilarityIndex, jaccard, shingles, tokens
+
+
+def test_tokens_fold_synonyms_plurals_and_stopwords():
+    assert tokens("Track the new EU regulatory changes") == ["monitor", "eu", "regulatory", "change"]
+    assert tokens("Watch policies") == ["monitor", "policy"]
+
+
+def test_paraphrases_match_and_unrelated_requests_do_not():
+    index = SimilarityIndex()
+    index.add("patents", "Monitor competitor patent filings in agricultural biotechnology")
+    index.add("eu", "Track EU regulatory changes for plant protection products")
+
+    matches = index.query("Track competitor patent filings in agricultural biotech", 0.6)
+    assert [key for key, _ in matches] == ["patents"]
+    assert 0.6 <= matches[0][1] < 1.0
+    assert index.query("Summarize quarterly sales figures", 0.3) == []
+
+
+def test_query_scores_are_exact_jaccard_and_sorted():
+    index = SimilarityIndex()
+    texts = {1: "monitor patent filings", 2: "monitor patent filings weekly", 3: "monitor patent filings weekly in europe"}
+    for key, text in texts.items():
+        index.add(key, text)
+
+    matches = index.query("monitor patent filings weekly", 0.0)
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+    for key, score in matches:
+        assert score == round(jaccard(shingles(texts[key]), shingles("monitor patent filings weekly")), 4)
+    assert len(index) == 3 and 2 in index
+    assert index.query("", 0.0) == []
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed Sonar response cache tiers and freshness rules
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.sonar_cache import ResponseCache, cache_key
+
+
+def payload(user="What is Xylella?", model="sonar-pro", temperature=0.2):
+    return {
+        "model": model,
+        "messages": [{"role": "system", "content": "sys"}, {"role": "user", "content": user}],
+        "max_tokens": 2000,
+        "temperature": temperature,
+        "top_p": 0.9
+    }
+
+
+def test_key_covers_request_parameters():
+    assert cache_key(payload()) == cache_key(payload())
+    assert cache_key(payload()) != cache_key(payload(model="sonar"))
+    assert cache_key(payload()) != cache_key(payload(temperature=0.7))
+    assert cache_key(payload()) != cache_key(payload(user="What is EFSA?"))
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    key = cache_key(payload())
+    ResponseCache(tmp_path / "cache.sqlite3").put(key, {"status": "success"}, cost=0.01)
+
+    reopened = ResponseCache(tmp_path / "cache.sqlite3")
+    assert reopened.get(key)["status"] == "success"
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get(key)["cached"] is True
+    assert reopened.stats()["memory_hits"] == 1
+    assert reopened.stats()["cost_saved"] == 0.02
+
+
+def test_ttl_is_applied_per_query_class(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttls={"volatile": 0, "stable": 3600})
+    key = cache_key(payload())
+    cache.put(key, {"status": "success"}, query_class="volatile")
+    time.sleep(0.01)
+
+    assert cache.get(key, "volatile") is None
+    assert cache.get(key, "stable") is not None
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_tier_is_lru_bounded(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", memory_size=2)
+    keys = [cache_key(payload(user=str(i))) for i in range(3)]
+    for key in keys:
+        cache.put(key, {"status": "success"})
+
+    assert list(cache.memory) == keys[1:]
+    assert cache.get(keys[0]) is not None  # still on disk
+    assert cache.stats()["disk_hits"] == 1
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test the pooled async Sonar client against the local stub chat-completions server (conftest.py)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.rate_limiter import breaker_for, limiter_for
+from agents.sonar_client import AsyncSonarClient
+from conftest import USAGE
+
+
+def test_specialized_queries_run_concurrently_within_limit(agent, stub_server):
+    agent.max_concurrency = 3
+
+    start = time.time()
+    results = agent.specialized_research_queries()
+    elapsed = time.time() - start
+
+    assert len(results) == 5
+    assert all(result["status"] == "success" for result in results.values())
+    assert len(stub_server.requests) == 5
+    assert stub_server.peak == 3
+    assert elapsed < 5 * stub_server.delay
+    # Keep-alive pool: never more connections than concurrency slots
+    assert len(stub_server.client_ports) <= 3
+
+
+def test_multi_model_fan_out_preserves_model_order(agent, stub_server):
+    synthesis = agent.multi_model_analysis("xylella treatment pipeline")
+
+    assert list(synthesis["individual_results"]) == agent.sonar_models
+    for model, result in synthesis["individual_results"].items():
+        assert result["model"] == model
+        assert result["response"]["model"] == model
+
+
+def test_token_bucket_paces_requests(stub_server):
+    stub_server.delay = 0
+    url = f"http://127.0.0.1:{stub_server.server_address[1]}/chat/completions"
+
+    async def fire():
+        async with AsyncSonarClient("k", api_url=url, max_concurrency=5,
+                                    requests_per_second=10, burst=1) as client:
+            return await asyncio.gather(*[client.chat_completion({"model": "sonar", "messages": [{"role": "user", "content": str(i)}]})
+                                          for i in range(5)])
+
+    start = time.time()
+    responses = asyncio.run(fire())
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert time.time() - start >= 0.35  # 4 refills at 10/s after the initial token
+
+
+def test_repeated_research_is_served_from_cache(agent, stub_server):
+    agent.specialized_research_queries()
+    assert len(stub_server.requests) == 5
+
+    repeat = agent.specialized_research_queries()
+    assert len(stub_server.requests) == 5
+    assert all(result.get("cached") for result in repeat.values())
+    assert {result["status"] for result in repeat.values()} == {"cached"}
+
+    stats = agent.cache.stats()
+    assert stats["hits"] == 5
+    assert stats["cost_saved"] == round(5 * agent.cost_ledger.price("sonar-pro", USAGE), 4)
+
+
+def test_throttled_request_is_retried_and_slows_the_shared_limiter(agent, stub_server):
+    stub_server.errors = [429, 503]
+
+    result = agent.perplexity_research("xylella vectors", model="sonar")
+
+    assert result["status"] == "success"
+    assert len(stub_server.requests) == 3
+    limiter = limiter_for("test-key", "sonar")
+    assert limiter.stats()["throttled"] == 1
+    assert limiter.rate < agent.requests_per_second
+
+
+def test_async_fan_out_retries_server_errors(agent, stub_server):
+    stub_server.errors = [502]
+
+    results = agent.research_many([("first", "sonar"), ("second", "sonar")])
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert len(stub_server.requests) == 3
+
+
+def test_persistent_failure_falls_back_and_opens_the_breaker(agent, stub_server):
+    agent.max_retries = 1
+    stub_server.errors = [500] * 6
+
+    results = [agent.perplexity_research(f"query {i}", model="sonar") for i in range(3)]
+
+    assert [r["status"] for r in results] == ["simulated"] * 3
+    assert results[0]["fallback_reason"] == "HTTP 500"
+    assert results[-1]["fallback_reason"] == "circuit open"
+    assert breaker_for("test-key").state == "open"
+    assert len(stub_server.requests) == 5
+
+
+def test_client_error_is_not_retried(agent, stub_server):
+    stub_server.errors = [400]
+
+    result = agent.perplexity_research("bad request", model="sonar")
+
+    assert result["status"] == "simulated"
+    assert result["fallback_reason"] == "HTTP 400"
+    assert len(stub_server.requests) == 1
+
+
+def test_fan_outs_reuse_the_pooled_connections(agent, stub_server):
+    agent.max_concurrency = 2
+    stub_server.delay = 0.05
+
+    for round_ in range(3):
+        agent.research_many([(f"round {round_} query {i}", "sonar") for i in range(4)])
+
+    assert len(stub_server.requests) == 12
+    assert len(stub_server.client_ports) <= 2
+
+    thread = agent._loop_thread
+    agent.close()
+    assert not thread.is_alive()
+
+
+def test_blocking_fan_out_refuses_a_running_loop(agent, stub_server):
+    async def inside_loop():
+        with pytest.raises(RuntimeError, match="research_many_async"):
+            agent.research_many([("query", "sonar")])
+        return await agent.research_many_async([("query", "sonar")])
+
+    assert asyncio.run(inside_loop())[0]["status"] == "success"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test streamed Sonar answers against the fake Sonar server (conftest.py) in event-stream mode
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.sonar_client import StreamAssembler, iter_sse_data
+from conftest import CITATIONS, PIECES, USAGE
+
+
+def test_sse_parser_handles_comments_multiline_data_and_done():
+    lines = [": ping", "", "event: message", "data: a", "data:b", "", "id: 3", "data: c", "", "data: [DONE]", "",
+             "data: ignored", ""]
+    assert list(iter_sse_data(lines)) == ["a\nb", "c", "[DONE]", "ignored"]
+    assert list(iter_sse_data([b"data: tail"])) == ["tail"]
+
+
+def test_assembler_accepts_cumulative_message_chunks():
+    assembler = StreamAssembler()
+    assert assembler.add({"choices": [{"message": {"content": "Hel"}}]}) == "Hel"
+    assert assembler.add({"choices": [{"message": {"content": "Hello"}, "finish_reason": "stop"}]}) == "lo"
+    assert assembler.response()["choices"][0] == {
+        "index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Hello"}}
+
+
+def test_deltas_arrive_before_the_answer_completes(agent, stub_server):
+    events = list(agent.iter_research("xylella vectors", model="sonar-reasoning", query_class="agent_analysis"))
+
+    deltas = [event for event in events if event["event"] == "delta"]
+    assert [event["text"] for event in deltas] == PIECES
+    assert events[-1]["event"] == "complete"
+    assert stub_server.requests[0]["stream"] is True
+
+    result = events[-1]["result"]
+    timing = result["timing"]
+    assert deltas[0]["elapsed_seconds"] < stub_server.delay / 2
+    assert timing["time_to_first_token_seconds"] < timing["total_seconds"]
+    assert timing["total_seconds"] >= stub_server.delay
+    assert result["usage"] == USAGE
+
+
+@pytest.mark.parametrize("streamed", [True, False])
+def test_streamed_and_plain_answers_have_the_same_shape(agent, stub_server, streamed):
+    on_delta = (lambda text: None) if streamed else None
+
+    result = agent.perplexity_research("xylella vectors", model="sonar-reasoning", on_delta=on_delta)
+
+    assert stub_server.requests[0].get("stream", False) is streamed
+    assert result["status"] == "success"
+    assert result["response"]["choices"][0]["message"]["content"] == "".join(PIECES)
+    assert result["response"]["citations"] == CITATIONS
+    # Usage is booked from the final chunk when streaming
+    assert result["usage"] == USAGE
+    assert result["cost"] == agent.cost_ledger.price("sonar-reasoning", USAGE)
+
+
+def test_callback_streaming_returns_the_assembled_result(agent, stub_server):
+    received = []
+    result = agent.perplexity_research("xylella vectors", model="sonar", on_delta=received.append)
+
+    assert "".join(received) == result["response"]["choices"][0]["message"]["content"] == "".join(PIECES)
+
+    # A repeat is answered from the cache as a single delta
+    received.clear()
+    repeat = agent.perplexity_research("xylella vectors", model="sonar", on_delta=received.append)
+    assert repeat["status"] == "cached"
+    assert received == ["".join(PIECES)]
+    assert len(stub_server.requests) == 1
+
+
+def test_errors_before_the_first_token_are_retried(agent, stub_server):
+    stub_server.errors = [429]
+
+    result = agent.perplexity_research("xylella vectors", model="sonar", on_delta=lambda text: None)
+
+    assert result["status"] == "success"
+    assert len(stub_server.requests) == 2
+
+
+@pytest.mark.parametrize("break_after, terminate", [(2, True), (None, False)])
+def test_interrupted_stream_returns_partial_answer_uncached(agent, stub_server, break_after, terminate):
+    stub_server.break_after = break_after
+    stub_server.terminate = terminate
+
+    events = list(agent.iter_research("xylella vectors", model="sonar"))
+
+    sent = "".join(event["text"] for event in events if event["event"] == "delta")
+    result = events[-1]["result"]
+    assert result["status"] == "partial"
+    assert result["fallback_reason"].startswith("stream interrupted")
+    assert result["response"]["choices"][0]["message"]["content"] == sent
+    assert sent == "".join(PIECES[:break_after])
+
+    # Never cached: asking again goes back to the API
+    agent.perplexity_research("xylella vectors", model="sonar", on_delta=lambda text: None)
+    assert len(stub_server.requests) == 2
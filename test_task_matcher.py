@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the shared keyword matcher and the callers built on it
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from task_matcher import MultiPatternMatcher
+from smart_task_detector import SmartTaskDetector
+
+
+def test_overlapping_terms_and_word_boundaries():
+    matcher = MultiPatternMatcher({"auth": ["user", "user authentication", "auth"], "ui": ["ui"]})
+
+    assert matcher.find_terms("Build user authentication") == {"user", "user authentication", "auth"}
+    assert matcher.find_terms("Build a new feedback form") == set()  # no "ui" inside "build"
+    assert matcher.find_terms("Users need a UI") == {"user", "ui"}
+    assert matcher.match("USER login")["auth"] == {"user"}
+    assert not matcher.contains_any("rebuild guidance")
+
+
+def test_empty_table_matches_nothing():
+    matcher = MultiPatternMatcher({})
+
+    assert matcher.find_terms("anything") == set()
+    assert not matcher.contains_any("anything")
+
+
+def test_detector_scores_with_compiled_matcher():
+    detector = SmartTaskDetector()
+    analysis = detector.analyze_task_complexity(
+        "Create a complete user authentication system with an analytics dashboard and email alerts"
+    )
+
+    patterns = {p["pattern"]: p for p in analysis["matched_patterns"]}
+    assert set(patterns) == {"authentication", "dashboard", "notification", "full_system"}
+    assert patterns["authentication"]["keyword_matches"] == 2  # "user", "auth"
+    assert patterns["authentication"]["phrase_matches"] == 1
+    assert patterns["dashboard"]["phrase_matches"] == 1
+    assert analysis["has_action_verb"]
+    assert analysis["should_delegate"]
+    assert analysis["complexity_score"] == 3 + 3 + 2 + 5 + 1
+
+
+def test_detector_tables_can_grow():
+    detector = SmartTaskDetector()
+    detector.complex_patterns["genomics"] = {"keywords": ["genome"], "phrases": [], "complexity": "high"}
+    detector.build_matcher()
+
+    analysis = detector.analyze_task_complexity("build genome pipeline")
+    assert [p["pattern"] for p in analysis["matched_patterns"]] == ["genomics"]
+
+
+def test_batch_matches_scalar_path():
+    detector = SmartTaskDetector()
+    texts = [
+        "Create a complete user authentication system with an analytics dashboard and email alerts",
+        "What is the Stage 1 deadline?",
+        "",
+        "deploy rest api with postgres database schema and jwt login for the entire application " * 3,
+        "Configure webhook notification system"
+    ]
+
+    assert detector.analyze_batch(texts) == [detector.analyze_task_complexity(text) for text in texts]
+    arrays = detector.analyze_batch_arrays(texts)
+    assert arrays["should_delegate"].tolist() == [True, False, False, True, True]
+    assert detector.analyze_batch([]) == []
+
+
+def test_find_terms_batch_matches_find_terms():
+    matcher = SmartTaskDetector().matcher
+    texts = ["Create users and user management", "", "no terms here", "REST api, rest apis\nand a login system"]
+
+    rows, columns = matcher.find_terms_batch(texts)
+    found = [set() for _ in texts]
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        found[row].add(matcher.vocabulary[column])
+
+    assert found == [matcher.find_terms(text) for text in texts]
+    assert sorted(zip(rows.tolist(), columns.tolist())) == list(zip(rows.tolist(), columns.tolist()))
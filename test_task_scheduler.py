@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the concurrent DAG scheduler used by Mission Control's task queue
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from task_scheduler import TaskScheduler
+
+
+def test_independent_tasks_finish_in_max_time(make_task):
+    tasks = [
+        make_task("perplexity_sonar", "advanced_research", duration=0.4),
+        make_task("market_intelligence", "competitor_analysis", duration=0.2),
+        make_task("eu_regulations", "regulatory_monitoring", duration=0.3)
+    ]
+    scheduler = TaskScheduler(lambda task: time.sleep(task["duration"]), max_workers=4)
+
+    start = time.time()
+    outcome = scheduler.run(tasks)
+    elapsed = time.time() - start
+
+    assert len(outcome["completed"]) == 3
+    assert elapsed < 0.75  # sum() would be 0.9s, max() is 0.4s
+
+
+def test_dependents_start_when_prerequisites_finish(make_task):
+    order = []
+    lock = threading.Lock()
+
+    def execute(task):
+        time.sleep(task["duration"])
+        with lock:
+            order.append(task["task_type"])
+
+    tasks = [
+        make_task("jules", "development", dependencies=["browser_automation"], duration=0.05),
+        make_task("codex", "browser_automation", duration=0.05),
+        make_task("perplexity_sonar", "advanced_research", duration=0.5)
+    ]
+    start = time.time()
+    outcome = TaskScheduler(execute, max_workers=4).run(tasks)
+
+    assert order.index("browser_automation") < order.index("development")
+    # Development must not wait for the unrelated long research task
+    assert order.index("development") < order.index("advanced_research")
+    assert len(outcome["completed"]) == 3
+    assert time.time() - start < 0.9
+
+
+def test_per_agent_concurrency_limit(make_task):
+    active = {"codex": 0}
+    peak = {"codex": 0}
+    lock = threading.Lock()
+
+    def execute(task):
+        with lock:
+            active[task["agent"]] += 1
+            peak[task["agent"]] = max(peak[task["agent"]], active[task["agent"]])
+        time.sleep(0.05)
+        with lock:
+            active[task["agent"]] -= 1
+
+    tasks = [make_task("codex", f"job_{i}") for i in range(4)]
+    TaskScheduler(execute, max_workers=4, agent_limits={"codex": 2}).run(tasks)
+
+    assert peak["codex"] == 2
+
+
+def test_unmet_and_failed_dependencies_are_blocked(make_task):
+    def execute(task):
+        if task["task_type"] == "broken":
+            raise RuntimeError("agent crashed")
+
+    tasks = [
+        make_task("codex", "broken", duration=0),
+        make_task("jules", "after_broken", dependencies=["broken"], duration=0),
+        make_task("jules", "orphan", dependencies=["never_queued"], duration=0)
+    ]
+    outcome = TaskScheduler(execute).run(tasks)
+
+    assert [t["task_type"] for t in outcome["failed"]] == ["broken"]
+    assert sorted(t["task_type"] for t in outcome["blocked"]) == ["after_broken", "orphan"]
+
+
+def test_history_satisfies_dependencies(make_task):
+    tasks = [make_task("jules", "development", dependencies=["browser_automation"], duration=0)]
+    outcome = TaskScheduler(lambda task: None).run(tasks, completed_types={"browser_automation"})
+
+    assert len(outcome["completed"]) == 1
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test the durable Mission Control task store and restart replay
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from mission_control import EnhancedMissionControl
+from task_store import TaskStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TaskStore(tmp_path / "tasks.sqlite3", max_attempts=2)
+
+
+def test_lease_follows_priority_then_fifo_and_ack(store, make_task):
+    ids = store.enqueue_many([
+        make_task("eu_regulations", "regulatory_monitoring", priority="low"),
+        make_task("perplexity_sonar", "advanced_research", priority="high", payload={"note": "advanced_research"}),
+        make_task("market_intelligence", "competitor_analysis", priority="high")
+    ])
+
+    leased = store.lease("worker-a", limit=2)
+    assert [task["task_id"] for task in leased] == [ids[1], ids[2]]
+    assert leased[0]["payload"] == {"note": "advanced_research"}
+    assert store.lease("worker-b", limit=5)[0]["task_id"] == ids[0]
+    assert store.lease("worker-c") == []
+
+    assert store.ack(ids[1], {"summary": "ok"}, owner="worker-a")
+    assert not store.ack(ids[2], owner="worker-b")  # not the lease holder
+    assert store.counts() == {"done": 1, "leased": 2}
+
+
+def test_agent_filter(store, make_task):
+    store.enqueue_many([make_task("codex", "browser_automation"), make_task("jules", "development")])
+    leased = store.lease("worker", limit=5, agents=["jules"])
+    assert [task["agent"] for task in leased] == ["jules"]
+
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(store, make_task):
+    task_id = store.enqueue(make_task("perplexity_sonar", "advanced_research"))
+
+    assert store.lease("crashed-worker", lease_seconds=0.01)[0]["attempts"] == 1
+    time.sleep(0.02)
+    retry = store.lease("second-worker", lease_seconds=0.01)
+    assert retry[0]["task_id"] == task_id and retry[0]["attempts"] == 2
+
+    time.sleep(0.02)
+    assert store.reclaim_expired() == 1
+    assert store.counts() == {"failed": 1}
+
+
+def test_failures_retry_then_stop(store, make_task):
+    task_id = store.enqueue(make_task("market_intelligence", "competitor_analysis"))
+    store.lease("worker")
+    assert store.fail(task_id, "timeout") == "pending"
+    store.lease("worker")
+    assert store.fail(task_id, "timeout") == "failed"
+    assert store.tasks(("failed",))[0]["error"] == "timeout"
+
+
+def test_mission_control_replays_queue_after_restart(tmp_path, monkeypatch):
+    (tmp_path / "logs").mkdir()
+    first = EnhancedMissionControl(project_root=str(tmp_path))
+    first.coordinate_research_agents(["xylella"])
+    first.task_store.save_discovered_agent("discovered_agent_1", {"name": "discovered_agent_1"})
+    first.task_store.append_summoning({"user_request": "x", "timestamp": "2025-01-01T00:00:00"})
+
+    # Only the research task runs before the "crash"; the other two stay queued
+    runs = []
+    monkeypatch.setattr(EnhancedMissionControl, "_execute_task", lambda self, task: runs.append(task["task_type"]))
+    first.task_store.lease("other-host", limit=2, agents=["market_intelligence", "eu_regulations"])
+    first.execute_task_queue()
+    assert runs == ["advanced_research"]
+
+    restarted = EnhancedMissionControl(project_root=str(tmp_path))
+    assert [task["task_type"] for task in restarted.completed_tasks] == ["advanced_research"]
+    assert restarted.task_queue == []  # the other two are still leased by the live host
+    assert "discovered_agent_1" in restarted.discovered_agents
+    assert len(restarted.summoning_history) == 1
+
+    # Once that host's leases lapse the work is replayed, and finished work is not re-run
+    restarted.task_store.release(task["task_id"] for task in restarted.task_store.tasks(("leased",)))
+    restarted._restore_state()
+    restarted.execute_task_queue()
+    assert sorted(runs) == ["advanced_research", "competitor_analysis", "regulatory_monitoring"]
+    assert restarted.task_store.counts() == {"done": 3}
+
+
+def test_coordinator_blocks_tasks_behind_a_dependency_that_failed(tmp_path, monkeypatch, make_task):
+    (tmp_path / "logs").mkdir()
+    mc = EnhancedMissionControl(project_root=str(tmp_path))
+    runs = []
+
+    def execute(self, task):
+        runs.append(task["task_type"])
+        if task["task_type"] == "browser_automation":
+            raise RuntimeError("login failed")
+
+    monkeypatch.setattr(EnhancedMissionControl, "_execute_task", execute)
+    mc._enqueue_tasks([make_task("codex", "browser_automation"),
+                       make_task("jules", "development", ["browser_automation"])])
+
+    for _ in range(mc.task_store.max_attempts + 1):
+        mc.execute_task_queue()
+
+    # Development waits while retries remain, then is parked instead of being leased forever
+    assert runs == ["browser_automation"] * mc.task_store.max_attempts
+    assert mc.task_store.counts() == {"blocked": 1, "failed": 1}
+    assert mc.task_store.tasks(("blocked",))[0]["error"] == "dependency failed: browser_automation"
+    assert mc.task_queue == []
+
+
+def test_earlier_done_work_does_not_satisfy_newly_queued_dependencies(tmp_path, monkeypatch, make_task):
+    (tmp_path / "logs").mkdir()
+    mc = EnhancedMissionControl(project_root=str(tmp_path))
+    runs = []
+    monkeypatch.setattr(EnhancedMissionControl, "_execute_task", lambda self, task: runs.append(task["task_type"]))
+    mc._enqueue_tasks([make_task("codex", "browser_automation")])
+    mc.execute_task_queue()
+
+    # A fresh automation run is queued (and held by another host) ahead of the development task
+    mc._enqueue_tasks([make_task("codex", "browser_automation"),
+                       make_task("jules", "development", ["browser_automation"])])
+    mc.task_store.lease("other-host", agents=["codex"])
+    mc.execute_task_queue()
+    assert runs == ["browser_automation"]
+    assert mc.task_store.counts() == {"done": 1, "leased": 1, "pending": 1}
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the span tracer and the pipeline instrumentation that feeds it
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent))
+
+from agents.tracing import NULL_SPAN, TRACER, Tracer
+from test_agent_summoner_pipeline import summoner  # noqa: F401 (fixture)
+
+
+@pytest.fixture
+def tracing():
+    TRACER.clear()
+    TRACER.enable()
+    yield TRACER
+    TRACER.disable()
+    TRACER.clear()
+
+
+def names(tracer):
+    return {span["name"] for span in tracer.spans()}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("work", size=1) as span:
+        span.set(more=2)
+    tracer.record("wait", 0.5)
+    assert tracer.span("work") is NULL_SPAN
+    assert tracer.spans() == []
+
+
+def test_nested_spans_ring_buffer_and_errors():
+    tracer = Tracer(capacity=3, enabled=True)
+    with tracer.span("outer") as outer:
+        with tracer.span("inner"):
+            pass
+    with pytest.raises(ValueError):
+        with tracer.span("broken"):
+            raise ValueError("boom")
+
+    inner, outer_span, broken = tracer.spans()
+    assert inner["parent_id"] == outer.span_id
+    assert outer_span["parent_id"] is None
+    assert broken["attrs"]["error"] == "ValueError"
+
+    tracer.record("extra", 0.001)
+    assert [span["name"] for span in tracer.spans()] == ["outer", "broken", "extra"]
+
+
+def test_rollup_percentiles_and_exports(tmp_path):
+    tracer = Tracer(enabled=True)
+    for ms in range(1, 101):
+        tracer.record("sonar.ttfb", ms / 1000)
+    stats = tracer.rollup()["sonar.ttfb"]
+    assert (stats["count"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]) == (100, 50, 95, 99, 100)
+
+    lines = tracer.export_jsonl(tmp_path / "trace.jsonl").read_text().splitlines()
+    assert len(lines) == 100 and json.loads(lines[0])["name"] == "sonar.ttfb"
+    chrome = json.loads(tracer.export_chrome_trace(tmp_path / "trace.json").read_text())
+    assert chrome["traceEvents"][-1]["ph"] == "X"
+    assert chrome["traceEvents"][-1]["dur"] == 100000
+
+
+def test_sync_research_splits_http_phases(tracing, agent, stub_server):
+    agent.perplexity_research("xylella vectors")
+    assert {"sonar.http", "sonar.connect", "sonar.ttfb", "sonar.body", "sonar.parse"} <= names(tracing)
+    assert tracing.spans("sonar.ttfb")[0]["dur_ms"] >= stub_server.delay * 1000 * 0.9
+
+    agent.perplexity_research("xylella vectors")
+    assert len(tracing.spans("sonar.cache_hit")) == 1
+
+
+def test_async_research_records_queue_wait_and_phases(tracing, agent, stub_server):
+    agent.max_concurrency = 1
+    agent.research_many([("query a", "sonar"), ("query b", "sonar")])
+
+    waits = sorted(span["dur_ms"] for span in tracing.spans("sonar.queue_wait"))
+    assert len(waits) == 2 and waits[1] >= stub_server.delay * 1000 * 0.9
+    assert len(tracing.spans("sonar.ttfb")) == 2
+    assert len(tracing.spans("sonar.connect")) == 2
+
+
+def test_summoning_stages_and_artifact_writes(tracing, summoner):
+    summoner.summon_agent("Track patent filings for phosphinic acid treatments")
+    rollup = tracing.rollup()
+    for stage in ("analysis", "discovery", "evaluation", "complete", "total"):
+        assert rollup[f"summon.{stage}"]["count"] == 1
+    assert rollup["summon.analysis"]["p50_ms"] >= 200 * 0.9
+    assert rollup["store.encode"]["count"] == rollup["store.write"]["count"] >= 1
+
+
+def test_scheduler_and_task_execution_spans(tracing, tmp_path, monkeypatch):
+    from mission_control import EnhancedMissionControl
+
+    mc = EnhancedMissionControl(project_root=str(tmp_path))
+    monkeypatch.setattr(EnhancedMissionControl, "_run_task", lambda self, task: time.sleep(0.01))
+    mc.coordinate_research_agents(["xylella"])
+    mc.execute_task_queue()
+
+    assert len(tracing.spans("mission.execute_task")) == 3
+    assert len(tracing.spans("scheduler.queue_wait")) == 3
+    assert "trace_rollup" in mc.generate_status_report()